@@ -0,0 +1,52 @@
+"""
+benchmarks.import_time
+
+Measures the cost of importing PyRow modules in a fresh interpreter and fails if the best
+of several runs exceeds the budget.
+
+    python -m benchmarks.import_time [budget in ms]
+"""
+import re
+import subprocess
+import sys
+
+MODULES = ['pyrow.performance_monitor', 'pyrow.csafe.cmd', 'pyrow.response']
+RUNS = 5
+BUDGET_MS = 50.
+
+IMPORT_TIME = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\S+)')
+
+
+def measure(module):
+    """
+    :param string module:
+    :return float: Cumulative import time of the module in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {0}'.format(module)],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000.
+    raise RuntimeError('No import time reported for {0}'.format(module))
+
+
+def main(budget=BUDGET_MS):
+    """
+    :param float budget:
+    :return int: Exit code
+    """
+    exit_code = 0
+    for module in MODULES:
+        best = min(measure(module) for _ in range(RUNS))
+        over = best > budget
+        print('{0:<30} {1:8.2f} ms{2}'.format(module, best, '  OVER BUDGET' if over else ''))
+        if over:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS))
@@ -0,0 +1,90 @@
+"""
+benchmarks.logging_overhead
+
+Compares the cost per poll of a debug message through the module level logging.debug, as PyRow
+used to log, against the guarded debug messages on pyrow.pm, both with DEBUG off, and counts
+the records a burst of bad frames emits with and without RateLimitedLog.
+
+    python -m benchmarks.logging_overhead [iterations]
+"""
+import logging
+import sys
+import timeit
+
+from pyrow import log
+from pyrow.log import RateLimitedLog
+
+ITERATIONS = 200000
+
+
+class CountHandler(logging.Handler):
+    """
+    Counts the records it handles
+    """
+
+    def __init__(self):
+        """
+        :return:
+        """
+        logging.Handler.__init__(self)
+        self.count = 0
+
+    def emit(self, record):
+        """
+        :param LogRecord record:
+        :return:
+        """
+        self.count += 1
+
+
+def unguarded(status):
+    """
+    :param dict status:
+    :return:
+    """
+    logging.debug('Erg %s status: %s', '400124190', status)
+
+
+def guarded(status):
+    """
+    :param dict status:
+    :return:
+    """
+    if log.PM.isEnabledFor(logging.DEBUG):
+        log.PM.debug('Erg %s status: %s', '400124190', status)
+
+
+def main(iterations=ITERATIONS):
+    """
+    :param int iterations:
+    :return int: Exit code
+    """
+    status = {'status': 5, 'cadence': [28, 84]}
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    log.PM.setLevel(logging.WARNING)
+
+    print('{0:<24} {1:>10}'.format('debug per poll', 'ns'))
+    for name, function in (('root logging.debug', unguarded), ('guarded pyrow.pm', guarded)):
+        duration = timeit.timeit(lambda: function(status), number=iterations)
+        print('{0:<24} {1:10.1f}'.format(name, duration / iterations * 1e9))
+
+    handler = CountHandler()
+    logger = logging.getLogger('pyrow.benchmark')
+    logger.addHandler(handler)
+    logger.propagate = False
+    warnings = RateLimitedLog(logger)
+    for _ in range(iterations):
+        logger.warning('Bad checksum from %s', '400124190')
+    plain = handler.count
+    handler.count = 0
+    for _ in range(iterations):
+        warnings.warning('checksum', 'Bad checksum from %s', '400124190')
+
+    print('{0:<24} {1:>10}'.format('bad frame warnings', 'records'))
+    print('{0:<24} {1:10d}'.format('logger.warning', plain))
+    print('{0:<24} {1:10d}'.format('RateLimitedLog', handler.count))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS))
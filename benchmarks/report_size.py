@@ -0,0 +1,107 @@
+"""
+benchmarks.report_size
+
+Compares the HID report each common poll is sent in with the response estimate of
+sizing.ResponseSizeModel against the old estimate, which allowed for every response byte to be
+stuffed, and with the floor no estimate can go below: the report the unstuffed response needs.
+Status, workout and screen polls are already sent in that report, so only a force plot shrinks;
+the gain is for responses that are mostly stuffing allowance. The transfer time assumes full
+speed USB interrupt endpoints like the PM3's: 64 byte packets, one OUT packet per 1 ms and one
+IN packet per 2 ms.
+
+    python -m benchmarks.report_size [iterations]
+"""
+import sys
+import timeit
+
+from pyrow.csafe import const, sizing
+from pyrow.csafe.cmd import CsafeCmd
+from pyrow.performance_monitor import PerformanceMonitor
+
+ITERATIONS = 20000
+
+PACKET = 64
+OUT_INTERVAL = 1.
+IN_INTERVAL = 2.
+
+POLLS = [
+    ('status', [PerformanceMonitor.GET_STATUS]),
+    ('workout', PerformanceMonitor.GET_WORKOUT),
+    ('screen', PerformanceMonitor.GET_SCREEN),
+    ('force plot', PerformanceMonitor.GET_FORCE_PLOT),
+    ('force plot + heartbeat',
+     PerformanceMonitor.GET_FORCE_PLOT + PerformanceMonitor.GET_HEARTBEAT),
+]
+
+
+def old_report_size(commands, request):
+    """
+    Report size CsafeCmd.write chose before the response size model
+    :param [] commands:
+    :param int request: Bytes of the request frame
+    :return int:
+    """
+    max_response = 3
+    wrapper = None
+    i = 0
+    while i < len(commands):
+        properties = const.get_commands()[commands[i]]
+        if len(properties) == 3 and properties[2] != wrapper:
+            max_response += 2
+        wrapper = properties[2] if len(properties) == 3 else None
+        max_response += abs(sum(const.get_resp()[commands[i]][1])) * 2 + 1
+        i += 1 + len(properties[1])
+
+    return report_size(max(request + 1, max_response))
+
+
+def min_report_size(commands, request):
+    """
+    Report size without any allowance for stuffing
+    :param [] commands:
+    :param int request: Bytes of the request frame
+    :return int:
+    """
+    unstuffed = sizing.ResponseSizeModel(tail=1.).get_response_size(commands)
+    return report_size(max(request + 1, unstuffed))
+
+
+def report_size(max_message):
+    """
+    :param int max_message: Bytes the report has to fit
+    :return int:
+    """
+    return 21 if max_message <= 21 else 63 if max_message <= 63 else 121
+
+
+def transfer_time(size):
+    """
+    :param int size: Report size
+    :return float: Milliseconds to write the report and read a report of the same size
+    """
+    packets = -(-size // PACKET)
+    return packets * (OUT_INTERVAL + IN_INTERVAL)
+
+
+def main(iterations=ITERATIONS):
+    """
+    :param int iterations:
+    :return int: Exit code
+    """
+    print('{0:<24} {1:>9} {2:>9} {3:>9} {4:>10} {5:>10} {6:>11}'.format(
+        'poll', 'old bytes', 'new bytes', 'min bytes', 'old ms', 'new ms', 'write us'))
+    for name, commands in POLLS:
+        report = CsafeCmd.write(commands)
+        request = report.index(const.STOP_FRAME_FLAG)
+        old = old_report_size(commands, request)
+        new = len(report)
+        floor = min_report_size(commands, request)
+        duration = timeit.timeit(lambda: CsafeCmd.write(commands), number=iterations)
+        print('{0:<24} {1:9d} {2:9d} {3:9d} {4:10.1f} {5:10.1f} {6:11.2f}'.format(
+            name, 2 * old, 2 * new, 2 * floor, transfer_time(old), transfer_time(new),
+            duration / iterations * 1e6))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS))
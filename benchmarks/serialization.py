@@ -0,0 +1,82 @@
+"""
+benchmarks.serialization
+
+Compares the size and speed of the compact Response encoding against pickle and JSON for a
+screen poll and a force plot poll.
+
+    python -m benchmarks.serialization [iterations]
+"""
+import json
+import pickle
+import sys
+import timeit
+
+from pyrow.response import Response
+from pyrow.serialization import decode_response, encode_response
+
+ITERATIONS = 20000
+
+SCREEN = {
+    'CSAFE_GETSTATUS_CMD': [5],
+    'CSAFE_PM_GET_WORKTIME': [123456, 12],
+    'CSAFE_PM_GET_WORKDISTANCE': [15000, 3],
+    'CSAFE_PM_GET_DRAGFACTOR': [118],
+    'CSAFE_PM_GET_RESTTIME': [0],
+    'CSAFE_PM_GET_ERRORVALUE': [0],
+    'CSAFE_GETCADENCE_CMD': [28, 84],
+    'CSAFE_GETPOWER_CMD': [245, 88],
+    'CSAFE_GETCALORIES_CMD': [87],
+    'CSAFE_GETHRCUR_CMD': [152],
+}
+
+FORCE_PLOT = {
+    'CSAFE_GETSTATUS_CMD': [5],
+    'CSAFE_PM_GET_FORCEPLOTDATA': [32] + [value * 10 for value in range(16)],
+    'CSAFE_PM_GET_STROKESTATE': [2],
+}
+
+
+def measure(name, results, iterations):
+    """
+    :param string name:
+    :param dict results:
+    :param int iterations:
+    :return:
+    """
+    response = Response(results)
+    compact = encode_response(response)
+    pickled = pickle.dumps(results, pickle.HIGHEST_PROTOCOL)
+    dumped = json.dumps(results).encode('utf-8')
+
+    rows = [
+        ('compact', len(compact),
+         timeit.timeit(lambda: encode_response(response), number=iterations),
+         timeit.timeit(lambda: decode_response(compact), number=iterations)),
+        ('pickle', len(pickled),
+         timeit.timeit(lambda: pickle.dumps(results, pickle.HIGHEST_PROTOCOL),
+                       number=iterations),
+         timeit.timeit(lambda: Response(pickle.loads(pickled)), number=iterations)),
+        ('json', len(dumped),
+         timeit.timeit(lambda: json.dumps(results).encode('utf-8'), number=iterations),
+         timeit.timeit(lambda: Response(json.loads(dumped.decode('utf-8'))),
+                       number=iterations)),
+    ]
+
+    print(name)
+    for encoding, size, encode_time, decode_time in rows:
+        print('  {0:<8} {1:5d} bytes {2:8.2f} us encode {3:8.2f} us decode'.format(
+            encoding, size, encode_time / iterations * 1e6, decode_time / iterations * 1e6))
+
+
+def main(iterations=ITERATIONS):
+    """
+    :param int iterations:
+    :return int: Exit code
+    """
+    measure('screen', SCREEN, iterations)
+    measure('force plot', FORCE_PLOT, iterations)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS))
@@ -0,0 +1,31 @@
+# This is an example file to show how to make use of pyrow
+# Have the rowing machines on and plugged into the computer before starting the program
+# The program will record every workout rowed on any connected erg to its own file
+# named after the erg's serial number and the time the workout started
+
+import logging
+import time
+
+from pyrow.performance_monitor import PerformanceMonitor
+from pyrow.sessions import SessionRecorder
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    # Connecting to ergs
+    ergs = PerformanceMonitor.find()
+    if len(ergs) == 0:
+        exit('No ergs found.')
+    logging.info('Connected to %d ergs', len(ergs))
+
+    # A session is opened when an erg goes in use and closed when it finishes
+    session_recorder = SessionRecorder('.')
+    session_recorder.add_listener(
+        lambda session: logging.info('Saved %d samples to %s', session.samples, session.path))
+
+    try:
+        while True:
+            session_recorder.poll(ergs)
+            time.sleep(.1)
+    except KeyboardInterrupt:
+        session_recorder.close()
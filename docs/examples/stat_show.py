@@ -26,7 +26,8 @@ if __name__ == '__main__':
                'Time end rest', 'Distance end rest', 'Workout end', 'Workout terminate',
                'Workout logged', 'Workout rearm']
 
-    command = ['CSAFE_GETSTATUS_CMD', 'CSAFE_PM_GET_STROKESTATE', 'CSAFE_PM_GET_WORKOUTSTATE']
+    command = [PerformanceMonitor.GET_STATUS, PerformanceMonitor.GET_STROKE_STATE,
+               PerformanceMonitor.GET_WORKOUT_STATE]
 
     # prime status number
     cstate = -1
@@ -38,13 +39,13 @@ if __name__ == '__main__':
     # Inf loop
     while 1:
         results = erg.send_commands(command)
-        if cstate != (results['CSAFE_GETSTATUS_CMD'][0] & 0xF):
-            cstate = results['CSAFE_GETSTATUS_CMD'][0] & 0xF
+        if cstate != results.get_status():
+            cstate = results.get_status()
             logging.debug('State %s: %s', str(cstate), state[cstate])
-        if cstroke != results['CSAFE_PM_GET_STROKESTATE'][0]:
-            cstroke = results['CSAFE_PM_GET_STROKESTATE'][0]
+        if cstroke != results.get_stroke_state():
+            cstroke = results.get_stroke_state()
             logging.debug('Stroke %s: %s', str(cstroke), stroke[cstroke])
-        if cworkout != results['CSAFE_PM_GET_WORKOUTSTATE'][0]:
-            cworkout = results['CSAFE_PM_GET_WORKOUTSTATE'][0]
+        if cworkout != results.get_workout_state():
+            cworkout = results.get_workout_state()
             logging.debug('Workout %s: %s', str(cworkout), workout[cworkout])
         time.sleep(1)
@@ -0,0 +1,112 @@
+"""
+PyRow.Archive
+
+Reprocesses archived capture files (see pyrow.capture) in parallel. Sessions are sharded
+across a process pool by path, each worker streams its file in chunks and decodes, derives
+metrics and detects strokes locally, so only a small summary per session crosses the
+process boundary.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from pyrow import capture
+from pyrow.csafe.cmd import CsafeCmd
+from pyrow.metrics import MetricsEngine
+from pyrow.response import Response
+
+SessionSummary = namedtuple('SessionSummary', [
+    'path',
+    'frames',
+    'errors',
+    'strokes',
+    'duration',
+    'time',
+    'distance',
+    'average_spm',
+    'average_power',
+    'max_power',
+])
+
+
+def process_session(path, chunk_size=capture.CHUNK_SIZE):
+    """
+    Decodes every response frame of a capture file
+    :param string path:
+    :param int chunk_size: Bytes read from the file at a time
+    :return SessionSummary:
+    """
+    engine = MetricsEngine()
+    frames = 0
+    errors = 0
+    strokes = 0
+    stroke_state = None
+    spm_total = 0
+    spm_count = 0
+    power_total = 0
+    power_count = 0
+    max_power = None
+    first = None
+    last = None
+    snapshot = None
+
+    for timestamp, direction, data in capture.read_records(path, chunk_size):
+        if direction != capture.RESPONSE:
+            continue
+        frames += 1
+
+        try:
+            # Replayed frames must not change the sizing of live frames
+            results = CsafeCmd.read(list(data), model=None)
+        except (IndexError, KeyError):
+            results = []
+        if not results:
+            errors += 1
+            continue
+
+        if first is None:
+            first = timestamp
+        last = timestamp
+
+        response = Response(results)
+        snapshot = engine.update(path, response, timestamp)
+
+        state = response.get_stroke_state()
+        if state is not None:
+            if state == Response.STROKE_DRIVE and stroke_state != Response.STROKE_DRIVE:
+                strokes += 1
+            stroke_state = state
+
+        spm = response.get_spm()
+        if spm is not None:
+            spm_total += spm
+            spm_count += 1
+        power = response.get_power()
+        if power is not None:
+            power_total += power
+            power_count += 1
+            max_power = power if max_power is None else max(max_power, power)
+
+    return SessionSummary(
+        path,
+        frames,
+        errors,
+        strokes,
+        None if first is None else last - first,
+        None if snapshot is None else snapshot.time,
+        None if snapshot is None else snapshot.distance,
+        spm_total / float(spm_count) if spm_count else None,
+        power_total / float(power_count) if power_count else None,
+        max_power
+    )
+
+
+def process_archive(paths, workers=None):
+    """
+    Processes capture files across a process pool
+    :param [string] paths:
+    :param int workers: Number of processes, the number of CPUs if None
+    :return [SessionSummary]: In the same order as paths
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(process_session, paths))
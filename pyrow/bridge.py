@@ -0,0 +1,302 @@
+"""
+PyRow.Bridge
+
+Shares Performance Monitors over TCP: a TransportBridge next to the ergs serves their
+transports to TcpTransports on other hosts. Kept apart from pyrow.transport so that importing
+a PerformanceMonitor does not load socket and socketserver.
+"""
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from pyrow.exceptions import TransportException
+from pyrow.transport import Transport
+
+MESSAGE = struct.Struct('<BH')  # Type, Payload Length
+MESSAGE_LIST = 0x01
+MESSAGE_OPEN = 0x02
+MESSAGE_WRITE = 0x03
+MESSAGE_READ = 0x04
+MESSAGE_ERROR = 0xFF
+
+READ_LENGTH = struct.Struct('<H')
+PRODUCT_ID = struct.Struct('<H')
+
+
+def _send_message(sock, message_type, payload=b''):
+    """
+    :param socket sock:
+    :param int message_type:
+    :param bytes payload:
+    :return:
+    """
+    sock.sendall(MESSAGE.pack(message_type, len(payload)) + payload)
+
+
+def _receive_exactly(sock, length):
+    """
+    :param socket sock:
+    :param int length:
+    :return bytes:
+    """
+    data = b''
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise TransportException('Connection closed')
+        data += chunk
+    return data
+
+
+def _receive_message(sock):
+    """
+    :param socket sock:
+    :return (int, bytes): Message type and payload
+    """
+    message_type, length = MESSAGE.unpack(_receive_exactly(sock, MESSAGE.size))
+    return message_type, _receive_exactly(sock, length)
+
+
+def _encode_strings(strings):
+    """
+    :param [string] strings:
+    :return bytes:
+    """
+    out = bytearray()
+    for string in strings:
+        encoded = string.encode('utf-8')
+        out.append(len(encoded))
+        out.extend(encoded)
+    return bytes(out)
+
+
+def _decode_strings(data):
+    """
+    :param bytes data:
+    :return [string]:
+    """
+    strings = []
+    k = 0
+    while k < len(data):
+        strings.append(data[k + 1:k + 1 + data[k]].decode('utf-8'))
+        k += 1 + data[k]
+    return strings
+
+
+class TcpTransport(Transport):
+    """
+    TcpTransport
+    The write of each frame is held back and sent in the same packet as the read request
+    that follows it, so every frame costs a single round trip. Frames are paced by the
+    TransportBridge next to the device, MIN_FRAME_GAP is 0 here.
+    """
+
+    TIMEOUT = 25.
+
+    def __init__(self, host, port, serial_number=None, timeout=None):
+        """
+        :param string host:
+        :param int port:
+        :param string serial_number: Erg to open, the first erg of the bridge if None
+        :param float timeout: Seconds
+        :return:
+        """
+        self.__socket = socket.create_connection((host, port), timeout or self.TIMEOUT)
+        self.__socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.__pending = b''
+
+        payload = self.__request(MESSAGE_OPEN, (serial_number or '').encode('ascii'))
+        self.__product_id, = PRODUCT_ID.unpack_from(payload, 0)
+        self.__manufacturer, self.__product, self.__serial_number = _decode_strings(
+            payload[PRODUCT_ID.size:]
+        )
+
+    @staticmethod
+    def find(host, port, timeout=None):
+        """
+        :param string host:
+        :param int port:
+        :param float timeout:
+        :return [TcpTransport]: A transport for every erg shared by the bridge
+        """
+        sock = socket.create_connection((host, port), timeout or TcpTransport.TIMEOUT)
+        try:
+            _send_message(sock, MESSAGE_LIST)
+            message_type, payload = _receive_message(sock)
+        finally:
+            sock.close()
+        if message_type == MESSAGE_ERROR:
+            raise TransportException(payload.decode('utf-8'))
+        return [TcpTransport(host, port, serial_number, timeout)
+                for serial_number in _decode_strings(payload)]
+
+    def get_manufacturer(self):
+        return self.__manufacturer
+
+    def get_product(self):
+        return self.__product
+
+    def get_serial_number(self):
+        return self.__serial_number
+
+    def get_product_id(self):
+        return self.__product_id
+
+    def write(self, data):
+        payload = bytes(data)
+        self.__pending += MESSAGE.pack(MESSAGE_WRITE, len(payload)) + payload
+        return len(payload)
+
+    def read(self, length):
+        return list(self.__request(MESSAGE_READ, READ_LENGTH.pack(length)))
+
+    def close(self):
+        self.__socket.close()
+
+    def __request(self, message_type, payload):
+        """
+        :param int message_type:
+        :param bytes payload:
+        :return bytes: Payload of the reply
+        """
+        data = self.__pending + MESSAGE.pack(message_type, len(payload)) + payload
+        self.__pending = b''
+        try:
+            self.__socket.sendall(data)
+            reply_type, reply = _receive_message(self.__socket)
+        except socket.timeout:
+            raise TransportException('Timed out waiting for the bridge')
+        if reply_type == MESSAGE_ERROR:
+            raise TransportException(reply.decode('utf-8'))
+        return reply
+
+
+class _BridgeHandler(socketserver.BaseRequestHandler):
+    """
+    Serves one TcpTransport connection
+    """
+
+    def handle(self):
+        bridge = self.server.bridge
+        transport = None
+        failed = None
+        while True:
+            try:
+                message_type, payload = _receive_message(self.request)
+            except (TransportException, OSError):
+                return
+
+            if message_type == MESSAGE_WRITE:
+                # Writes are never answered, a failed write is the reply to the next read
+                try:
+                    if transport is None:
+                        raise TransportException('No erg opened')
+                    bridge.write(transport, payload)
+                except Exception as ex:  # pylint: disable=broad-except
+                    failed = failed or ex
+                continue
+
+            try:
+                if message_type == MESSAGE_READ and failed is not None:
+                    error, failed = failed, None
+                    raise error
+                if message_type == MESSAGE_LIST:
+                    reply = _encode_strings(bridge.get_serial_numbers())
+                elif message_type == MESSAGE_OPEN:
+                    transport = bridge.get_transport(payload.decode('ascii'))
+                    reply = PRODUCT_ID.pack(transport.get_product_id()) + _encode_strings([
+                        transport.get_manufacturer(),
+                        transport.get_product(),
+                        transport.get_serial_number(),
+                    ])
+                elif transport is None:
+                    raise TransportException('No erg opened')
+                elif message_type == MESSAGE_READ:
+                    length, = READ_LENGTH.unpack(payload)
+                    reply = bytes(transport.read(length))
+                else:
+                    raise TransportException('Unknown message {0}'.format(message_type))
+                _send_message(self.request, message_type, reply)
+            except Exception as ex:  # pylint: disable=broad-except
+                _send_message(self.request, MESSAGE_ERROR, str(ex).encode('utf-8'))
+
+
+class TransportBridge(object):
+    """
+    TransportBridge
+    Shares local transports, e.g. the UsbTransports of a Raspberry Pi, with TcpTransports on
+    other hosts. Each erg should only be opened by one TcpTransport at a time.
+    """
+
+    def __init__(self, transports, host='127.0.0.1', port=0):
+        """
+        :param [Transport] transports:
+        :param string host: Interface to listen on, the bridge has no authentication so only
+                            listen on others, e.g. '0.0.0.0', on a trusted network
+        :param int port: 0 to pick a free port
+        :return:
+        """
+        self.__transports = list(transports)
+        self.__last_write = dict((transport, 0) for transport in self.__transports)
+        self.__locks = dict((transport, threading.Lock()) for transport in self.__transports)
+
+        self.__server = socketserver.ThreadingTCPServer((host, port), _BridgeHandler)
+        self.__server.daemon_threads = True
+        self.__server.bridge = self
+        self.__thread = None
+
+    def start(self):
+        """
+        Serves connections on a background thread
+        :return:
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever,
+                                         kwargs={'poll_interval': 0.1}, name='pyrow-bridge')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def get_port(self):
+        """
+        :return int:
+        """
+        return self.__server.server_address[1]
+
+    def get_serial_numbers(self):
+        """
+        :return [string]:
+        """
+        return [transport.get_serial_number() for transport in self.__transports]
+
+    def get_transport(self, serial_number):
+        """
+        :param string serial_number: The first transport if empty
+        :return Transport:
+        """
+        for transport in self.__transports:
+            if not serial_number or transport.get_serial_number() == serial_number:
+                return transport
+        raise TransportException('Unknown erg {0}'.format(serial_number))
+
+    def write(self, transport, data):
+        """
+        Writes to the transport, keeping its frames MIN_FRAME_GAP apart
+        :param Transport transport:
+        :param bytes data:
+        :return:
+        """
+        with self.__locks[transport]:
+            delta = time.time() - self.__last_write[transport]
+            if delta < transport.MIN_FRAME_GAP:
+                time.sleep(transport.MIN_FRAME_GAP - delta)
+            transport.write(list(data))
+            self.__last_write[transport] = time.time()
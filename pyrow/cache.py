@@ -0,0 +1,90 @@
+"""
+PyRow.Cache
+
+A read-through cache of Responses for one Performance Monitor, keyed by the commands that were
+sent. Entries are fresh for a short time to live (one frame gap by default), so components
+polling the same getters within a frame share one round trip. Concurrent misses for the same
+commands are collapsed onto one request.
+"""
+
+import time
+from collections import namedtuple
+from threading import Lock
+
+from pyrow.singleflight import SingleFlight
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'merged', 'invalidations'])
+
+
+class ResponseCache(object):
+    """
+    ResponseCache
+    """
+
+    TTL = .050
+
+    def __init__(self, ttl=TTL):
+        """
+        :param float ttl: Seconds a Response stays fresh
+        :return:
+        """
+        self.__ttl = ttl
+        self.__lock = Lock()
+        self.__flight = SingleFlight()
+        self.__entries = {}
+        self.__generation = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__invalidations = 0
+
+    def get_ttl(self):
+        """
+        :return float:
+        """
+        return self.__ttl
+
+    def get(self, key, fetch, *args):
+        """
+        :param hashable key: Commands the Response answers
+        :param callable fetch: Called with args to get the Response on a miss
+        :return Response:
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and time.time() < entry[0]:
+                self.__hits += 1
+                return entry[1]
+            self.__misses += 1
+
+        return self.__flight.do(key, self.__fetch, key, fetch, *args)
+
+    def invalidate(self):
+        """
+        Drops every entry, including those of fetches still in flight
+        :return:
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__generation += 1
+            self.__invalidations += 1
+
+    def get_stats(self):
+        """
+        :return CacheStats:
+        """
+        return CacheStats(self.__hits, self.__misses, self.__flight.get_merged_count(),
+                          self.__invalidations)
+
+    def __fetch(self, key, fetch, *args):
+        """
+        :param hashable key:
+        :param callable fetch:
+        :return Response:
+        """
+        generation = self.__generation
+        response = fetch(*args)
+        with self.__lock:
+            # A write while the fetch was in flight may have made it stale
+            if generation == self.__generation:
+                self.__entries[key] = (time.time() + self.__ttl, response)
+        return response
@@ -0,0 +1,94 @@
+"""
+PyRow.Capture
+
+File format for raw frames exchanged with a Performance Monitor, so sessions can be archived
+and replayed.
+
+A capture file starts with a header followed by one record per frame:
+    timestamp (double), direction (byte), length (unsigned short), raw bytes
+"""
+
+import struct
+
+MAGIC = b'PYRF'
+VERSION = 1
+
+HEADER = struct.Struct('<4sH')  # Magic, Version
+RECORD = struct.Struct('<dBH')  # Timestamp, Direction, Length
+
+REQUEST = 0
+RESPONSE = 1
+
+CHUNK_SIZE = 64 * 1024
+
+
+class CaptureWriter(object):
+    """
+    CaptureWriter
+    """
+
+    def __init__(self, path):
+        """
+        :param string path:
+        :return:
+        """
+        self.__file = open(path, 'wb')
+        self.__file.write(HEADER.pack(MAGIC, VERSION))
+
+    def write(self, timestamp, direction, data):
+        """
+        :param float timestamp:
+        :param int direction: REQUEST or RESPONSE
+        :param bytes data:
+        :return:
+        """
+        self.__file.write(RECORD.pack(timestamp, direction, len(data)))
+        self.__file.write(bytes(data))
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__file.close()
+
+
+def encode_records(records):
+    """
+    :param iterable records: (timestamp, direction, data) tuples
+    :return bytes: Records in the capture format, including the header
+    """
+    out = bytearray(HEADER.pack(MAGIC, VERSION))
+    for timestamp, direction, data in records:
+        out.extend(RECORD.pack(timestamp, direction, len(data)))
+        out.extend(data)
+    return bytes(out)
+
+
+def read_records(path, chunk_size=CHUNK_SIZE):
+    """
+    Reads the file in chunks, a truncated final record is ignored
+    :param string path:
+    :param int chunk_size:
+    :return generator: (timestamp, direction, data) tuples
+    """
+    with open(path, 'rb') as capture_file:
+        header = capture_file.read(HEADER.size)
+        if len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION):
+            raise ValueError('{0} is not a capture file'.format(path))
+
+        buffer = b''
+        while True:
+            chunk = capture_file.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+
+            offset = 0
+            while offset + RECORD.size <= len(buffer):
+                timestamp, direction, length = RECORD.unpack_from(buffer, offset)
+                end = offset + RECORD.size + length
+                if end > len(buffer):
+                    break
+                yield timestamp, direction, buffer[offset + RECORD.size:end]
+                offset = end
+            buffer = buffer[offset:]
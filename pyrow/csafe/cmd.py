@@ -2,8 +2,19 @@
 """Provide the CsafeCmd class."""
 
 import logging
+from collections import Counter
+from threading import Lock
 
-from pyrow.csafe import const
+from pyrow import log
+from pyrow.csafe import const, framing, sizing
+from pyrow.exceptions import (ByteCountException, ChecksumException, StartFlagException,
+                              StopFlagException, TruncatedFrameException)
+
+_ERRORS = Counter()
+_ERROR_LOCK = Lock()
+
+LOGGER = log.CSAFE
+WARNINGS = log.RateLimitedLog(LOGGER)
 
 
 class CsafeCmd:
@@ -17,7 +28,7 @@ class CsafeCmd:
         :return:
         """
         if not 0 <= integer <= 2 ** (8 * num_bytes):
-            logging.warning('Integer is outside the allowable range.')
+            WARNINGS.warning('range', 'Integer is outside the allowable range: %d', integer)
 
         byte = []
         for k in range(num_bytes):
@@ -53,9 +64,10 @@ class CsafeCmd:
         return word
 
     @staticmethod
-    def write(arguments):
+    def write(arguments, destination=None):
         """
         :param arguments:
+        :param destination: Address of the Performance Monitor, sends an extended frame
         :return:
         """
         # Priming variables
@@ -63,13 +75,17 @@ class CsafeCmd:
         message = []
         wrapper = 0
         wrapped = []
-        max_response = 3  # Start & stop flag & status
+        commands = []
+        table = const.get_commands()
 
         # Loop through all arguments
         while i < len(arguments):
 
             arg = arguments[i]
-            cmd_prop = const.CMDS[arg]
+            if isinstance(arg, str):
+                arg = const.COMMAND_IDS[arg]
+            cmd_prop = table[arg]
+            commands.append(arg)
             command = []
 
             # Load variables if command is a Long Command
@@ -102,15 +118,9 @@ class CsafeCmd:
                 else:  # Creating a new wrapper
                     wrapped = command
                     wrapper = cmd_prop[2]
-                    max_response += 2
 
                 command = []  # Clear command to prevent it from getting into message
 
-            # Max message length
-            cmd_id = cmd_prop[0] | (wrapper << 8)
-            # Double return to account for stuffing
-            max_response += abs(sum(const.RESP[cmd_id][1])) * 2 + 1
-
             # Add completed command to final message
             message.extend(command)
 
@@ -122,25 +132,12 @@ class CsafeCmd:
             wrapped.insert(0, wrapper)  # Wrapper command ID
             message.extend(wrapped)  # Adds wrapper to message
 
-        # Prime variables
-        checksum = 0x0
-        j = 0
-
         # Checksum and byte stuffing
-        while j < len(message):
-            # Calculate checksum
-            checksum = checksum ^ message[j]
-
-            # Byte stuffing
-            if 0xF0 <= message[j] <= 0xF3:
-                message.insert(j, const.BYTE_STUFFING_FLAG)
-                j += 1
-                message[j] &= 0x3
-
-            j += 1
+        payload = bytes(message)
+        message = list(framing.stuff(payload))
 
         # Add checksum to end of message
-        message.append(checksum)
+        message.append(framing.checksum(payload))
 
         # Start & stop frames
         message.insert(0, const.STANDARD_FRAME_START_FLAG)
@@ -148,9 +145,10 @@ class CsafeCmd:
 
         # Check for frame size (96 bytes)
         if len(message) > 96:
-            logging.warning('Message is too long: %d', len(message))
+            WARNINGS.warning('message', 'Message is too long: %d', len(message))
 
-        # Report IDs
+        # Report IDs, the response has to fit the report as well
+        max_response = sizing.MODEL.get_response_size(commands)
         max_message = max(len(message) + 1, max_response)
 
         if max_message <= 21:
@@ -163,51 +161,73 @@ class CsafeCmd:
             message.insert(0, 0x02)
             message += [0] * (121 - len(message))
             if max_response > 121:
-                logging.warning('Response may be too long to receive. ' +
-                                'Max possible length: %d', max_response)
+                WARNINGS.warning('response', 'Response may be too long to receive. ' +
+                                 'Max possible length: %d', max_response)
         else:
-            logging.error('Message too long. Message length: %d', len(message))
+            WARNINGS.error('length', 'Message too long. Message length: %d', len(message))
             message = []
 
+        if message and destination is not None:
+            message = framing.address(message, destination)
+
         return message
 
     @staticmethod
-    def __check_message(message):
+    def get_error_counts():
         """
-        :param message:
-        :return:
+        :return dict: Number of frames that could not be decoded, by FrameException class name
         """
-        # Prime variables
-        i = 0
-        checksum = 0
+        with _ERROR_LOCK:
+            return dict(_ERRORS)
 
-        # Checksum and unstuff
-        while i < len(message):
-            # Byte unstuffing
-            if message[i] == const.BYTE_STUFFING_FLAG:
-                stuff_value = message.pop(i + 1)
-                message[i] = 0xF0 | stuff_value
+    @staticmethod
+    def reset_error_counts():
+        """
+        :return:
+        """
+        with _ERROR_LOCK:
+            _ERRORS.clear()
 
-            # Calculate checksum
-            checksum = checksum ^ message[i]
+    @staticmethod
+    def __fail(exception, strict, level=logging.ERROR):
+        """
+        Counts the error, raises it in strict mode and logs it otherwise
+        :param FrameException exception:
+        :param bool strict:
+        :param int level: Logging level when not strict
+        :return:
+        """
+        with _ERROR_LOCK:
+            _ERRORS[type(exception).__name__] += 1
+        if strict:
+            raise exception
+        WARNINGS.log(level, type(exception), '%s', exception)
 
-            i += 1
+    @staticmethod
+    def __check_message(message):
+        """
+        :param message:
+        :return:
+        """
+        # Unstuff, the checksum byte makes the checksum of the whole message 0
+        unstuffed = framing.unstuff(bytes(message))
 
         # Checks checksum
-        if checksum != 0:
-            logging.error('Checksum error')
-            return []
+        if framing.checksum(unstuffed) != 0:
+            return None
 
         # Remove checksum from  end of message
-        del message[-1]
-
-        return message
+        return list(unstuffed[:-1])
 
     # For receiving!
     @staticmethod
-    def read(transmission):
+    def read(transmission, strict=False, model=sizing.MODEL):
         """
         :param transmission:
+        :param strict: Raise a FrameException instead of logging malformed frames, an unexpected
+                       byte count is only logged either way
+        :param ResponseSizeModel model: Learns the response sizes of live frames, None for
+                                        frames that are not read from a Performance Monitor
         :return:
         """
         # Prime variables
@@ -224,7 +244,7 @@ class CsafeCmd:
         elif start_flag == const.STANDARD_FRAME_START_FLAG:
             j = 2
         else:
-            logging.error('No Start Flag found.')
+            CsafeCmd.__fail(StartFlagException(transmission, 1, 'No Start Flag found'), strict)
             return []
 
         while j < len(transmission):
@@ -235,67 +255,98 @@ class CsafeCmd:
             j += 1
 
         if not stop_found:
-            logging.error('No Stop Flag found.')
+            CsafeCmd.__fail(StopFlagException(transmission, j, 'No Stop Flag found'), strict)
             return []
 
-        message = CsafeCmd.__check_message(message)
-        status = message.pop(0)
+        stuffed = message.count(const.BYTE_STUFFING_FLAG)
+        try:
+            message = CsafeCmd.__check_message(message)
+        except IndexError:
+            CsafeCmd.__fail(TruncatedFrameException(
+                transmission, j - 1, 'Frame ends in a byte stuffing flag'), strict)
+            return []
+        if message is None:
+            CsafeCmd.__fail(ChecksumException(transmission, j - 1, 'Checksum error'), strict)
+            return []
+        data = len(message) + 1  # Checksum
 
         # Prime variables
-        response = {'CSAFE_GETSTATUS_CMD': [status, ]}
         k = 0
+        offset = 0
         wrap_end = -1
         wrapper = 0x0
-
-        # Loop through complete frames
-        while k < len(message):
-            result = []
-
-            # Get command name
-            msg_cmd = message[k]
-            if k <= wrap_end:
-                msg_cmd |= wrapper  # Check if still in wrapper
-            msg_prop = const.RESP[msg_cmd]
-            k += 1
-
-            # Get data byte count
-            byte_count = message[k]
-            k += 1
-
-            # If wrapper command then gets command in wrapper
-            if msg_prop[0] == 'CSAFE_SETUSERCFG1_CMD':
-                wrapper = message[k - 2] << 8
-                wrap_end = k + byte_count - 1
-                if byte_count:  # If wrapper length != 0
-                    msg_cmd = wrapper | message[k]
-                    msg_prop = const.RESP[msg_cmd]
-                    k += 1
-                    byte_count = message[k]
-                    k += 1
-
-            # Special case for capability code, response lengths differ based off capability code
-            if msg_prop[0] == 'CSAFE_GETCAPS_CMD':
-                msg_prop[1] = [1, ] * byte_count
-
-            # Special case for get id, response length is variable
-            if msg_prop[0] == 'CSAFE_GETID_CMD':
-                msg_prop[1] = [(-byte_count), ]
-
-            # Checking that the received data byte is the expected length, sanity check
-            if abs(sum(msg_prop[1])) != 0 and byte_count != abs(sum(msg_prop[1])):
-                logging.warning('byte_count is an unexpected length')
-
-            # Extract values
-            for num_bytes in msg_prop[1]:
-                raw_bytes = message[k:k + abs(num_bytes)]
-                value = (
-                    CsafeCmd.__bytes2int(raw_bytes)
-                    if num_bytes >= 0
-                    else CsafeCmd.__bytes2ascii(raw_bytes)
-                )
-                result.append(value)
-                k = k + abs(num_bytes)
-
-            response[msg_prop[0]] = result
+        table = const.get_resp()
+
+        try:
+            status = message.pop(0)
+            response = const.Results({const.Command.CSAFE_GETSTATUS_CMD: [status, ]})
+
+            # Loop through complete frames
+            while k < len(message):
+                result = []
+                offset = k
+
+                # Get command name
+                msg_cmd = message[k]
+                if k <= wrap_end:
+                    msg_cmd |= wrapper  # Check if still in wrapper
+                msg_prop = table[msg_cmd]
+                k += 1
+
+                # Get data byte count
+                byte_count = message[k]
+                k += 1
+
+                # If wrapper command then gets command in wrapper
+                if msg_prop[0] == 'CSAFE_SETUSERCFG1_CMD':
+                    wrapper = message[k - 2] << 8
+                    wrap_end = k + byte_count - 1
+                    if byte_count:  # If wrapper length != 0
+                        offset = k
+                        msg_cmd = wrapper | message[k]
+                        msg_prop = table[msg_cmd]
+                        k += 1
+                        byte_count = message[k]
+                        k += 1
+
+                # Special case for capability code, response lengths differ based off
+                # capability code
+                if msg_prop[0] == 'CSAFE_GETCAPS_CMD':
+                    msg_prop[1] = [1, ] * byte_count
+
+                # Special case for get id, response length is variable
+                if msg_prop[0] == 'CSAFE_GETID_CMD':
+                    msg_prop[1] = [(-byte_count), ]
+
+                # Checking that the received data byte is the expected length, sanity check.
+                # Firmware differs in some lengths, so this is only a warning even when strict
+                if abs(sum(msg_prop[1])) != 0 and byte_count != abs(sum(msg_prop[1])):
+                    CsafeCmd.__fail(ByteCountException(
+                        transmission, offset, 'byte_count is an unexpected length'
+                    ), False, logging.WARNING)
+
+                # Extract values
+                for num_bytes in msg_prop[1]:
+                    raw_bytes = message[k:k + abs(num_bytes)]
+                    if strict and len(raw_bytes) != abs(num_bytes):
+                        raise IndexError('Frame ends in command')
+                    value = (
+                        CsafeCmd.__bytes2int(raw_bytes)
+                        if num_bytes >= 0
+                        else CsafeCmd.__bytes2ascii(raw_bytes)
+                    )
+                    result.append(value)
+                    k = k + abs(num_bytes)
+
+                response[msg_cmd] = result
+        except (IndexError, KeyError) as ex:
+            CsafeCmd.__fail(TruncatedFrameException(
+                transmission, offset, 'Truncated or unknown command ({0})'.format(ex)
+            ), strict)
+            raise
+
+        # Length of the report up to the stop flag, for the next estimate of this response
+        if model is not None:
+            model.observe(list(response), j + 1, data, stuffed)
 
         return response
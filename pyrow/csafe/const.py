@@ -1,136 +1,375 @@
+import sys
+
 # Unique Frame Flags
 EXTENDED_FRAME_START_FLAG = 0xF0
 STANDARD_FRAME_START_FLAG = 0xF1
 STOP_FRAME_FLAG = 0xF2
 BYTE_STUFFING_FLAG = 0xF3
 
-# 'COMMAND_NAME': [0xCmd_Id, [Bytes, ...]],
 
-CMDS = {
+class Command(object):
+    """
+    Command
+    The id of each command, PM specific commands include their wrapper (0x1Axx) so every
+    command and response can be keyed by one integer. Plain ints rather than an enum, which
+    is slower to import and not available before Python 3.4
+    """
+
     # Short Commands
-    'CSAFE_GETSTATUS_CMD': [0x80, []],
-    'CSAFE_RESET_CMD': [0x81, []],
-    'CSAFE_GOIDLE_CMD': [0x82, []],
-    'CSAFE_GOHAVEID_CMD': [0x83, []],
-    'CSAFE_GOINUSE_CMD': [0x85, []],
-    'CSAFE_GOFINISHED_CMD': [0x86, []],
-    'CSAFE_GOREADY_CMD': [0x87, []],
-    'CSAFE_BADID_CMD': [0x88, []],
-    'CSAFE_GETVERSION_CMD': [0x91, []],
-    'CSAFE_GETID_CMD': [0x92, []],
-    'CSAFE_GETUNITS_CMD': [0x93, []],
-    'CSAFE_GETSERIAL_CMD': [0x94, []],
-    'CSAFE_GETODOMETER_CMD': [0x9B, []],
-    'CSAFE_GETERRORCODE_CMD': [0x9C, []],
-    'CSAFE_GETTWORK_CMD': [0xA0, []],
-    'CSAFE_GETHORIZONTAL_CMD': [0xA1, []],
-    'CSAFE_GETCALORIES_CMD': [0xA3, []],
-    'CSAFE_GETPROGRAM_CMD': [0xA4, []],
-    'CSAFE_GETPACE_CMD': [0xA6, []],
-    'CSAFE_GETCADENCE_CMD': [0xA7, []],
-    'CSAFE_GETUSERINFO_CMD': [0xAB, []],
-    'CSAFE_GETHRCUR_CMD': [0xB0, []],
-    'CSAFE_GETPOWER_CMD': [0xB4, []],
+    CSAFE_GETSTATUS_CMD = 0x80
+    CSAFE_RESET_CMD = 0x81
+    CSAFE_GOIDLE_CMD = 0x82
+    CSAFE_GOHAVEID_CMD = 0x83
+    CSAFE_GOINUSE_CMD = 0x85
+    CSAFE_GOFINISHED_CMD = 0x86
+    CSAFE_GOREADY_CMD = 0x87
+    CSAFE_BADID_CMD = 0x88
+    CSAFE_GETVERSION_CMD = 0x91
+    CSAFE_GETID_CMD = 0x92
+    CSAFE_GETUNITS_CMD = 0x93
+    CSAFE_GETSERIAL_CMD = 0x94
+    CSAFE_GETODOMETER_CMD = 0x9B
+    CSAFE_GETERRORCODE_CMD = 0x9C
+    CSAFE_GETTWORK_CMD = 0xA0
+    CSAFE_GETHORIZONTAL_CMD = 0xA1
+    CSAFE_GETCALORIES_CMD = 0xA3
+    CSAFE_GETPROGRAM_CMD = 0xA4
+    CSAFE_GETPACE_CMD = 0xA6
+    CSAFE_GETCADENCE_CMD = 0xA7
+    CSAFE_GETUSERINFO_CMD = 0xAB
+    CSAFE_GETHRCUR_CMD = 0xB0
+    CSAFE_GETPOWER_CMD = 0xB4
 
     # Long Commands
-    'CSAFE_AUTOUPLOAD_CMD': [0x01, [1, ]],  # Configuration (no affect)
-    'CSAFE_IDDIGITS_CMD': [0x10, [1, ]],  # Number of Digits
-    'CSAFE_SETTIME_CMD': [0x11, [1, 1, 1]],  # Hour, Minute, Seconds
-    'CSAFE_SETDATE_CMD': [0x12, [1, 1, 1]],  # Year, Month, Day
-    'CSAFE_SETTIMEOUT_CMD': [0x13, [1, ]],  # State Timeout
-    'CSAFE_SETUSERCFG1_CMD': [0x1A, [0, ]],  # PM3 Specific Command (length computed)
-    'CSAFE_SETTWORK_CMD': [0x20, [1, 1, 1]],  # Hour, Minute, Seconds
-    'CSAFE_SETHORIZONTAL_CMD': [0x21, [2, 1]],  # Distance, Units
-    'CSAFE_SETCALORIES_CMD': [0x23, [2, ]],  # Total Calories
-    'CSAFE_SETPROGRAM_CMD': [0x24, [1, 1]],  # Workout ID, N/A
-    'CSAFE_SETPOWER_CMD': [0x34, [2, 1]],  # Stroke Watts, Units
-    'CSAFE_GETCAPS_CMD': [0x70, [1, ]],  # Capability Code
-
-    # PM3 Specific Short Commands
-    'CSAFE_PM_GET_WORKOUTTYPE': [0x89, [], 0x1A],
-    'CSAFE_PM_GET_WORKOUTSTATE': [0x8D, [], 0x1A],
-    'CSAFE_PM_GET_INTERVALTYPE': [0x8E, [], 0x1A],
-    'CSAFE_PM_GET_WORKOUTINTERVALCOUNT': [0x9F, [], 0x1A],
-    'CSAFE_PM_GET_WORKTIME': [0xA0, [], 0x1A],
-    'CSAFE_PM_GET_WORKDISTANCE': [0xA3, [], 0x1A],
-    'CSAFE_PM_GET_STROKESTATE': [0xBF, [], 0x1A],
-    'CSAFE_PM_GET_DRAGFACTOR': [0xC1, [], 0x1A],
-    'CSAFE_PM_GET_ERRORVALUE': [0xC9, [], 0x1A],
-    'CSAFE_PM_GET_RESTTIME': [0xCF, [], 0x1A],
-
-    # PM3 Specific Long Commands
-    'CSAFE_PM_SET_SPLITDURATION': [0x05, [1, 4], 0x1A],  # Time(0)/Distance(128), Duration
-    'CSAFE_PM_SET_SCREENERRORMODE': [0x27, [1, ], 0x1A],  # Disable(0)/Enable(1)
-    'CSAFE_PM_GET_FORCEPLOTDATA': [0x6B, [1, ], 0x1A],  # Block Length
-    'CSAFE_PM_GET_HEARTBEATDATA': [0x6C, [1, ], 0x1A],  # Block Length
-    'CSAFE_PM_GET_STROKESTATS': [0x6E, [2, ], 0x1A],
-}
+    CSAFE_AUTOUPLOAD_CMD = 0x01
+    CSAFE_IDDIGITS_CMD = 0x10
+    CSAFE_SETTIME_CMD = 0x11
+    CSAFE_SETDATE_CMD = 0x12
+    CSAFE_SETTIMEOUT_CMD = 0x13
+    CSAFE_SETUSERCFG1_CMD = 0x1A
+    CSAFE_SETTWORK_CMD = 0x20
+    CSAFE_SETHORIZONTAL_CMD = 0x21
+    CSAFE_SETCALORIES_CMD = 0x23
+    CSAFE_SETPROGRAM_CMD = 0x24
+    CSAFE_SETPOWER_CMD = 0x34
+    CSAFE_GETCAPS_CMD = 0x70
+
+    # PM3 Specific Commands
+    CSAFE_PM_SET_WORKOUTTYPE = 0x1A01
+    CSAFE_PM_SET_WORKOUTDURATION = 0x1A03
+    CSAFE_PM_SET_RESTDURATION = 0x1A04
+    CSAFE_PM_SET_SPLITDURATION = 0x1A05
+    CSAFE_PM_SET_SCREENSTATE = 0x1A13
+    CSAFE_PM_SET_CONFIGUREWORKOUT = 0x1A14
+    CSAFE_PM_SET_SCREENERRORMODE = 0x1A27
+    CSAFE_PM_GET_FORCEPLOTDATA = 0x1A6B
+    CSAFE_PM_GET_HEARTBEATDATA = 0x1A6C
+    CSAFE_PM_GET_STROKESTATS = 0x1A6E
+    CSAFE_PM_GET_WORKOUTTYPE = 0x1A89
+    CSAFE_PM_GET_WORKOUTSTATE = 0x1A8D
+    CSAFE_PM_GET_INTERVALTYPE = 0x1A8E
+    CSAFE_PM_GET_WORKOUTINTERVALCOUNT = 0x1A9F
+    CSAFE_PM_GET_WORKTIME = 0x1AA0
+    CSAFE_PM_GET_WORKDISTANCE = 0x1AA3
+    CSAFE_PM_GET_STROKESTATE = 0x1ABF
+    CSAFE_PM_GET_DRAGFACTOR = 0x1AC1
+    CSAFE_PM_GET_ERRORVALUE = 0x1AC9
+    CSAFE_PM_GET_RESTTIME = 0x1ACF
+
+
+COMMAND_IDS = dict((name, value) for name, value in vars(Command).items()
+                   if name.startswith('CSAFE_'))
+COMMAND_NAMES = dict((value, name) for name, value in COMMAND_IDS.items())
+
+
+class Results(dict):
+    """
+    Results
+    Values of a response keyed by Command, that can also be looked up by command name
+    """
+
+    def __missing__(self, key):
+        """
+        :param Command|string key:
+        :return:
+        """
+        if isinstance(key, str) and key in COMMAND_IDS:
+            return self[COMMAND_IDS[key]]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        """
+        :param Command|string key:
+        :return bool:
+        """
+        if isinstance(key, str):
+            key = COMMAND_IDS.get(key, key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        """
+        :param Command|string key:
+        :param default:
+        :return:
+        """
+        return self[key] if key in self else default
+
+
+# Commands that return data collected since they were last sent
+STREAM_COMMANDS = frozenset([Command.CSAFE_PM_GET_FORCEPLOTDATA,
+                             Command.CSAFE_PM_GET_HEARTBEATDATA])
+QUERY_COMMANDS = frozenset(value for name, value in COMMAND_IDS.items() if '_GET' in name)
+
+
+def iter_commands(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return: Each Command id, without its arguments
+    """
+    table = get_commands()
+    i = 0
+    while i < len(commands):
+        command = commands[i]
+        if isinstance(command, str):
+            command = COMMAND_IDS[command]
+        yield command
+        i += 1 + len(table[command][1])
+
+
+def is_query(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return bool: True if the commands only read from the Performance Monitor
+    """
+    return all(command in QUERY_COMMANDS for command in iter_commands(commands))
+
+
+def is_stream(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return bool: True if any command returns data that is consumed by reading it
+    """
+    return any(command in STREAM_COMMANDS for command in iter_commands(commands))
+
+
+# The command tables are only built the first time get_cmds or get_resp is called
+
+
+# 'COMMAND_NAME': [0xCmd_Id, [Bytes, ...]],
+def _build_cmds():
+    """
+    :return dict:
+    """
+    return {
+        # Short Commands
+        'CSAFE_GETSTATUS_CMD': [0x80, []],
+        'CSAFE_RESET_CMD': [0x81, []],
+        'CSAFE_GOIDLE_CMD': [0x82, []],
+        'CSAFE_GOHAVEID_CMD': [0x83, []],
+        'CSAFE_GOINUSE_CMD': [0x85, []],
+        'CSAFE_GOFINISHED_CMD': [0x86, []],
+        'CSAFE_GOREADY_CMD': [0x87, []],
+        'CSAFE_BADID_CMD': [0x88, []],
+        'CSAFE_GETVERSION_CMD': [0x91, []],
+        'CSAFE_GETID_CMD': [0x92, []],
+        'CSAFE_GETUNITS_CMD': [0x93, []],
+        'CSAFE_GETSERIAL_CMD': [0x94, []],
+        'CSAFE_GETODOMETER_CMD': [0x9B, []],
+        'CSAFE_GETERRORCODE_CMD': [0x9C, []],
+        'CSAFE_GETTWORK_CMD': [0xA0, []],
+        'CSAFE_GETHORIZONTAL_CMD': [0xA1, []],
+        'CSAFE_GETCALORIES_CMD': [0xA3, []],
+        'CSAFE_GETPROGRAM_CMD': [0xA4, []],
+        'CSAFE_GETPACE_CMD': [0xA6, []],
+        'CSAFE_GETCADENCE_CMD': [0xA7, []],
+        'CSAFE_GETUSERINFO_CMD': [0xAB, []],
+        'CSAFE_GETHRCUR_CMD': [0xB0, []],
+        'CSAFE_GETPOWER_CMD': [0xB4, []],
+
+        # Long Commands
+        'CSAFE_AUTOUPLOAD_CMD': [0x01, [1, ]],  # Configuration (no affect)
+        'CSAFE_IDDIGITS_CMD': [0x10, [1, ]],  # Number of Digits
+        'CSAFE_SETTIME_CMD': [0x11, [1, 1, 1]],  # Hour, Minute, Seconds
+        'CSAFE_SETDATE_CMD': [0x12, [1, 1, 1]],  # Year, Month, Day
+        'CSAFE_SETTIMEOUT_CMD': [0x13, [1, ]],  # State Timeout
+        'CSAFE_SETUSERCFG1_CMD': [0x1A, [0, ]],  # PM3 Specific Command (length computed)
+        'CSAFE_SETTWORK_CMD': [0x20, [1, 1, 1]],  # Hour, Minute, Seconds
+        'CSAFE_SETHORIZONTAL_CMD': [0x21, [2, 1]],  # Distance, Units
+        'CSAFE_SETCALORIES_CMD': [0x23, [2, ]],  # Total Calories
+        'CSAFE_SETPROGRAM_CMD': [0x24, [1, 1]],  # Workout ID, N/A
+        'CSAFE_SETPOWER_CMD': [0x34, [2, 1]],  # Stroke Watts, Units
+        'CSAFE_GETCAPS_CMD': [0x70, [1, ]],  # Capability Code
+
+        # PM3 Specific Short Commands
+        'CSAFE_PM_GET_WORKOUTTYPE': [0x89, [], 0x1A],
+        'CSAFE_PM_GET_WORKOUTSTATE': [0x8D, [], 0x1A],
+        'CSAFE_PM_GET_INTERVALTYPE': [0x8E, [], 0x1A],
+        'CSAFE_PM_GET_WORKOUTINTERVALCOUNT': [0x9F, [], 0x1A],
+        'CSAFE_PM_GET_WORKTIME': [0xA0, [], 0x1A],
+        'CSAFE_PM_GET_WORKDISTANCE': [0xA3, [], 0x1A],
+        'CSAFE_PM_GET_STROKESTATE': [0xBF, [], 0x1A],
+        'CSAFE_PM_GET_DRAGFACTOR': [0xC1, [], 0x1A],
+        'CSAFE_PM_GET_ERRORVALUE': [0xC9, [], 0x1A],
+        'CSAFE_PM_GET_RESTTIME': [0xCF, [], 0x1A],
+
+        # PM3 Specific Long Commands
+        'CSAFE_PM_SET_WORKOUTTYPE': [0x01, [1, ], 0x1A],  # Workout Type
+        'CSAFE_PM_SET_WORKOUTDURATION': [0x03, [1, 4], 0x1A],  # Time(0)/Distance(128), Duration
+        'CSAFE_PM_SET_RESTDURATION': [0x04, [2, ], 0x1A],  # Seconds
+        'CSAFE_PM_SET_SCREENSTATE': [0x13, [1, 1], 0x1A],  # Screen Type, Screen Value
+        'CSAFE_PM_SET_CONFIGUREWORKOUT': [0x14, [1, ], 0x1A],  # Disable(0)/Enable(1)
+        'CSAFE_PM_SET_SPLITDURATION': [0x05, [1, 4], 0x1A],  # Time(0)/Distance(128), Duration
+        'CSAFE_PM_SET_SCREENERRORMODE': [0x27, [1, ], 0x1A],  # Disable(0)/Enable(1)
+        'CSAFE_PM_GET_FORCEPLOTDATA': [0x6B, [1, ], 0x1A],  # Block Length
+        'CSAFE_PM_GET_HEARTBEATDATA': [0x6C, [1, ], 0x1A],  # Block Length
+        'CSAFE_PM_GET_STROKESTATS': [0x6E, [2, ], 0x1A],
+    }
+
 
 # resp[0xCmd_Id] = [COMMAND_NAME, [Bytes, ...]],
 # negative number for ASCII
 # use absolute max number for variable, (getid & getcaps)
-RESP = {
-
-    # Response Data to Short Commands
-    0x80: (['CSAFE_GETSTATUS_CMD', [0, ]]),  # Status
-    0x81: (['CSAFE_RESET_CMD', [0, ]]),
-    0x82: (['CSAFE_GOIDLE_CMD', [0, ]]),
-    0x83: (['CSAFE_GOHAVEID_CMD', [0, ]]),
-    0x85: (['CSAFE_GOINUSE_CMD', [0, ]]),
-    0x86: (['CSAFE_GOFINISHED_CMD', [0, ]]),
-    0x87: (['CSAFE_GOREADY_CMD', [0, ]]),
-    0x88: (['CSAFE_BADID_CMD', [0, ]]),
-    0x91: (['CSAFE_GETVERSION_CMD', [1, 1, 1, 2, 2]]),  # Mfg ID, CID, Model, HW Version, SW Version
-    0x92: (['CSAFE_GETID_CMD', [-5, ]]),  # ASCII Digit (variable)
-    0x93: (['CSAFE_GETUNITS_CMD', [1, ]]),  # Units Type
-    0x94: (['CSAFE_GETSERIAL_CMD', [-9, ]]),  # ASCII Serial Number
-    0x9B: (['CSAFE_GETODOMETER_CMD', [4, 1]]),  # Distance, Units Specifier
-    0x9C: (['CSAFE_GETERRORCODE_CMD', [3, ]]),  # Error Code
-    0xA0: (['CSAFE_GETTWORK_CMD', [1, 1, 1]]),  # Hours, Minutes, Seconds
-    0xA1: (['CSAFE_GETHORIZONTAL_CMD', [2, 1]]),  # Distance, Units Specifier
-    0xA3: (['CSAFE_GETCALORIES_CMD', [2, ]]),  # Total Calories
-    0xA4: (['CSAFE_GETPROGRAM_CMD', [1, ]]),  # Program Number
-    0xA6: (['CSAFE_GETPACE_CMD', [2, 1]]),  # Stroke Pace, Units Specifier
-    0xA7: (['CSAFE_GETCADENCE_CMD', [2, 1]]),  # Stroke Rate, Units Specifier
-    0xAB: (['CSAFE_GETUSERINFO_CMD', [2, 1, 1, 1]]),  # Weight, Units Specifier, Age, Gender
-    0xB0: (['CSAFE_GETHRCUR_CMD', [1, ]]),  # Beats/Min
-    0xB4: (['CSAFE_GETPOWER_CMD', [2, 1]]),  # Stroke Watts
-
-    # Response Data to Long Commands
-    0x01: (['CSAFE_AUTOUPLOAD_CMD', [0, ]]),
-    0x10: (['CSAFE_IDDIGITS_CMD', [0, ]]),
-    0x11: (['CSAFE_SETTIME_CMD', [0, ]]),
-    0x12: (['CSAFE_SETDATE_CMD', [0, ]]),
-    0x13: (['CSAFE_SETTIMEOUT_CMD', [0, ]]),
-    0x1A: (['CSAFE_SETUSERCFG1_CMD', [0, ]]),  # PM3 Specific Command ID
-    0x20: (['CSAFE_SETTWORK_CMD', [0, ]]),
-    0x21: (['CSAFE_SETHORIZONTAL_CMD', [0, ]]),
-    0x23: (['CSAFE_SETCALORIES_CMD', [0, ]]),
-    0x24: (['CSAFE_SETPROGRAM_CMD', [0, ]]),
-    0x34: (['CSAFE_SETPOWER_CMD', [0, ]]),
-    0x70: (['CSAFE_GETCAPS_CMD', [11, ]]),  # Depended on Capability Code (variable)
-
-    # Response Data to PM3 Specific Short Commands
-    0x1A89: (['CSAFE_PM_GET_WORKOUTTYPE', [1, ]]),  # Workout Type
-    0x1AC1: (['CSAFE_PM_GET_DRAGFACTOR', [1, ]]),  # Drag Factor
-    0x1ABF: (['CSAFE_PM_GET_STROKESTATE', [1, ]]),  # Stroke State
-    # Work Time (seconds * 100), Fractional Work Time (1/100)
-    0x1AA0: (['CSAFE_PM_GET_WORKTIME', [4, 1]]),
-    # Work Distance (meters * 10), Fractional Work Distance (1/10)
-    0x1AA3: (['CSAFE_PM_GET_WORKDISTANCE', [4, 1]]),
-    0x1AC9: (['CSAFE_PM_GET_ERRORVALUE', [2, ]]),  # Error Value
-    0x1A8D: (['CSAFE_PM_GET_WORKOUTSTATE', [1, ]]),  # Workout State
-    0x1A9F: (['CSAFE_PM_GET_WORKOUTINTERVALCOUNT', [1, ]]),  # Workout Interval Count
-    0x1A8E: (['CSAFE_PM_GET_INTERVALTYPE', [1, ]]),  # Interval Type
-    0x1ACF: (['CSAFE_PM_GET_RESTTIME', [2, ]]),  # Rest Time
-
-    # Response Data to PM3 Specific Long Commands
-    0x1A05: (['CSAFE_PM_SET_SPLITDURATION', [0, ]]),  # No variables returned !! double check
-    0x1A6B: ['CSAFE_PM_GET_FORCEPLOTDATA', [
-        1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]],  # Bytes read, data ...
-    0x1A27: (['CSAFE_PM_SET_SCREENERRORMODE', [0, ]]),  # No variables returned !! double check
-    0x1A6C: (['CSAFE_PM_GET_HEARTBEATDATA', [
-        1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]]),  # Bytes read, data ...
-    0x1A6E: (['CSAFE_PM_GET_STROKESTATS', [
-        2, 1, 2, 1, 2, 2, 2, 2, 2]])  # Bytes read, data ...
+def _build_resp():
+    """
+    :return dict:
+    """
+    return {
+
+        # Response Data to Short Commands
+        0x80: (['CSAFE_GETSTATUS_CMD', [0, ]]),  # Status
+        0x81: (['CSAFE_RESET_CMD', [0, ]]),
+        0x82: (['CSAFE_GOIDLE_CMD', [0, ]]),
+        0x83: (['CSAFE_GOHAVEID_CMD', [0, ]]),
+        0x85: (['CSAFE_GOINUSE_CMD', [0, ]]),
+        0x86: (['CSAFE_GOFINISHED_CMD', [0, ]]),
+        0x87: (['CSAFE_GOREADY_CMD', [0, ]]),
+        0x88: (['CSAFE_BADID_CMD', [0, ]]),
+        # Mfg ID, CID, Model, HW Version, SW Version
+        0x91: (['CSAFE_GETVERSION_CMD', [1, 1, 1, 2, 2]]),
+        0x92: (['CSAFE_GETID_CMD', [-5, ]]),  # ASCII Digit (variable)
+        0x93: (['CSAFE_GETUNITS_CMD', [1, ]]),  # Units Type
+        0x94: (['CSAFE_GETSERIAL_CMD', [-9, ]]),  # ASCII Serial Number
+        0x9B: (['CSAFE_GETODOMETER_CMD', [4, 1]]),  # Distance, Units Specifier
+        0x9C: (['CSAFE_GETERRORCODE_CMD', [3, ]]),  # Error Code
+        0xA0: (['CSAFE_GETTWORK_CMD', [1, 1, 1]]),  # Hours, Minutes, Seconds
+        0xA1: (['CSAFE_GETHORIZONTAL_CMD', [2, 1]]),  # Distance, Units Specifier
+        0xA3: (['CSAFE_GETCALORIES_CMD', [2, ]]),  # Total Calories
+        0xA4: (['CSAFE_GETPROGRAM_CMD', [1, ]]),  # Program Number
+        0xA6: (['CSAFE_GETPACE_CMD', [2, 1]]),  # Stroke Pace, Units Specifier
+        0xA7: (['CSAFE_GETCADENCE_CMD', [2, 1]]),  # Stroke Rate, Units Specifier
+        0xAB: (['CSAFE_GETUSERINFO_CMD', [2, 1, 1, 1]]),  # Weight, Units Specifier, Age, Gender
+        0xB0: (['CSAFE_GETHRCUR_CMD', [1, ]]),  # Beats/Min
+        0xB4: (['CSAFE_GETPOWER_CMD', [2, 1]]),  # Stroke Watts
+
+        # Response Data to Long Commands
+        0x01: (['CSAFE_AUTOUPLOAD_CMD', [0, ]]),
+        0x10: (['CSAFE_IDDIGITS_CMD', [0, ]]),
+        0x11: (['CSAFE_SETTIME_CMD', [0, ]]),
+        0x12: (['CSAFE_SETDATE_CMD', [0, ]]),
+        0x13: (['CSAFE_SETTIMEOUT_CMD', [0, ]]),
+        0x1A: (['CSAFE_SETUSERCFG1_CMD', [0, ]]),  # PM3 Specific Command ID
+        0x20: (['CSAFE_SETTWORK_CMD', [0, ]]),
+        0x21: (['CSAFE_SETHORIZONTAL_CMD', [0, ]]),
+        0x23: (['CSAFE_SETCALORIES_CMD', [0, ]]),
+        0x24: (['CSAFE_SETPROGRAM_CMD', [0, ]]),
+        0x34: (['CSAFE_SETPOWER_CMD', [0, ]]),
+        0x70: (['CSAFE_GETCAPS_CMD', [11, ]]),  # Depended on Capability Code (variable)
+
+        # Response Data to PM3 Specific Short Commands
+        0x1A89: (['CSAFE_PM_GET_WORKOUTTYPE', [1, ]]),  # Workout Type
+        0x1AC1: (['CSAFE_PM_GET_DRAGFACTOR', [1, ]]),  # Drag Factor
+        0x1ABF: (['CSAFE_PM_GET_STROKESTATE', [1, ]]),  # Stroke State
+        # Work Time (seconds * 100), Fractional Work Time (1/100)
+        0x1AA0: (['CSAFE_PM_GET_WORKTIME', [4, 1]]),
+        # Work Distance (meters * 10), Fractional Work Distance (1/10)
+        0x1AA3: (['CSAFE_PM_GET_WORKDISTANCE', [4, 1]]),
+        0x1AC9: (['CSAFE_PM_GET_ERRORVALUE', [2, ]]),  # Error Value
+        0x1A8D: (['CSAFE_PM_GET_WORKOUTSTATE', [1, ]]),  # Workout State
+        0x1A9F: (['CSAFE_PM_GET_WORKOUTINTERVALCOUNT', [1, ]]),  # Workout Interval Count
+        0x1A8E: (['CSAFE_PM_GET_INTERVALTYPE', [1, ]]),  # Interval Type
+        0x1ACF: (['CSAFE_PM_GET_RESTTIME', [2, ]]),  # Rest Time
+
+        # Response Data to PM3 Specific Long Commands
+        0x1A01: (['CSAFE_PM_SET_WORKOUTTYPE', [0, ]]),
+        0x1A03: (['CSAFE_PM_SET_WORKOUTDURATION', [0, ]]),
+        0x1A04: (['CSAFE_PM_SET_RESTDURATION', [0, ]]),
+        0x1A13: (['CSAFE_PM_SET_SCREENSTATE', [0, ]]),
+        0x1A14: (['CSAFE_PM_SET_CONFIGUREWORKOUT', [0, ]]),
+        0x1A05: (['CSAFE_PM_SET_SPLITDURATION', [0, ]]),  # No variables returned !! double check
+        0x1A6B: ['CSAFE_PM_GET_FORCEPLOTDATA', [
+            1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]],  # Bytes read, data ...
+        0x1A27: (['CSAFE_PM_SET_SCREENERRORMODE', [0, ]]),  # No variables returned !! double check
+        0x1A6C: (['CSAFE_PM_GET_HEARTBEATDATA', [
+            1, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]]),  # Bytes read, data ...
+        0x1A6E: (['CSAFE_PM_GET_STROKESTATS', [
+            2, 1, 2, 1, 2, 2, 2, 2, 2]])  # Bytes read, data ...
+    }
+
+
+def _build_commands():
+    """
+    :return dict: CMDS keyed by Command
+    """
+    return dict((COMMAND_IDS[name], properties) for name, properties in get_cmds().items())
+
+
+_CMDS = None
+_RESP = None
+_COMMANDS = None
+
+
+def get_cmds():
+    """
+    :return dict: Commands by name
+    """
+    global _CMDS
+    if _CMDS is None:
+        _CMDS = _build_cmds()
+    return _CMDS
+
+
+def get_resp():
+    """
+    :return dict: Responses by command id
+    """
+    global _RESP
+    if _RESP is None:
+        _RESP = _build_resp()
+    return _RESP
+
+
+def get_commands():
+    """
+    :return dict: Commands by Command
+    """
+    global _COMMANDS
+    if _COMMANDS is None:
+        _COMMANDS = _build_commands()
+    return _COMMANDS
+
+
+_TABLES = {
+    'CMDS': get_cmds,
+    'RESP': get_resp,
+    'COMMANDS': get_commands,
 }
+
+
+def __getattr__(name):
+    """
+    Keeps CMDS, RESP and COMMANDS available as module attributes, built on first access
+    :param string name:
+    :return dict:
+    """
+    if name in _TABLES:
+        table = _TABLES[name]()
+        globals()[name] = table
+        return table
+    raise AttributeError('module {0} has no attribute {1}'.format(__name__, name))
+
+
+# Module __getattr__ needs Python 3.7, before that the tables are built on import
+if sys.version_info < (3, 7):
+    CMDS = get_cmds()
+    RESP = get_resp()
+    COMMANDS = get_commands()
@@ -0,0 +1,138 @@
+"""
+PyRow.CSAFE.Framing
+
+Byte stuffing and checksums of CSAFE frames, done with bulk bytes operations instead of a loop
+over every byte.
+
+Bytes 0xF0 to 0xF3 are reserved for the frame flags, inside a frame they are sent as the
+stuffing flag 0xF3 followed by the low two bits of the byte.
+
+Extended frames carry a destination and source address after the start flag, so several
+Performance Monitors can share one link.
+"""
+
+import operator
+import struct
+from functools import reduce
+
+from pyrow.csafe import const
+
+FLAGS = bytes(range(const.EXTENDED_FRAME_START_FLAG, const.BYTE_STUFFING_FLAG + 1))
+STUFF_FLAG = bytes([const.BYTE_STUFFING_FLAG])
+
+# The stuffing flag itself goes first when stuffing and last when unstuffing, so the flags
+# added or restored by the other replacements are never replaced again
+STUFFING = [(STUFF_FLAG, STUFF_FLAG + b'\x03')] + [
+    (bytes([flag]), STUFF_FLAG + bytes([flag & 0x03])) for flag in FLAGS[:-1]
+]
+STUFFED_F0, STUFFED_F1, STUFFED_F2, STUFFED_F3 = (STUFF_FLAG + bytes([i]) for i in range(4))
+
+HOST_ADDRESS = 0x00
+DEFAULT_ADDRESS = 0xFD
+BROADCAST_ADDRESS = 0xFF
+
+# Report id and size of the HID reports a frame can be sent in, smallest first
+REPORT_SIZES = ((0x01, 21), (0x04, 63), (0x02, 121))
+
+_WORDS = {}
+
+
+def checksum(data):
+    """
+    XOR of every byte, folded from 64 bit words
+    :param bytes data:
+    :return int:
+    """
+    length = len(data)
+    words = _WORDS.get(length)
+    if words is None:
+        words = struct.Struct('<{0}Q{1}B'.format(length // 8, length % 8))
+        words = _WORDS.setdefault(length, words)
+    value = reduce(operator.xor, words.unpack(data), 0)
+    value ^= value >> 32
+    value ^= value >> 16
+    value ^= value >> 8
+    return value & 0xFF
+
+
+def stuff(data):
+    """
+    :param bytes data:
+    :return bytes:
+    """
+    if len(data.translate(None, FLAGS)) == len(data):
+        return data
+    for flag, stuffed in STUFFING:
+        data = data.replace(flag, stuffed)
+    return data
+
+
+def unstuff(data):
+    """
+    :param bytes data:
+    :return bytes:
+    """
+    count = data.count(STUFF_FLAG)
+    if not count:
+        return data
+
+    if count != (data.count(STUFFED_F0) + data.count(STUFFED_F1) + data.count(STUFFED_F2) +
+                 data.count(STUFFED_F3)):
+        # A stuffing flag followed by something other than 0 - 3
+        return _unstuff_bytes(data)
+
+    return (data.replace(STUFFED_F0, b'\xf0').replace(STUFFED_F1, b'\xf1')
+            .replace(STUFFED_F2, b'\xf2').replace(STUFFED_F3, STUFF_FLAG))
+
+
+def _unstuff_bytes(data):
+    """
+    Unstuffs one byte at a time the way CsafeCmd always has, for malformed data
+    :param bytes data:
+    :return bytes:
+    """
+    message = list(data)
+    i = 0
+    while i < len(message):
+        if message[i] == const.BYTE_STUFFING_FLAG:
+            stuff_value = message.pop(i + 1)
+            message[i] = 0xF0 | stuff_value
+        i += 1
+    return bytes(message)
+
+
+def address(report, destination, source=HOST_ADDRESS):
+    """
+    Turns the standard frame of a report into an extended frame addressed to destination,
+    moving it to a larger report if it no longer fits
+    :param [int] report: HID report with a standard frame, e.g. from CsafeCmd.write
+    :param int destination:
+    :param int source:
+    :return [int]: HID report with an extended frame
+    """
+    for value in (destination, source):
+        # Addresses are not stuffed, so the flags cannot be used
+        if not 0 <= value <= 0xFF or bytes([value]) in FLAGS:
+            raise ValueError('Invalid address {0}'.format(value))
+
+    if report[1] != const.STANDARD_FRAME_START_FLAG:
+        raise ValueError('Not a standard frame')
+
+    stop = report.index(const.STOP_FRAME_FLAG, 2)
+    frame = [const.EXTENDED_FRAME_START_FLAG, destination, source]
+    frame.extend(report[2:stop + 1])
+
+    for report_id, size in REPORT_SIZES:
+        if len(frame) < size and size >= len(report):
+            return [report_id] + frame + [0] * (size - len(frame) - 1)
+    raise ValueError('Frame too long to address: {0}'.format(len(frame)))
+
+
+def get_addresses(report):
+    """
+    :param [int] report: HID report
+    :return (int, int): Destination and source of an extended frame, None for a standard frame
+    """
+    if report[1] != const.EXTENDED_FRAME_START_FLAG:
+        return None
+    return report[2], report[3]
@@ -0,0 +1,227 @@
+"""
+PyRow.CSAFE.Packing
+
+Splits and merges commands into the fewest frames that fit the largest HID report, both for the
+request and for the response estimated by sizing.MODEL.
+
+Queries can be sent in any order, so they are packed first fit decreasing by response size,
+repeated queries are sent once and the PM specific commands of each frame are kept together
+under one CSAFE_SETUSERCFG1_CMD wrapper. Commands that change the Performance Monitor keep
+their order and are split where a frame is full.
+
+The plan for a set of commands is computed the first time the set is seen and reused, only the
+arguments are taken from each call.
+"""
+
+from pyrow.csafe import const, sizing
+
+MAX_REPORT = sizing.MAX_REPORT
+
+FRAME_BYTES = 4  # Report id, start flag, checksum & stop flag
+WRAPPER_BYTES = 2  # Wrapper id & data byte count
+
+
+def _split(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return [(Command, tuple)]: Each command with its arguments
+    """
+    items = []
+    i = 0
+    while i < len(commands):
+        command = commands[i]
+        if isinstance(command, str):
+            command = const.COMMAND_IDS[command]
+        arguments = len(const.get_commands()[command][1])
+        items.append((command, tuple(commands[i + 1:i + 1 + arguments])))
+        i += 1 + arguments
+    return items
+
+
+def request_size(command):
+    """
+    :param Command command:
+    :return int: Bytes of the command in a request, assuming every argument byte is stuffed
+    """
+    widths = const.get_commands()[command][1]
+    if not widths:
+        return 1
+    return 2 + 2 * sum(widths)
+
+
+def is_wrapped(command):
+    """
+    :param Command command:
+    :return bool: True for PM specific commands, which are sent in a wrapper
+    """
+    return len(const.get_commands()[command]) == 3
+
+
+class _Frame(object):
+    """
+    Commands packed into one frame so far
+    """
+
+    def __init__(self, grouped):
+        """
+        :param bool grouped: Whether the wrapped commands will be sent together
+        :return:
+        """
+        self.grouped = grouped
+        self.indexes = []
+        self.commands = []
+        self.request = FRAME_BYTES + 1  # Checksum may be stuffed
+        self.wrapped = False
+
+    def add(self, index, command, size=MAX_REPORT):
+        """
+        :param int index:
+        :param Command command:
+        :param int size: Report size the frame has to fit
+        :return bool: False if the command does not fit
+        """
+        # A wrapper is reopened after each command outside it unless the frame is grouped
+        wrapped = self.wrapped and (self.grouped or is_wrapped(self.commands[-1]))
+        wrapper = WRAPPER_BYTES if is_wrapped(command) and not wrapped else 0
+        request = self.request + request_size(command) + wrapper
+
+        commands = self.commands + [command]
+        if self.grouped:
+            commands = _arrange(commands)
+        if self.indexes and (request > size or sizing.MODEL.get_response_size(commands) > size):
+            return False
+
+        self.indexes.append(index)
+        self.commands.append(command)
+        self.request = request
+        self.wrapped = self.wrapped or is_wrapped(command)
+        return True
+
+
+def _arrange(commands):
+    """
+    :param [] commands:
+    :return []: The commands with the wrapped commands moved to the end, in their order
+    """
+    return ([command for command in commands if not is_wrapped(command)] +
+            [command for command in commands if is_wrapped(command)])
+
+
+class PackingPlan(object):
+    """
+    PackingPlan
+    Which of a set of commands go in which frame
+    """
+
+    def __init__(self, commands):
+        """
+        :param tuple commands: Commands without their arguments
+        :return:
+        """
+        self.__commands = commands
+        # The commands have no arguments, so is_query would take some of them for arguments
+        if all(command in const.QUERY_COMMANDS for command in commands):
+            self.__frames = self.__pack_queries(commands)
+        else:
+            self.__frames = self.__pack_ordered(commands)
+
+    @staticmethod
+    def __pack_queries(commands):
+        """
+        :param tuple commands:
+        :return tuple: Indexes of the commands in each frame
+        """
+        frames = []
+        # A query without arguments is answered the same every time it is in a frame
+        seen = set()
+        indexes = []
+        for index, command in enumerate(commands):
+            if const.get_commands()[command][1] or command not in seen:
+                seen.add(command)
+                indexes.append(index)
+
+        order = sorted(indexes, key=lambda i: -sizing.data_size(commands[i]))
+        for index in order:
+            for frame in frames:
+                if frame.add(index, commands[index]):
+                    break
+            else:
+                frame = _Frame(True)
+                frame.add(index, commands[index])
+                frames.append(frame)
+
+        # Keep the original order within the frame, with the wrapped commands together
+        packed = []
+        for frame in frames:
+            indexes = sorted(frame.indexes)
+            packed.append(tuple([i for i in indexes if not is_wrapped(commands[i])] +
+                                [i for i in indexes if is_wrapped(commands[i])]))
+        return tuple(sorted(packed, key=min))
+
+    @staticmethod
+    def __pack_ordered(commands):
+        """
+        :param tuple commands:
+        :return tuple: Indexes of the commands in each frame
+        """
+        frames = []
+        frame = _Frame(False)
+        for index, command in enumerate(commands):
+            if not frame.add(index, command):
+                frames.append(tuple(frame.indexes))
+                frame = _Frame(False)
+                frame.add(index, command)
+        if frame.indexes:
+            frames.append(tuple(frame.indexes))
+        return tuple(frames)
+
+    def get_commands(self):
+        """
+        :return tuple: Commands without their arguments
+        """
+        return self.__commands
+
+    def get_frames(self):
+        """
+        :return tuple: Indexes of the commands in each frame
+        """
+        return self.__frames
+
+    def apply(self, commands):
+        """
+        :param [] commands: Commands and their arguments, the same commands as the plan
+        :return [[]]: Commands and their arguments of each frame
+        """
+        items = _split(commands)
+        frames = []
+        for indexes in self.__frames:
+            frame = []
+            for index in indexes:
+                command, arguments = items[index]
+                frame.append(command)
+                frame.extend(arguments)
+            frames.append(frame)
+        return frames
+
+
+_PLANS = {}
+
+
+def get_plan(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return PackingPlan:
+    """
+    key = tuple(command for command, _ in _split(commands))
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = _PLANS.setdefault(key, PackingPlan(key))
+    return plan
+
+
+def pack(commands):
+    """
+    :param [] commands: Commands and their arguments
+    :return [[]]: Commands and their arguments of each frame
+    """
+    return get_plan(commands).apply(commands)
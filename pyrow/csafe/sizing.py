@@ -0,0 +1,175 @@
+"""
+PyRow.CSAFE.Sizing
+
+Estimates how long the response to a frame can be, so the frame is sent in the smallest HID
+report that the response also fits in.
+
+Without stuffing a response has a fixed length for a set of commands. Stuffing adds a byte for
+every data byte that happens to be 0xF0 - 0xF3, so instead of allowing for every byte to be
+stuffed the estimate allows for as many stuffed bytes as a binomial of the stuffing rate
+reaches with probability 1 - TAIL. Responses that are read update the stuffing rate and the
+longest response seen for each set of commands, which the estimate does not go below until
+MIN_SAMPLES more data bytes have been read without it coming back, so a rare long response
+does not keep a set of commands in a larger report for good. A poll whose unstuffed response
+already needs the report it is sent in cannot shrink at all.
+"""
+
+from threading import Lock
+
+from pyrow.csafe import const
+
+MAX_REPORT = 121  # Largest HID report
+
+FRAME_BYTES = 5  # Report id, start flag, status, checksum & stop flag
+COMMAND_BYTES = 2  # Command id & data byte count
+WRAPPER_BYTES = 2  # Wrapper id & data byte count
+
+STUFFING_RATE = 4 / 256.  # Every byte value equally likely
+TAIL = 1e-9
+MIN_SAMPLES = 10000  # Data bytes read before the measured stuffing rate is used
+
+
+def data_size(command):
+    """
+    :param Command command:
+    :return int: Longest data of the response to the command, without stuffing
+    """
+    return abs(sum(const.get_resp()[command][1]))
+
+
+def get_key(commands):
+    """
+    :param [Command] commands: Commands without their arguments
+    :return frozenset: Commands whose responses are counted together
+    """
+    return frozenset(commands).difference((const.Command.CSAFE_GETSTATUS_CMD,))
+
+
+class ResponseSizeModel(object):
+    """
+    ResponseSizeModel
+    """
+
+    def __init__(self, rate=STUFFING_RATE, tail=TAIL):
+        """
+        :param float rate: Stuffing rate assumed until MIN_SAMPLES data bytes have been read
+        :param float tail: Probability of a response being longer than estimated
+        :return:
+        """
+        self.__default_rate = rate
+        self.__rate = rate
+        self.__tail = tail
+        self.__allowances = {}
+        self.__longest = {}
+        self.__recent = {}
+        self.__data = 0
+        self.__stuffed = 0
+        self.__next_update = MIN_SAMPLES
+        self.__lock = Lock()
+
+    def get_rate(self):
+        """
+        :return float: Share of data bytes that are stuffed
+        """
+        return self.__rate
+
+    def get_allowance(self, data):
+        """
+        :param int data: Bytes that may be stuffed
+        :return int: Stuffed bytes to allow for
+        """
+        allowance = self.__allowances.get(data)
+        if allowance is not None:
+            return allowance
+
+        # Smallest allowance the binomial only exceeds with probability tail
+        rate = self.__rate
+        probability = (1 - rate) ** data
+        remaining = 1 - probability
+        allowance = 0
+        while remaining > self.__tail and allowance < data:
+            probability *= (data - allowance) / (allowance + 1.) * rate / (1 - rate)
+            remaining -= probability
+            allowance += 1
+
+        self.__allowances[data] = allowance
+        return allowance
+
+    def get_response_size(self, commands):
+        """
+        :param [Command] commands: Commands of the frame without their arguments, in order
+        :return int: Longest the response report is expected to be
+        """
+        length = FRAME_BYTES
+        data = 1  # Checksum
+        wrapper = None
+        table = const.get_commands()
+        for command in commands:
+            properties = table[command]
+            if len(properties) == 3 and properties[2] != wrapper:
+                length += WRAPPER_BYTES
+            wrapper = properties[2] if len(properties) == 3 else None
+            size = data_size(command)
+            length += COMMAND_BYTES + size
+            data += size
+
+        size = length + self.get_allowance(data)
+        longest = self.__longest.get(get_key(commands))
+        return size if longest is None else max(size, longest)
+
+    def observe(self, commands, length, data, stuffed):
+        """
+        :param [Command] commands: Commands that were answered
+        :param int length: Bytes of the report up to and including the stop flag
+        :param int data: Bytes of the frame after unstuffing
+        :param int stuffed: Bytes that were stuffed
+        :return:
+        """
+        key = get_key(commands)
+        with self.__lock:
+            if length > self.__longest.get(key, 0):
+                self.__longest[key] = length
+            if length > self.__recent.get(key, 0):
+                self.__recent[key] = length
+
+            self.__data += data
+            self.__stuffed += stuffed
+            if self.__data >= self.__next_update:
+                self.__next_update = self.__data + MIN_SAMPLES
+                # One more stuffed byte than measured, so the rate is never 0
+                self.__rate = (self.__stuffed + 1.) / self.__data
+                self.__allowances = {}
+                # Only the longest responses of the last MIN_SAMPLES data bytes are kept
+                self.__longest = self.__recent
+                self.__recent = {}
+
+    def overflow(self, commands, size):
+        """
+        Records a response that did not fit the report it was requested in, so the next
+        estimate picks a larger report
+        :param [Command] commands: Commands that were sent
+        :param int size: Bytes of the report
+        :return:
+        """
+        key = get_key(commands)
+        with self.__lock:
+            for longest in (self.__longest, self.__recent):
+                if longest.get(key, 0) <= size:
+                    longest[key] = size + 1
+
+    def reset(self):
+        """
+        Forgets what was measured
+        :return:
+        """
+        with self.__lock:
+            self.__rate = self.__default_rate
+            self.__allowances = {}
+            self.__longest = {}
+            self.__recent = {}
+            self.__data = 0
+            self.__stuffed = 0
+            self.__next_update = MIN_SAMPLES
+
+
+MODEL = ResponseSizeModel()
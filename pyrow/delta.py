@@ -0,0 +1,155 @@
+"""
+PyRow.Delta
+
+Compact binary delta encoding of erg telemetry, as streamed by pyrow.streaming.
+
+Every message is a varint length followed by the message body. The first message a client
+receives about an erg announces its serial number, after which samples are sent as:
+    SAMPLE, erg id, timestamp delta (ms), field bitmap, varint of each field in the bitmap
+where only the fields that changed are set in the bitmap. A field's varint is 0 if the field is
+not known, otherwise 1 + the zigzag delta against the previous sample sent to that client, with
+a field that was not known counting as 0.
+
+Kept apart from the server, which needs asyncio and async/await, so clients can decode the
+stream on any version.
+"""
+
+from pyrow import telemetry
+from pyrow.varint import decode_varint, encode_varint, unzigzag, zigzag
+
+MESSAGE_ERG = 0x01
+MESSAGE_SAMPLE = 0x02
+
+
+def to_integers(values):
+    """
+    Scales telemetry values to integers of their field resolution
+    :param tuple values:
+    :return tuple:
+    """
+    return tuple(
+        None if value is None else int(round(value * field[2]))
+        for field, value in zip(telemetry.FIELDS, values)
+    )
+
+
+class DeltaEncoder(object):
+    """
+    DeltaEncoder
+    Encodes the samples sent to one client
+    """
+
+    def __init__(self):
+        self.__ergs = {}
+        self.__previous = {}
+
+    def encode(self, serial_number, timestamp, values, out):
+        """
+        :param string serial_number:
+        :param float timestamp:
+        :param tuple values: Integer telemetry values, None if unknown
+        :param bytearray out:
+        :return:
+        """
+        erg_id = self.__ergs.get(serial_number)
+        if erg_id is None:
+            erg_id = len(self.__ergs)
+            self.__ergs[serial_number] = erg_id
+            self.__previous[erg_id] = (0, (None, ) * len(telemetry.FIELDS))
+
+            body = bytearray([MESSAGE_ERG])
+            encode_varint(erg_id, body)
+            body.extend(serial_number.encode('ascii'))
+            encode_varint(len(body), out)
+            out.extend(body)
+
+        previous_timestamp, previous = self.__previous[erg_id]
+        timestamp = int(timestamp * 1000)
+
+        bitmap = 0
+        deltas = bytearray()
+        current = []
+        for k, (old, new) in enumerate(zip(previous, values)):
+            if new is None or new == old:
+                current.append(old)
+                continue
+            bitmap |= 1 << k
+            encode_varint(zigzag(new - (old or 0)) + 1, deltas)
+            current.append(new)
+
+        self.__previous[erg_id] = (timestamp, tuple(current))
+
+        body = bytearray([MESSAGE_SAMPLE])
+        encode_varint(erg_id, body)
+        encode_varint(zigzag(timestamp - previous_timestamp), body)
+        encode_varint(bitmap, body)
+        body.extend(deltas)
+        encode_varint(len(body), out)
+        out.extend(body)
+
+
+class DeltaDecoder(object):
+    """
+    DeltaDecoder
+    Decodes a client's stream back into telemetry Samples
+    """
+
+    def __init__(self):
+        self.__buffer = bytearray()
+        self.__serial_numbers = {}
+        self.__previous = {}
+
+    def feed(self, data):
+        """
+        :param bytes data: Bytes received from the server, may end in a partial message
+        :return [Sample]:
+        """
+        self.__buffer.extend(data)
+        samples = []
+        offset = 0
+        while offset < len(self.__buffer):
+            try:
+                length, start = decode_varint(self.__buffer, offset)
+            except IndexError:
+                break
+            if start + length > len(self.__buffer):
+                break
+            sample = self.__decode(bytes(self.__buffer[start:start + length]))
+            if sample is not None:
+                samples.append(sample)
+            offset = start + length
+
+        del self.__buffer[:offset]
+        return samples
+
+    def __decode(self, body):
+        """
+        :param bytes body:
+        :return Sample:
+        """
+        erg_id, k = decode_varint(body, 1)
+
+        if body[0] == MESSAGE_ERG:
+            self.__serial_numbers[erg_id] = body[k:].decode('ascii')
+            self.__previous[erg_id] = (0, (None, ) * len(telemetry.FIELDS))
+            return None
+
+        previous_timestamp, previous = self.__previous[erg_id]
+        delta, k = decode_varint(body, k)
+        timestamp = previous_timestamp + unzigzag(delta)
+        bitmap, k = decode_varint(body, k)
+
+        current = []
+        for bit, old in enumerate(previous):
+            if bitmap & (1 << bit):
+                delta, k = decode_varint(body, k)
+                old = None if delta == 0 else (old or 0) + unzigzag(delta - 1)
+            current.append(old)
+
+        self.__previous[erg_id] = (timestamp, tuple(current))
+
+        values = [
+            value if value is None or field[2] == 1 else value / float(field[2])
+            for field, value in zip(telemetry.FIELDS, current)
+        ]
+        return telemetry.Sample(self.__serial_numbers[erg_id], timestamp / 1000., *values)
@@ -44,3 +44,84 @@ class RetryLimitException(Exception):
         :return string:
         """
         return 'Retry limit reached, waiting for {0}'.format(self.__waiting_for)
+
+
+class TransportException(Exception):
+    """
+    TransportException
+    """
+
+
+class GatewayException(Exception):
+    """
+    GatewayException
+    """
+
+
+class FrameException(Exception):
+    """
+    FrameException
+    A frame read from the Performance Monitor could not be decoded
+    """
+
+    def __init__(self, transmission, offset, reason):
+        """
+        :param [int] transmission: Raw HID report
+        :param int offset: Offset of the error, in the report or in the unstuffed frame
+        :param string reason:
+        :return:
+        """
+        super(FrameException, self).__init__(transmission, offset, reason)
+        self.__transmission = list(transmission)
+        self.__offset = offset
+        self.__reason = reason
+
+    def get_transmission(self):
+        """
+        :return [int]:
+        """
+        return self.__transmission
+
+    def get_offset(self):
+        """
+        :return int:
+        """
+        return self.__offset
+
+    def __str__(self):
+        """
+        :return string:
+        """
+        return '{0} at offset {1}'.format(self.__reason, self.__offset)
+
+
+class StartFlagException(FrameException):
+    """
+    StartFlagException
+    """
+
+
+class StopFlagException(FrameException):
+    """
+    StopFlagException
+    """
+
+
+class ChecksumException(FrameException):
+    """
+    ChecksumException
+    """
+
+
+class ByteCountException(FrameException):
+    """
+    ByteCountException
+    The data byte count of a command does not match its response
+    """
+
+
+class TruncatedFrameException(FrameException):
+    """
+    TruncatedFrameException
+    The frame ends inside a command or has a command that is not known
+    """
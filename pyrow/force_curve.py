@@ -0,0 +1,220 @@
+"""
+PyRow.ForceCurve
+
+Assembles whole drive force curves from the force plot slices returned in each frame and
+keeps the statistics of the curve up to date as points arrive.
+"""
+
+from array import array
+
+from pyrow.response import Response
+
+
+class ForceCurve(object):
+    """
+    ForceCurve
+    A single drive, stored in a preallocated buffer
+    """
+
+    CAPACITY = 256
+
+    def __init__(self, capacity=CAPACITY, sample_interval=1.):
+        """
+        :param int capacity: Maximum number of points, later points are dropped
+        :param float sample_interval: Time between two points, used for the impulse
+        :return:
+        """
+        self.__points = array('d', bytes(8 * capacity))
+        self.__sample_interval = sample_interval
+        self.__count = 0
+        self.__total = 0.
+        self.__impulse = 0.
+        self.__peak = 0.
+        self.__peak_index = 0
+        self.__dropped = 0
+
+    def clear(self):
+        """
+        :return:
+        """
+        self.__count = 0
+        self.__total = 0.
+        self.__impulse = 0.
+        self.__peak = 0.
+        self.__peak_index = 0
+        self.__dropped = 0
+
+    def extend(self, points):
+        """
+        :param [int] points:
+        :return:
+        """
+        for point in points:
+            if self.__count == len(self.__points):
+                self.__dropped += 1
+                continue
+
+            if self.__count:
+                previous = self.__points[self.__count - 1]
+                self.__impulse += (previous + point) / 2. * self.__sample_interval
+            if point > self.__peak or not self.__count:
+                self.__peak = point
+                self.__peak_index = self.__count
+
+            self.__points[self.__count] = point
+            self.__total += point
+            self.__count += 1
+
+    def get_points(self):
+        """
+        :return memoryview: View of the points in the buffer
+        """
+        return memoryview(self.__points)[:self.__count]
+
+    def get_length(self):
+        """
+        :return int: Number of points in the drive
+        """
+        return self.__count
+
+    def get_dropped(self):
+        """
+        :return int: Number of points that did not fit into the buffer
+        """
+        return self.__dropped
+
+    def get_drive_time(self):
+        """
+        :return float:
+        """
+        return self.__count * self.__sample_interval
+
+    def get_peak_force(self):
+        """
+        :return float:
+        """
+        if self.__count:
+            return self.__peak
+        return None
+
+    def get_average_force(self):
+        """
+        :return float:
+        """
+        if self.__count:
+            return self.__total / self.__count
+        return None
+
+    def get_impulse(self):
+        """
+        Area under the curve (trapezoidal rule)
+        :return float:
+        """
+        return self.__impulse
+
+    def get_peak_position(self):
+        """
+        Where the peak falls in the drive, 0 at the catch and 1 at the finish
+        :return float:
+        """
+        if self.__count > 1:
+            return self.__peak_index / float(self.__count - 1)
+        return None
+
+    def get_shape_ratio(self):
+        """
+        Average force over peak force, 1 for a perfectly flat curve
+        :return float:
+        """
+        if self.__count and self.__peak:
+            return self.get_average_force() / self.__peak
+        return None
+
+    def resample(self, length, out=None):
+        """
+        Linearly interpolates the curve onto a fixed number of points
+        :param int length:
+        :param array out: Buffer of at least length doubles to reuse
+        :return array:
+        """
+        if out is None:
+            out = array('d', bytes(8 * length))
+
+        count = self.__count
+        if count == 0:
+            for k in range(length):
+                out[k] = 0.
+            return out
+        if count == 1 or length == 1:
+            for k in range(length):
+                out[k] = self.__points[0]
+            return out
+
+        points = self.__points
+        step = (count - 1) / float(length - 1)
+        for k in range(length):
+            position = k * step
+            i = int(position)
+            if i >= count - 1:
+                out[k] = points[count - 1]
+            else:
+                fraction = position - i
+                out[k] = points[i] + (points[i + 1] - points[i]) * fraction
+        return out
+
+
+class ForceCurveAssembler(object):
+    """
+    ForceCurveAssembler
+    Builds ForceCurves from the Responses of PerformanceMonitor.get_force_plot()
+
+    A curve starts when the stroke state becomes Drive and is complete once the stroke
+    state has left Drive and the Performance Monitor has no more points to return.
+    """
+
+    def __init__(self, capacity=ForceCurve.CAPACITY, sample_interval=1.):
+        """
+        :param int capacity:
+        :param float sample_interval:
+        :return:
+        """
+        # Two buffers so the completed curve stays valid while the next one is assembled
+        self.__curves = [ForceCurve(capacity, sample_interval),
+                         ForceCurve(capacity, sample_interval)]
+        self.__current = 0
+        self.__in_curve = False
+
+    def get_current(self):
+        """
+        :return ForceCurve: The curve being assembled
+        """
+        return self.__curves[self.__current]
+
+    def update(self, response):
+        """
+        :param Response response:
+        :return ForceCurve: The completed curve, valid until the next curve completes,
+                            or None
+        """
+        points = response.get_force_plot()
+        stroke_state = response.get_stroke_state()
+        curve = self.__curves[self.__current]
+
+        if stroke_state == Response.STROKE_DRIVE:
+            if not self.__in_curve:
+                self.__in_curve = True
+                curve.clear()
+            if points:
+                curve.extend(points)
+            return None
+
+        if not self.__in_curve:
+            return None
+
+        if points:
+            curve.extend(points)
+            return None
+
+        self.__in_curve = False
+        self.__current ^= 1
+        return curve
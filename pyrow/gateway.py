@@ -0,0 +1,377 @@
+"""
+PyRow.Gateway
+
+A Gateway owns every PerformanceMonitor and serves send_commands, get_monitor and set_workout
+to any number of GatewayClients over a TCP or Unix socket.
+
+Each frame is a header (request id, operation, payload length) followed by the payload, a
+tagged binary encoding of the arguments or result, or the compact Response encoding for
+Responses (see pyrow.serialization). Clients can pipeline requests, replies carry the request
+id and are sent as soon as each request completes. Identical queries that are in flight at the
+same time for the same erg are merged into one frame to the erg.
+"""
+
+import socket
+import socketserver
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from pyrow.csafe.const import is_query
+from pyrow.exceptions import GatewayException
+from pyrow.serialization import decode_response, decode_value, encode_response, encode_value
+from pyrow.singleflight import SingleFlight
+
+HEADER = struct.Struct('<IBI')  # Request ID, Operation, Payload Length
+
+OP_LIST = 0x01
+OP_SEND_COMMANDS = 0x02
+OP_GET_MONITOR = 0x03
+OP_SET_WORKOUT = 0x04
+OP_ERROR = 0xFF
+
+# Operations whose result is a Response, sent with the compact Response encoding
+RESPONSE_OPS = (OP_SEND_COMMANDS, OP_GET_MONITOR)
+
+
+def _encode(value):
+    """
+    :param mixed value:
+    :return bytes:
+    """
+    out = bytearray()
+    encode_value(value, out)
+    return bytes(out)
+
+
+def _send_frame(sock, request_id, operation, payload):
+    """
+    :param socket sock:
+    :param int request_id:
+    :param int operation:
+    :param bytes payload:
+    :return:
+    """
+    sock.sendall(HEADER.pack(request_id, operation, len(payload)) + payload)
+
+
+def _receive_frame(rfile):
+    """
+    :param file rfile: Buffered reader of the socket
+    :return (int, int, bytes): Request id, operation and payload, None at the end of the stream
+    """
+    header = rfile.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None
+    request_id, operation, length = HEADER.unpack(header)
+    payload = rfile.read(length)
+    if len(payload) < length:
+        return None
+    return request_id, operation, payload
+
+
+class _GatewayHandler(socketserver.BaseRequestHandler):
+    """
+    Serves one GatewayClient connection
+    """
+
+    def handle(self):
+        gateway = self.server.gateway
+        write_lock = threading.Lock()
+        rfile = self.request.makefile('rb')
+
+        def reply(request_id, operation, payload):
+            with write_lock:
+                try:
+                    _send_frame(self.request, request_id, operation, payload)
+                except OSError:
+                    pass
+
+        while True:
+            try:
+                frame = _receive_frame(rfile)
+            except OSError:
+                frame = None
+            if frame is None:
+                return
+            gateway.submit(frame[0], frame[1], frame[2], reply)
+
+
+class _TcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+def _check_unix_address(address):
+    """
+    :param tuple|string address:
+    :return bool: Whether the address is a path for a Unix socket
+    """
+    if not isinstance(address, str):
+        return False
+    if _UnixServer is None or not hasattr(socket, 'AF_UNIX'):
+        raise ValueError('Unix sockets are not available on this platform, use (host, port)')
+    return True
+
+
+class Gateway(object):
+    """
+    Gateway
+    """
+
+    WORKERS = 16
+
+    def __init__(self, performance_monitors, address, workers=WORKERS):
+        """
+        :param [PerformanceMonitor] performance_monitors:
+        :param tuple|string address: (host, port) for TCP or a path for a Unix socket
+        :param int workers: Requests executed at the same time
+        :return:
+        """
+        self.__performance_monitors = dict(
+            (performance_monitor.get_serial_number(), performance_monitor)
+            for performance_monitor in performance_monitors
+        )
+        self.__flights = dict((serial_number, SingleFlight())
+                              for serial_number in self.__performance_monitors)
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+
+        if _check_unix_address(address):
+            self.__server = _UnixServer(address, _GatewayHandler)
+        else:
+            self.__server = _TcpServer(address, _GatewayHandler)
+        self.__server.gateway = self
+        self.__thread = None
+
+    def start(self):
+        """
+        Serves clients on a background thread
+        :return:
+        """
+        self.__thread = threading.Thread(target=self.__server.serve_forever,
+                                         kwargs={'poll_interval': 0.1}, name='pyrow-gateway')
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__executor.shutdown()
+
+    def get_address(self):
+        """
+        :return tuple|string:
+        """
+        return self.__server.server_address
+
+    def get_merged_count(self):
+        """
+        :return int: Number of queries answered by another client's identical query
+        """
+        return sum(flight.get_merged_count() for flight in self.__flights.values())
+
+    def submit(self, request_id, operation, payload, reply):
+        """
+        Executes a request on the worker pool
+        :param int request_id:
+        :param int operation:
+        :param bytes payload:
+        :param callable reply: Called with the request id, operation and payload of the reply
+        :return:
+        """
+        self.__executor.submit(self.__execute, request_id, operation, payload, reply)
+
+    def __execute(self, request_id, operation, payload, reply):
+        """
+        :param int request_id:
+        :param int operation:
+        :param bytes payload:
+        :param callable reply:
+        :return:
+        """
+        try:
+            arguments = decode_value(payload)[0] if payload else []
+            result = self.__call(operation, arguments)
+            if operation in RESPONSE_OPS:
+                payload = encode_response(result)
+            else:
+                payload = _encode(result)
+        except Exception as ex:  # pylint: disable=broad-except
+            reply(request_id, OP_ERROR, _encode('{0}: {1}'.format(type(ex).__name__, ex)))
+            return
+        reply(request_id, operation, payload)
+
+    def __call(self, operation, arguments):
+        """
+        :param int operation:
+        :param list arguments:
+        :return mixed:
+        """
+        if operation == OP_LIST:
+            return sorted(self.__performance_monitors)
+
+        serial_number = arguments[0]
+        performance_monitor = self.__performance_monitors.get(serial_number)
+        if performance_monitor is None:
+            raise GatewayException('Unknown erg {0}'.format(serial_number))
+        flight = self.__flights[serial_number]
+
+        if operation == OP_SEND_COMMANDS:
+            commands = arguments[1]
+            if is_query(commands):
+                response = flight.do((operation, tuple(commands)),
+                                     performance_monitor.send_commands, commands)
+            else:
+                response = performance_monitor.send_commands(commands)
+            return response
+
+        if operation == OP_GET_MONITOR:
+            options = tuple(arguments[1:4])
+            return flight.do((operation, options), performance_monitor.get_monitor, *options)
+
+        if operation == OP_SET_WORKOUT:
+            performance_monitor.set_workout(**arguments[1])
+            return None
+
+        raise GatewayException('Unknown operation {0}'.format(operation))
+
+
+class GatewayClient(object):
+    """
+    GatewayClient
+    Every request returns a Future, so any number of requests can be in flight at once
+    """
+
+    def __init__(self, address, timeout=None):
+        """
+        :param tuple|string address: (host, port) for TCP or a path for a Unix socket
+        :param float timeout: Seconds to wait for a reply in the blocking methods
+        :return:
+        """
+        if _check_unix_address(address):
+            self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.__socket.connect(address)
+        else:
+            self.__socket = socket.create_connection(address)
+            self.__socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self.__timeout = timeout
+        self.__lock = threading.Lock()
+        self.__next_id = 0
+        self.__pending = {}
+        self.__closed = False
+
+        self.__reader = threading.Thread(target=self.__read, name='pyrow-gateway-client')
+        self.__reader.daemon = True
+        self.__reader.start()
+
+    def submit(self, operation, arguments):
+        """
+        :param int operation:
+        :param list arguments:
+        :return Future: Resolves to the decoded result
+        """
+        future = Future()
+        payload = _encode(arguments)
+        with self.__lock:
+            if self.__closed:
+                raise GatewayException('Connection closed')
+            request_id = self.__next_id
+            self.__next_id = (self.__next_id + 1) & 0xFFFFFFFF
+            self.__pending[request_id] = future
+            _send_frame(self.__socket, request_id, operation, payload)
+        return future
+
+    def list_ergs(self):
+        """
+        :return [string]: Serial numbers of the gateway's ergs
+        """
+        return self.submit(OP_LIST, []).result(self.__timeout)
+
+    def send_commands(self, serial_number, commands):
+        """
+        :param string serial_number:
+        :param [] commands:
+        :return Response:
+        """
+        return self.submit(OP_SEND_COMMANDS, [serial_number, commands]).result(self.__timeout)
+
+    def get_monitor(self, serial_number, force_plot=False, extra_metrics=False,
+                    heartbeat=False):
+        """
+        :param string serial_number:
+        :return Response:
+        """
+        return self.submit(OP_GET_MONITOR, [
+            serial_number, force_plot, extra_metrics, heartbeat
+        ]).result(self.__timeout)
+
+    def set_workout(self, serial_number, **kwargs):
+        """
+        :param string serial_number:
+        :param kwargs: Arguments of PerformanceMonitor.set_workout
+        :return:
+        """
+        self.submit(OP_SET_WORKOUT, [serial_number, kwargs]).result(self.__timeout)
+
+    def close(self):
+        """
+        :return:
+        """
+        try:
+            self.__socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.__socket.close()
+        self.__reader.join()
+
+    def __read(self):
+        """
+        Resolves the futures of replies as they arrive
+        :return:
+        """
+        error = GatewayException('Connection closed')
+        rfile = self.__socket.makefile('rb')
+        while True:
+            try:
+                frame = _receive_frame(rfile)
+            except OSError:
+                frame = None
+            if frame is None:
+                break
+
+            request_id, operation, payload = frame
+            with self.__lock:
+                future = self.__pending.pop(request_id, None)
+            if future is None:
+                continue
+            try:
+                if operation in RESPONSE_OPS:
+                    value = decode_response(payload)[0]
+                else:
+                    value = decode_value(payload)[0]
+            except Exception as ex:  # pylint: disable=broad-except
+                # No later reply can be read, so every request still waiting fails with it
+                future.set_exception(ex)
+                error = ex
+                break
+            if operation == OP_ERROR:
+                future.set_exception(GatewayException(value))
+            else:
+                future.set_result(value)
+
+        with self.__lock:
+            self.__closed = True
+            pending, self.__pending = self.__pending, {}
+        for future in pending.values():
+            future.set_exception(error)
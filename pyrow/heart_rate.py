@@ -0,0 +1,189 @@
+"""
+PyRow.HeartRate
+
+Reconstructs the beat to beat (RR) interval series of each erg from the heartbeat data blocks
+that are polled with the force plot, and keeps a rolling heart rate and RMSSD heart rate
+variability up to date as beats arrive. Each beat costs O(1) regardless of the window length.
+"""
+
+import math
+from array import array
+from threading import Lock
+
+
+class HeartRateSeries(object):
+    """
+    HeartRateSeries
+    The last window RR intervals of one erg, stored in a ring buffer
+    """
+
+    WINDOW = 64
+    MIN_INTERVAL = 250  # 240 bpm
+    MAX_INTERVAL = 2500  # 24 bpm
+
+    def __init__(self, window=WINDOW):
+        """
+        :param int window: Number of beats the heart rate and RMSSD are computed over
+        :return:
+        """
+        self.__intervals = array('d', bytes(8 * window))
+        # Squared difference from the previous interval, not counted for the oldest interval
+        self.__differences = array('d', bytes(8 * window))
+        self.__start = 0
+        self.__count = 0
+        self.__total = 0.
+        self.__squares = 0.
+        self.__beats = 0
+        self.__rejected = 0
+
+    def add(self, interval):
+        """
+        :param float interval: Milliseconds since the previous beat
+        :return bool: False if the interval was rejected as an artifact
+        """
+        if not self.MIN_INTERVAL <= interval <= self.MAX_INTERVAL:
+            self.__rejected += 1
+            return False
+
+        capacity = len(self.__intervals)
+        if self.__count == capacity:
+            self.__total -= self.__intervals[self.__start]
+            self.__start = (self.__start + 1) % capacity
+            self.__squares -= self.__differences[self.__start]
+            self.__count -= 1
+
+        index = (self.__start + self.__count) % capacity
+        if self.__count:
+            previous = self.__intervals[(index - 1) % capacity]
+            difference = (interval - previous) ** 2
+            self.__differences[index] = difference
+            self.__squares += difference
+        else:
+            self.__differences[index] = 0.
+
+        self.__intervals[index] = interval
+        self.__total += interval
+        self.__count += 1
+        self.__beats += 1
+        return True
+
+    def extend(self, intervals):
+        """
+        :param [float] intervals:
+        :return:
+        """
+        for interval in intervals:
+            self.add(interval)
+
+    def get_intervals(self):
+        """
+        :return [float]: Intervals in the window, oldest first
+        """
+        capacity = len(self.__intervals)
+        return [self.__intervals[(self.__start + i) % capacity] for i in range(self.__count)]
+
+    def get_heart_rate(self):
+        """
+        :return float: Beats per minute over the window
+        """
+        if not self.__count or self.__total <= 0:
+            return None
+        return 60000. * self.__count / self.__total
+
+    def get_rmssd(self):
+        """
+        :return float: Root mean square of successive differences over the window, milliseconds
+        """
+        if self.__count < 2:
+            return None
+        return math.sqrt(max(0., self.__squares) / (self.__count - 1))
+
+    def get_beats(self):
+        """
+        :return int: Number of intervals added since the series was created
+        """
+        return self.__beats
+
+    def get_rejected(self):
+        """
+        :return int: Number of intervals rejected as artifacts
+        """
+        return self.__rejected
+
+
+class HeartRateChannel(object):
+    """
+    HeartRateChannel
+    Can be used as a PerformanceMonitor listener, it only reads the heartbeat data that the
+    polling already requests e.g. get_force_plot(heartbeat=True), so it sends no frames itself
+    """
+
+    def __init__(self, window=HeartRateSeries.WINDOW):
+        """
+        :param int window: Number of beats the heart rate and RMSSD are computed over
+        :return:
+        """
+        self.__window = window
+        self.__series = {}
+        self.__heart_rates = {}
+        self.__listeners = []
+        self.__lock = Lock()
+
+    def add_listener(self, listener):
+        """
+        :param callable listener: Called with the serial number and HeartRateSeries when beats
+                                  are added
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def update(self, serial_number, response, timestamp=None):
+        """
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp: Unused, accepted so the channel can be a listener
+        :return:
+        """
+        heart_rate = response.get_heartrate()
+        if heart_rate:
+            self.__heart_rates[serial_number] = heart_rate
+
+        intervals = response.get_heartbeat_data()
+        if not intervals:
+            return
+
+        with self.__lock:
+            series = self.__series.get(serial_number)
+            if series is None:
+                series = HeartRateSeries(self.__window)
+                self.__series[serial_number] = series
+            series.extend(intervals)
+
+        for listener in self.__listeners:
+            listener(serial_number, series)
+
+    def get_series(self, serial_number):
+        """
+        :param string serial_number:
+        :return HeartRateSeries: None if no heartbeat data has been received
+        """
+        return self.__series.get(serial_number)
+
+    def get_heart_rate(self, serial_number):
+        """
+        :param string serial_number:
+        :return float: Rolling heart rate from the RR intervals, or the last heart rate the
+                       Performance Monitor displayed if there are none
+        """
+        series = self.__series.get(serial_number)
+        if series is not None and series.get_heart_rate() is not None:
+            return series.get_heart_rate()
+        return self.__heart_rates.get(serial_number)
+
+    def get_rmssd(self, serial_number):
+        """
+        :param string serial_number:
+        :return float: Milliseconds
+        """
+        series = self.__series.get(serial_number)
+        return None if series is None else series.get_rmssd()
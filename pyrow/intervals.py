@@ -0,0 +1,298 @@
+"""
+PyRow.Intervals
+
+Tracks the work and rest intervals of interval workouts from the workout state the Performance
+Monitor reports, keeping running aggregates of the interval in progress.
+
+Nothing changes on the erg's screen during rest apart from the rest countdown, so ergs that are
+resting are polled at a reduced rate until the last few seconds of rest.
+"""
+
+import time
+from collections import namedtuple
+from threading import Lock
+
+from pyrow.csafe.const import Command
+
+WORKOUT_STATE_WAIT_TO_BEGIN = 0
+WORKOUT_STATE_ROW = 1
+WORKOUT_STATE_COUNTDOWN_PAUSE = 2
+WORKOUT_STATE_INTERVAL_REST = 3
+WORKOUT_STATE_INTERVAL_WORK_TIME = 4
+WORKOUT_STATE_INTERVAL_WORK_DISTANCE = 5
+WORKOUT_STATE_REST_END_TO_WORK_TIME = 6
+WORKOUT_STATE_REST_END_TO_WORK_DISTANCE = 7
+WORKOUT_STATE_WORK_TIME_TO_REST = 8
+WORKOUT_STATE_WORK_DISTANCE_TO_REST = 9
+WORKOUT_STATE_END = 10
+WORKOUT_STATE_TERMINATE = 11
+WORKOUT_STATE_LOGGED = 12
+WORKOUT_STATE_REARM = 13
+
+WORK_STATES = frozenset([
+    WORKOUT_STATE_ROW,
+    WORKOUT_STATE_INTERVAL_WORK_TIME,
+    WORKOUT_STATE_INTERVAL_WORK_DISTANCE,
+    WORKOUT_STATE_REST_END_TO_WORK_TIME,
+    WORKOUT_STATE_REST_END_TO_WORK_DISTANCE,
+])
+REST_STATES = frozenset([
+    WORKOUT_STATE_INTERVAL_REST,
+    WORKOUT_STATE_WORK_TIME_TO_REST,
+    WORKOUT_STATE_WORK_DISTANCE_TO_REST,
+])
+END_STATES = frozenset([
+    WORKOUT_STATE_END,
+    WORKOUT_STATE_TERMINATE,
+    WORKOUT_STATE_LOGGED,
+])
+
+# PM specific commands are kept together so they share one wrapper
+POLL_COMMANDS = [
+    Command.CSAFE_PM_GET_WORKTIME,
+    Command.CSAFE_PM_GET_WORKDISTANCE,
+    Command.CSAFE_PM_GET_RESTTIME,
+    Command.CSAFE_PM_GET_WORKOUTSTATE,
+    Command.CSAFE_GETCADENCE_CMD,
+    Command.CSAFE_GETPOWER_CMD,
+]
+
+Interval = namedtuple('Interval', [
+    'serial_number',
+    'number',
+    'resting',
+    'start',
+    'end',
+    'distance',
+    'average_spm',
+    'average_power',
+    'max_power',
+    'samples',
+])
+
+
+class _Aggregate(object):
+    """
+    Running aggregates of the interval in progress
+    """
+
+    def __init__(self, number, resting, start):
+        self.number = number
+        self.resting = resting
+        self.start = start
+        self.end = start
+        self.min_distance = None
+        self.max_distance = None
+        self.spm_total = 0
+        self.spm_count = 0
+        self.power_total = 0
+        self.power_count = 0
+        self.max_power = None
+        self.samples = 0
+
+    def add(self, response, timestamp):
+        """
+        :param Response response:
+        :param float timestamp:
+        :return:
+        """
+        self.end = timestamp
+        self.samples += 1
+
+        # The distance counts up or down depending on the workout, so keep its range
+        distance = response.get_distance()
+        if distance is not None:
+            if self.min_distance is None:
+                self.min_distance = self.max_distance = distance
+            else:
+                self.min_distance = min(self.min_distance, distance)
+                self.max_distance = max(self.max_distance, distance)
+
+        spm = response.get_spm()
+        if spm is not None:
+            self.spm_total += spm
+            self.spm_count += 1
+
+        power = response.get_power()
+        if power is not None:
+            self.power_total += power
+            self.power_count += 1
+            self.max_power = power if self.max_power is None else max(self.max_power, power)
+
+    def to_interval(self, serial_number):
+        """
+        :param string serial_number:
+        :return Interval:
+        """
+        return Interval(
+            serial_number,
+            self.number,
+            self.resting,
+            self.start,
+            self.end,
+            None if self.min_distance is None else self.max_distance - self.min_distance,
+            self.spm_total / float(self.spm_count) if self.spm_count else None,
+            self.power_total / float(self.power_count) if self.power_count else None,
+            self.max_power,
+            self.samples
+        )
+
+
+class _ErgIntervals(object):
+    """
+    Intervals of one erg
+    """
+
+    def __init__(self):
+        self.current = None
+        self.number = 0
+        self.rest_time = None
+        self.intervals = []
+        self.next_poll = 0.
+
+
+class IntervalTracker(object):
+    """
+    IntervalTracker
+    Can be used as a PerformanceMonitor listener, responses without the workout state, e.g. of
+    get_status, are ignored
+    """
+
+    WORK_DELAY = .1
+    REST_DELAY = 1.
+    WAKE_BEFORE = 5.
+
+    def __init__(self, work_delay=WORK_DELAY, rest_delay=REST_DELAY, wake_before=WAKE_BEFORE):
+        """
+        :param float work_delay: Seconds between polls of an erg while it is working
+        :param float rest_delay: Seconds between polls of an erg while it is resting
+        :param float wake_before: Seconds before the end of rest to go back to work_delay
+        :return:
+        """
+        self.__work_delay = work_delay
+        self.__rest_delay = rest_delay
+        self.__wake_before = wake_before
+        self.__ergs = {}
+        self.__listeners = []
+        self.__lock = Lock()
+
+    def add_listener(self, listener):
+        """
+        :param callable listener: Called with each Interval when it ends
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def poll(self, performance_monitors, now=None):
+        """
+        Polls the ergs that are due and schedules their next poll
+        :param [PerformanceMonitor] performance_monitors:
+        :param float now:
+        :return float: Seconds until the next erg is due
+        """
+        now = time.time() if now is None else now
+        next_poll = None
+        for performance_monitor in performance_monitors:
+            serial_number = performance_monitor.get_serial_number()
+            erg = self.__get_erg(serial_number)
+            if erg.next_poll <= now:
+                self.update(serial_number, performance_monitor.send_commands(POLL_COMMANDS), now)
+                erg.next_poll = now + self.get_poll_delay(serial_number)
+            if next_poll is None or erg.next_poll < next_poll:
+                next_poll = erg.next_poll
+        return 0. if next_poll is None else max(0., next_poll - now)
+
+    def update(self, serial_number, response, timestamp=None):
+        """
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return Interval: The interval that ended, None if the erg is still in the same interval
+        """
+        state = response.get_workout_state()
+        if state is None:
+            return None
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self.__lock:
+            erg = self.__get_erg(serial_number)
+            rest_time = response.get_rest_time()
+            if rest_time is not None:
+                erg.rest_time = rest_time
+
+            ended = None
+            if state in WORK_STATES or state in REST_STATES:
+                resting = state in REST_STATES
+                if erg.current is not None and erg.current.resting != resting:
+                    ended = erg.current
+                    erg.current = None
+                if erg.current is None:
+                    if not resting:
+                        erg.number += 1
+                    erg.current = _Aggregate(erg.number, resting, timestamp)
+            elif state in END_STATES or state == WORKOUT_STATE_WAIT_TO_BEGIN:
+                ended = erg.current
+                erg.current = None
+
+            if erg.current is not None:
+                erg.current.add(response, timestamp)
+            if ended is None:
+                return None
+
+            interval = ended.to_interval(serial_number)
+            erg.intervals.append(interval)
+
+        for listener in self.__listeners:
+            listener(interval)
+        return interval
+
+    def is_resting(self, serial_number):
+        """
+        :param string serial_number:
+        :return bool:
+        """
+        erg = self.__ergs.get(serial_number)
+        return erg is not None and erg.current is not None and erg.current.resting
+
+    def get_poll_delay(self, serial_number):
+        """
+        :param string serial_number:
+        :return float: Seconds to wait before polling the erg again
+        """
+        if not self.is_resting(serial_number):
+            return self.__work_delay
+
+        rest_time = self.__ergs[serial_number].rest_time
+        if rest_time is None:
+            return self.__rest_delay
+        return max(self.__work_delay, min(self.__rest_delay, rest_time - self.__wake_before))
+
+    def get_current(self, serial_number):
+        """
+        :param string serial_number:
+        :return Interval: The interval in progress, None between workouts
+        """
+        with self.__lock:
+            erg = self.__ergs.get(serial_number)
+            if erg is None or erg.current is None:
+                return None
+            return erg.current.to_interval(serial_number)
+
+    def get_intervals(self, serial_number):
+        """
+        :param string serial_number:
+        :return [Interval]: Intervals that have ended
+        """
+        with self.__lock:
+            erg = self.__ergs.get(serial_number)
+            return [] if erg is None else list(erg.intervals)
+
+    def __get_erg(self, serial_number):
+        """
+        :param string serial_number:
+        :return _ErgIntervals:
+        """
+        erg = self.__ergs.get(serial_number)
+        if erg is None:
+            erg = self.__ergs.setdefault(serial_number, _ErgIntervals())
+        return erg
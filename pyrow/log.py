@@ -0,0 +1,84 @@
+"""
+PyRow.Log
+
+Loggers of PyRow, so each layer can be turned up on its own instead of DEBUG logging everything:
+    pyrow.usb     transports and links
+    pyrow.csafe   encoding and decoding frames
+    pyrow.pm      Performance Monitor state and polling
+
+Warnings that can repeat on every frame go through a RateLimitedLog, which logs the first
+occurrence and then at most one per interval with the number that were suppressed.
+"""
+
+import logging
+import time
+from threading import Lock
+
+ROOT = logging.getLogger('pyrow')
+ROOT.addHandler(logging.NullHandler())
+
+USB = logging.getLogger('pyrow.usb')
+CSAFE = logging.getLogger('pyrow.csafe')
+PM = logging.getLogger('pyrow.pm')
+
+
+class RateLimitedLog(object):
+    """
+    RateLimitedLog
+    """
+
+    INTERVAL = 60.
+
+    def __init__(self, logger, interval=INTERVAL):
+        """
+        :param Logger logger:
+        :param float interval: Seconds between two messages with the same key
+        :return:
+        """
+        self.__logger = logger
+        self.__interval = interval
+        self.__messages = {}
+        self.__lock = Lock()
+
+    def log(self, level, key, message, *args):
+        """
+        :param int level:
+        :param hashable key: Messages with the same key are limited together
+        :param string message:
+        :param args:
+        :return bool: True if the message was logged
+        """
+        if not self.__logger.isEnabledFor(level):
+            return False
+
+        now = time.time()
+        with self.__lock:
+            last, suppressed = self.__messages.get(key, (None, 0))
+            if last is not None and now - last < self.__interval:
+                self.__messages[key] = (last, suppressed + 1)
+                return False
+            self.__messages[key] = (now, 0)
+
+        if suppressed:
+            message += ' (%d similar messages suppressed)'
+            args += (suppressed,)
+        self.__logger.log(level, message, *args)
+        return True
+
+    def warning(self, key, message, *args):
+        """
+        :param hashable key:
+        :param string message:
+        :param args:
+        :return bool: True if the message was logged
+        """
+        return self.log(logging.WARNING, key, message, *args)
+
+    def error(self, key, message, *args):
+        """
+        :param hashable key:
+        :param string message:
+        :param args:
+        :return bool: True if the message was logged
+        """
+        return self.log(logging.ERROR, key, message, *args)
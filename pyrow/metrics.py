@@ -0,0 +1,308 @@
+"""
+PyRow.Metrics
+
+Derived metrics that are updated incrementally from each Response, each update costs O(1)
+regardless of how long the workout has been running.
+"""
+
+import time
+from collections import deque, namedtuple
+from threading import Lock
+
+Snapshot = namedtuple('Snapshot', [
+    'serial_number',
+    'timestamp',
+    'time',
+    'distance',
+    'spm',
+    'power',
+    'pace_500',
+    'average_spm',
+    'average_power',
+    'average_pace_500',
+    'ewma_spm',
+    'ewma_power',
+    'projected_finish',
+    'samples',
+])
+
+
+def watts_to_pace(watts):
+    """
+    :param float watts:
+    :return float: Pace in seconds per 500m
+    """
+    if not watts:
+        return None
+    return 500. * (2.8 / watts) ** (1 / 3.)
+
+
+def pace_to_watts(pace):
+    """
+    :param float pace: Pace in seconds per 500m
+    :return int:
+    """
+    return int(round(2.8 / ((pace / 500.) ** 3)))
+
+
+def calorie_pace_to_watts(cal_pace):
+    """
+    :param float cal_pace: Calories per hour
+    :return int:
+    """
+    return int(round((cal_pace - 300.) / (4.0 * 0.8604)))
+
+
+class WindowedAverage(object):
+    """
+    WindowedAverage
+    Average of the values added in the last window seconds, kept as a running sum
+    """
+
+    def __init__(self, window):
+        """
+        :param float window: Seconds
+        :return:
+        """
+        self.__window = window
+        self.__values = deque()
+        self.__total = 0.
+
+    def add(self, timestamp, value):
+        """
+        :param float timestamp:
+        :param float value:
+        :return:
+        """
+        self.__values.append((timestamp, value))
+        self.__total += value
+
+        horizon = timestamp - self.__window
+        while self.__values[0][0] < horizon:
+            self.__total -= self.__values.popleft()[1]
+
+    def get(self):
+        """
+        :return float:
+        """
+        if self.__values:
+            return self.__total / len(self.__values)
+        return None
+
+
+class ExponentialAverage(object):
+    """
+    ExponentialAverage
+    """
+
+    def __init__(self, alpha):
+        """
+        :param float alpha: Weight of the newest value
+        :return:
+        """
+        self.__alpha = alpha
+        self.__value = None
+
+    def add(self, value):
+        """
+        :param float value:
+        :return:
+        """
+        if self.__value is None:
+            self.__value = float(value)
+        else:
+            self.__value += self.__alpha * (value - self.__value)
+
+    def get(self):
+        """
+        :return float:
+        """
+        return self.__value
+
+
+class ErgMetrics(object):
+    """
+    ErgMetrics
+    Metrics of a single erg
+    """
+
+    def __init__(self, serial_number, window, alpha):
+        """
+        :param string serial_number:
+        :param float window:
+        :param float alpha:
+        :return:
+        """
+        self.__serial_number = serial_number
+        self.__distance_piece = False
+        self.__spm = WindowedAverage(window)
+        self.__power = WindowedAverage(window)
+        self.__pace = WindowedAverage(window)
+        self.__ewma_spm = ExponentialAverage(alpha)
+        self.__ewma_power = ExponentialAverage(alpha)
+        self.__snapshot = Snapshot(serial_number, None, None, None, None, None, None, None,
+                                   None, None, None, None, None, 0)
+
+    def set_distance_piece(self, distance_piece):
+        """
+        :param bool distance_piece: True if the Performance Monitor counts the distance down
+        :return:
+        """
+        self.__distance_piece = distance_piece
+
+    def update(self, response, timestamp):
+        """
+        :param Response response:
+        :param float timestamp:
+        :return Snapshot:
+        """
+        previous = self.__snapshot
+
+        spm = response.get_spm()
+        if spm is not None:
+            self.__spm.add(timestamp, spm)
+            self.__ewma_spm.add(spm)
+        else:
+            spm = previous.spm
+
+        power = response.get_power()
+        if power is not None:
+            self.__power.add(timestamp, power)
+            self.__ewma_power.add(power)
+        else:
+            power = previous.power
+
+        pace_500 = response.get_pace_500()
+        if pace_500:
+            self.__pace.add(timestamp, pace_500)
+        elif power:
+            pace_500 = watts_to_pace(power)
+            self.__pace.add(timestamp, pace_500)
+        else:
+            pace_500 = previous.pace_500
+
+        work_time = response.get_time()
+        if work_time is None:
+            work_time = previous.time
+        distance = response.get_distance()
+        if distance is None:
+            distance = previous.distance
+
+        average_pace = self.__pace.get()
+        projected_finish = None
+        if self.__distance_piece and average_pace and work_time is not None and distance:
+            projected_finish = work_time + distance * average_pace / 500.
+
+        self.__snapshot = Snapshot(
+            self.__serial_number,
+            timestamp,
+            work_time,
+            distance,
+            spm,
+            power,
+            pace_500,
+            self.__spm.get(),
+            self.__power.get(),
+            average_pace,
+            self.__ewma_spm.get(),
+            self.__ewma_power.get(),
+            projected_finish,
+            previous.samples + 1
+        )
+        return self.__snapshot
+
+    def get_snapshot(self):
+        """
+        :return Snapshot:
+        """
+        return self.__snapshot
+
+
+class MetricsEngine(object):
+    """
+    MetricsEngine
+    Keeps the derived metrics of every erg, can be used as a PerformanceMonitor listener
+    """
+
+    WINDOW = 30.
+    ALPHA = 0.2
+
+    def __init__(self, window=WINDOW, alpha=ALPHA):
+        """
+        :param float window: Seconds covered by the rolling averages
+        :param float alpha: Weight of the newest sample in the exponential averages
+        :return:
+        """
+        self.__window = window
+        self.__alpha = alpha
+        self.__ergs = {}
+        self.__subscribers = {}
+        self.__lock = Lock()
+
+    def set_distance_piece(self, serial_number, distance_piece=True):
+        """
+        Enables the projected finish time, for workouts set with a distance goal
+        :param string serial_number:
+        :param bool distance_piece:
+        :return:
+        """
+        with self.__lock:
+            self.__get_erg(serial_number).set_distance_piece(distance_piece)
+
+    def subscribe(self, serial_number, callback):
+        """
+        :param string serial_number:
+        :param callable callback: Called with every new Snapshot of the erg
+        :return:
+        """
+        with self.__lock:
+            self.__subscribers.setdefault(serial_number, []).append(callback)
+
+    def unsubscribe(self, serial_number, callback):
+        """
+        :param string serial_number:
+        :param callable callback:
+        :return:
+        """
+        with self.__lock:
+            self.__subscribers[serial_number].remove(callback)
+
+    def update(self, serial_number, response, timestamp=None):
+        """
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return Snapshot:
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self.__lock:
+            snapshot = self.__get_erg(serial_number).update(response, timestamp)
+            subscribers = list(self.__subscribers.get(serial_number, ()))
+
+        for callback in subscribers:
+            callback(snapshot)
+
+        return snapshot
+
+    def get_snapshot(self, serial_number):
+        """
+        :param string serial_number:
+        :return Snapshot: None if the erg has not been updated
+        """
+        erg = self.__ergs.get(serial_number)
+        if erg is None:
+            return None
+        return erg.get_snapshot()
+
+    def __get_erg(self, serial_number):
+        """
+        :param string serial_number:
+        :return ErgMetrics:
+        """
+        erg = self.__ergs.get(serial_number)
+        if erg is None:
+            erg = ErgMetrics(serial_number, self.__window, self.__alpha)
+            self.__ergs[serial_number] = erg
+        return erg
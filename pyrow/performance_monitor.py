@@ -4,16 +4,20 @@ PyRow.Concept2.PerformanceMonitor
 
 import datetime
 import logging
-import sys
 import time
 from threading import Lock
 
-import usb.util
-from usb import USBError
-
+from pyrow import log
 from pyrow.csafe.cmd import CsafeCmd
-from pyrow.exceptions import BadStateException, RetryLimitException
+from pyrow.csafe import sizing
+from pyrow.csafe.const import Command, Results, is_query, is_stream, iter_commands
+from pyrow.exceptions import (BadStateException, FrameException, RetryLimitException,
+                              StopFlagException)
 from pyrow.response import Response
+from pyrow.transport import Transport, UsbTransport, find_usb_devices
+
+LOGGER = log.PM
+WARNINGS = log.RateLimitedLog(LOGGER)
 
 
 class PerformanceMonitor(object):
@@ -77,14 +81,16 @@ class PerformanceMonitor(object):
         0x0003: 'PM5'
     }
 
-    MIN_FRAME_GAP = .050
-    TIMEOUT = 2000
+    # Seconds between two frames, None to use the MIN_FRAME_GAP of the transport
+    MIN_FRAME_GAP = None
+    STATE_WAIT = .050  # Seconds between two status checks while the erg changes state
+    CACHE_TTL = .050
 
-    STROKE_WAIT_MIN_SPEED = 0
-    STROKE_WAIT_FOR_ACCELERATION = 1
-    STROKE_DRIVE = 2
-    STROKE_DWELLING = 3
-    STROKE_RECOVERY = 4
+    STROKE_WAIT_MIN_SPEED = Response.STROKE_WAIT_MIN_SPEED
+    STROKE_WAIT_FOR_ACCELERATION = Response.STROKE_WAIT_FOR_ACCELERATION
+    STROKE_DRIVE = Response.STROKE_DRIVE
+    STROKE_DWELLING = Response.STROKE_DWELLING
+    STROKE_RECOVERY = Response.STROKE_RECOVERY
 
     STATE_ERROR = 0
     STATE_READY = 1
@@ -97,56 +103,64 @@ class PerformanceMonitor(object):
     STATE_MANUAL = 8
     STATE_OFFLINE = 9
 
-    SET_TIME = 'CSAFE_SETTIME_CMD'
-    SET_DATE = 'CSAFE_SETDATE_CMD'
-
-    GET_STATUS = 'CSAFE_GETSTATUS_CMD'
-    GET_USER_ID = 'CSAFE_GETID_CMD'
-    GET_WORKOUT_TYPE = 'CSAFE_PM_GET_WORKOUTTYPE'
-    GET_WORKOUT_STATE = 'CSAFE_PM_GET_WORKOUTSTATE'
-    GET_INTERVAL_TYPE = 'CSAFE_PM_GET_INTERVALTYPE'
-    GET_INTERVAL_COUNT = 'CSAFE_PM_GET_WORKOUTINTERVALCOUNT'
-    GET_TIME = 'CSAFE_PM_GET_WORKTIME'
-    GET_DISTANCE = 'CSAFE_PM_GET_WORKDISTANCE'
-    GET_CADENCE = 'CSAFE_GETCADENCE_CMD'
-    GET_POWER = 'CSAFE_GETPOWER_CMD'
-    GET_FORCE_PLOT_DATA = 'CSAFE_PM_GET_FORCEPLOTDATA'
-    GET_STROKE_STATE = 'CSAFE_PM_GET_STROKESTATE'
-    GET_STROKE_STATS = 'CSAFE_PM_GET_STROKESTATS'
-    GET_PACE = 'CSAFE_GETPACE_CMD'
-    GET_CALORIES = 'CSAFE_GETCALORIES_CMD'
-    GET_HEART_RATE = 'CSAFE_GETHRCUR_CMD'
-    GET_FW_VERSION = 'CSAFE_GETVERSION_CMD'
-    GET_SERIAL = 'CSAFE_GETSERIAL_CMD'
-    GET_CAPABILITIES = 'CSAFE_GETCAPS_CMD'
-
-    GO_FINISHED = 'CSAFE_GOFINISHED_CMD'
-    GO_IDLE = 'CSAFE_GOIDLE_CMD'
-    GO_READY = 'CSAFE_GOREADY_CMD'
-    GO_IN_USE = 'CSAFE_GOINUSE_CMD'
-    RESET = 'CSAFE_RESET_CMD'
-
-    SET_WORKOUT = 'CSAFE_SETTWORK_CMD'
-    SET_HORIZONTAL = 'CSAFE_SETHORIZONTAL_CMD'
-    SET_SPLIT_DURATION = 'CSAFE_PM_SET_SPLITDURATION'
-    SET_POWER = 'CSAFE_SETPOWER_CMD'
-    SET_PROGRAM = 'CSAFE_SETPROGRAM_CMD'
+    SET_TIME = Command.CSAFE_SETTIME_CMD
+    SET_DATE = Command.CSAFE_SETDATE_CMD
+
+    GET_STATUS = Command.CSAFE_GETSTATUS_CMD
+    GET_USER_ID = Command.CSAFE_GETID_CMD
+    GET_WORKOUT_TYPE = Command.CSAFE_PM_GET_WORKOUTTYPE
+    GET_WORKOUT_STATE = Command.CSAFE_PM_GET_WORKOUTSTATE
+    GET_INTERVAL_TYPE = Command.CSAFE_PM_GET_INTERVALTYPE
+    GET_INTERVAL_COUNT = Command.CSAFE_PM_GET_WORKOUTINTERVALCOUNT
+    GET_TIME = Command.CSAFE_PM_GET_WORKTIME
+    GET_DISTANCE = Command.CSAFE_PM_GET_WORKDISTANCE
+    GET_CADENCE = Command.CSAFE_GETCADENCE_CMD
+    GET_POWER = Command.CSAFE_GETPOWER_CMD
+    GET_FORCE_PLOT_DATA = Command.CSAFE_PM_GET_FORCEPLOTDATA
+    GET_STROKE_STATE = Command.CSAFE_PM_GET_STROKESTATE
+    GET_STROKE_STATS = Command.CSAFE_PM_GET_STROKESTATS
+    GET_PACE = Command.CSAFE_GETPACE_CMD
+    GET_CALORIES = Command.CSAFE_GETCALORIES_CMD
+    GET_HEART_RATE = Command.CSAFE_GETHRCUR_CMD
+    GET_DRAG_FACTOR = Command.CSAFE_PM_GET_DRAGFACTOR
+    GET_REST_TIME = Command.CSAFE_PM_GET_RESTTIME
+    GET_ERROR_VALUE = Command.CSAFE_PM_GET_ERRORVALUE
+    GET_HEARTBEAT_DATA = Command.CSAFE_PM_GET_HEARTBEATDATA
+    GET_FW_VERSION = Command.CSAFE_GETVERSION_CMD
+    GET_SERIAL = Command.CSAFE_GETSERIAL_CMD
+    GET_CAPABILITIES = Command.CSAFE_GETCAPS_CMD
+
+    GO_FINISHED = Command.CSAFE_GOFINISHED_CMD
+    GO_IDLE = Command.CSAFE_GOIDLE_CMD
+    GO_READY = Command.CSAFE_GOREADY_CMD
+    GO_IN_USE = Command.CSAFE_GOINUSE_CMD
+    RESET = Command.CSAFE_RESET_CMD
+
+    SET_WORKOUT = Command.CSAFE_SETTWORK_CMD
+    SET_HORIZONTAL = Command.CSAFE_SETHORIZONTAL_CMD
+    SET_SPLIT_DURATION = Command.CSAFE_PM_SET_SPLITDURATION
+    SET_POWER = Command.CSAFE_SETPOWER_CMD
+    SET_PROGRAM = Command.CSAFE_SETPROGRAM_CMD
 
     GET_ERG_INFORMATION = [GET_FW_VERSION, GET_SERIAL, GET_CAPABILITIES, 0x00]
     GET_WORKOUT = [GET_USER_ID, GET_WORKOUT_TYPE, GET_WORKOUT_STATE,
                    GET_INTERVAL_TYPE, GET_INTERVAL_COUNT]
     GET_FORCE_PLOT = [GET_FORCE_PLOT_DATA, 32, GET_STROKE_STATE]
-    GET_SCREEN = [GET_TIME, GET_DISTANCE, GET_CADENCE, GET_POWER, GET_CALORIES, GET_HEART_RATE]
+    # PM specific commands are kept together so they share one wrapper
+    GET_SCREEN = [GET_TIME, GET_DISTANCE, GET_DRAG_FACTOR, GET_REST_TIME, GET_ERROR_VALUE,
+                  GET_CADENCE, GET_POWER, GET_CALORIES, GET_HEART_RATE]
     GET_EXTRA_METRICS = [GET_STROKE_STATS, 32, GET_STROKE_STATE]
+    GET_HEARTBEAT = [GET_HEARTBEAT_DATA, 32]
 
     RESET_RETRY_LIMIT = 10
+    FRAME_RETRY_LIMIT = 3
     RESET_WAIT_MAX = 0.5
 
     KNOWN_PMS = {}
 
     @staticmethod
     def find():
-        ergs = usb.core.find(find_all=True, idVendor=PerformanceMonitor.VENDOR_ID)
+        ergs = find_usb_devices(PerformanceMonitor.VENDOR_ID)
         pms = []
         for erg in ergs:
             if erg.serial_number not in PerformanceMonitor.KNOWN_PMS:
@@ -156,33 +170,23 @@ class PerformanceMonitor(object):
 
     def __init__(self, device):
         """
-        :param Device device:
+        :param Device|Transport device: pyusb device or Transport
         :return:
         """
-        self.__device = device
-        if sys.platform != 'win32':
-            if device.is_kernel_driver_active(0):
-                device.detach_kernel_driver(0)
-            else:
-                logging.debug('USB Kernel driver not on %s', sys.platform)
-
-        usb.util.claim_interface(device, 0)
-
-        try:
-            device.set_configuration()
-        except USBError:
-            pass
+        if isinstance(device, Transport):
+            self.__transport = device
+        else:
+            self.__transport = UsbTransport(device)
 
-        interface = device[0][(0, 0)]
-        self.__in_address = interface[0].bEndpointAddress
-        self.__out_address = interface[1].bEndpointAddress
-
-        self.__manufacturer = usb.util.get_string(self.__device, self.__device.iManufacturer)
-        self.__product = usb.util.get_string(self.__device, self.__device.iProduct)
-        self.__serial_number = usb.util.get_string(self.__device, self.__device.iSerialNumber)
+        self.__manufacturer = self.__transport.get_manufacturer()
+        self.__product = self.__transport.get_product()
+        self.__serial_number = self.__transport.get_serial_number()
 
         self.__last_message = time.time()
         self.__lock = Lock()
+        self.__listeners = []
+        self.__cache = None
+        self.__trace = None
 
         self.reset()
 
@@ -220,61 +224,236 @@ class PerformanceMonitor(object):
         """
         :return string:
         """
-        return self.PM_VERSION[self.__device.idProduct]
+        return self.PM_VERSION[self.__transport.get_product_id()]
+
+    def get_frame_gap(self):
+        """
+        :return float: Seconds kept between two frames, MIN_FRAME_GAP if set, otherwise the
+                       MIN_FRAME_GAP of the transport
+        """
+        if self.MIN_FRAME_GAP is not None:
+            return self.MIN_FRAME_GAP
+        return self.__transport.MIN_FRAME_GAP
+
+    def add_listener(self, listener):
+        """
+        Registers a callable that is given the serial number and Response of every
+        command sent to the Performance Monitor, e.g. TelemetryPublisher.publish
+        :param callable listener:
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        :param callable listener:
+        :return:
+        """
+        self.__listeners.remove(listener)
+
+    def enable_cache(self, ttl=CACHE_TTL):
+        """
+        Answers repeated queries within ttl seconds from a cache, any other command clears it
+        :param float ttl:
+        :return ResponseCache:
+        """
+        from pyrow.cache import ResponseCache
+        self.__cache = ResponseCache(ttl)
+        return self.__cache
+
+    def disable_cache(self):
+        """
+        :return:
+        """
+        self.__cache = None
+
+    def get_cache(self):
+        """
+        :return ResponseCache: None if the cache is disabled
+        """
+        return self.__cache
+
+    def enable_trace(self, capacity=None, directory=None):
+        """
+        Keeps the last frames in a FrameTrace, dumped to directory when a frame fails
+        :param int capacity: Number of frames kept, FrameTrace.CAPACITY if None
+        :param string directory:
+        :return FrameTrace:
+        """
+        # Imported here so polling without a trace does not pay for loading it
+        from pyrow.trace import FrameTrace
+        self.__trace = FrameTrace(capacity or FrameTrace.CAPACITY, directory)
+        return self.__trace
+
+    def disable_trace(self):
+        """
+        :return:
+        """
+        self.__trace = None
+
+    def get_trace(self):
+        """
+        :return FrameTrace: None if the trace is disabled
+        """
+        return self.__trace
 
     def send_commands(self, commands):
         """
         :param [] commands:
         :return Response:
         """
-        self.__lock.acquire()
-        now = time.time()
-        delta = now - self.__last_message
-        if delta < self.MIN_FRAME_GAP:
-            time.sleep(self.MIN_FRAME_GAP - delta)
+        cache = self.__cache
+        if cache is None:
+            return self.__send(commands)
+
+        if is_query(commands) and not is_stream(commands):
+            return cache.get(tuple(commands), self.__send, commands)
 
+        cache.invalidate()
         try:
-            c_safe = CsafeCmd.write(commands)
+            return self.__send(commands)
+        finally:
+            cache.invalidate()
 
-            length = self.__device.write(self.__out_address, c_safe, timeout=self.TIMEOUT)
-            self.__last_message = time.time()
+    def send_packed(self, commands):
+        """
+        Sends commands that may not fit one frame in as few frames as possible
+        :param [] commands:
+        :return Response: Responses of all the frames
+        """
+        from pyrow.csafe.packing import pack
+        frames = pack(commands)
+        if len(frames) == 1:
+            return self.send_commands(frames[0])
 
-            response = []
-            while not response:
-                transmission = self.__device.read(self.__in_address, length, timeout=20000)
-                response = CsafeCmd.read(transmission)
-        except Exception as ex:
-            del self.KNOWN_PMS[self.__serial_number]
-            usb.util.release_interface(self.__device, 0)
-            raise ex
+        results = Results()
+        for frame in frames:
+            results.update(self.send_commands(frame).get_raw())
+        return Response(results)
 
-        self.__lock.release()
+    def send_frame(self, frame):
+        """
+        Sends a frame that was encoded ahead of time, e.g. WorkoutPlan.get_frame
+        :param [int] frame:
+        :return Response:
+        """
+        cache = self.__cache
+        if cache is None:
+            return self.__transmit(list(frame))
 
-        return Response(response)
+        cache.invalidate()
+        try:
+            return self.__transmit(list(frame))
+        finally:
+            cache.invalidate()
 
-    def get_monitor(self, force_plot=False, extra_metrics=False):
+    def __send(self, commands):
+        """
+        :param [] commands:
+        :return Response:
+        """
+        return self.__transmit(CsafeCmd.write(commands), commands)
+
+    def __transmit(self, c_safe, commands=None):
+        """
+        :param [int] c_safe: Encoded report
+        :param [] commands: Commands of the report, to send them in a larger report if the
+                            response does not fit
+        :return Response:
+        """
+        gap = self.get_frame_gap()
+        with self.__lock:
+            retries = 0
+            while True:
+                delta = time.time() - self.__last_message
+                if delta < gap:
+                    time.sleep(gap - delta)
+
+                trace = self.__trace
+                try:
+                    length = self.__transport.write(c_safe)
+                    self.__last_message = time.time()
+                    if trace is not None:
+                        trace.record(trace.REQUEST, c_safe, self.__last_message)
+
+                    transmission = self.__transport.read(length)
+                    if trace is not None:
+                        trace.record(trace.RESPONSE, transmission)
+
+                    response = CsafeCmd.read(transmission, strict=True)
+                    break
+                except FrameException as ex:
+                    if isinstance(ex, StopFlagException) and commands is not None:
+                        # The response outgrew the report, ask again in a larger one
+                        sizing.MODEL.overflow(list(iter_commands(commands)), len(c_safe))
+                        larger = CsafeCmd.write(commands)
+                        if len(larger) > len(c_safe):
+                            WARNINGS.warning((self.__serial_number, type(ex)),
+                                             'Response from %s did not fit %d bytes: %s',
+                                             self.__serial_number, len(c_safe), ex)
+                            c_safe = larger
+                            continue
+
+                    # Ask again straight away rather than waiting for a frame that is not coming
+                    retries += 1
+                    WARNINGS.warning((self.__serial_number, type(ex)),
+                                     'Bad frame from %s: %s, retry %d/%d', self.__serial_number,
+                                     ex, retries, self.FRAME_RETRY_LIMIT)
+                    if retries > self.FRAME_RETRY_LIMIT:
+                        self.__dump_trace()
+                        raise
+                except Exception as ex:
+                    self.__dump_trace()
+                    self.__release()
+                    raise ex
+
+        response = Response(response)
+        for listener in self.__listeners:
+            listener(self.__serial_number, response)
+
+        return response
+
+    def get_monitor(self, force_plot=False, extra_metrics=False, heartbeat=False):
         """
         Returns values from the monitor that relate to the current workout,
-        optionally returns force plot data and stroke state
+        optionally returns force plot data and stroke state, stroke statistics
+        and heartbeat data. All of them do not fit one report, so they are sent in two frames
         :return Response:
         """
-        command = self.GET_SCREEN
+        command = list(self.GET_SCREEN)
 
         if force_plot:
             command.extend(self.GET_FORCE_PLOT)
 
         if extra_metrics:
-            command.extend(self.GET_EXTRA_METRICS)
+            # The force plot already asks for the stroke state
+            command.extend(self.GET_EXTRA_METRICS[:2] if force_plot else self.GET_EXTRA_METRICS)
 
+        if heartbeat:
+            command.extend(self.GET_HEARTBEAT)
+
+        # Every group at once is too long for one report, so it is split over two frames
+        if sizing.MODEL.get_response_size(list(iter_commands(command))) > sizing.MAX_REPORT:
+            return self.send_packed(command)
         return self.send_commands(command)
 
-    def get_force_plot(self):
+    def get_force_plot(self, heartbeat=False):
         """
-        Returns force plot data and stroke state
+        Returns force plot data and stroke state, optionally with the heartbeat data
+        in the same frame
         :return Response:
         """
+        if heartbeat:
+            return self.send_commands(self.GET_FORCE_PLOT + self.GET_HEARTBEAT)
         return self.send_commands(self.GET_FORCE_PLOT)
 
+    def get_heartbeat(self):
+        """
+        Returns the heartbeat data collected since the last call
+        :return Response:
+        """
+        return self.send_commands(self.GET_HEARTBEAT)
+
     def get_workout(self):
         """
         Returns overall workout data
@@ -302,8 +481,7 @@ class PerformanceMonitor(object):
         offline = response.get_status() == self.STATE_OFFLINE
 
         if manual or offline:
-            del self.KNOWN_PMS[self.__serial_number]
-            usb.util.release_interface(self.__device, 0)
+            self.__release()
             raise BadStateException(self, response.get_status_message())
 
         return response
@@ -314,15 +492,15 @@ class PerformanceMonitor(object):
         :return:
         """
         response = self.get_status()
-        logging.debug('Current Status: %s on %s', response.get_status_message(),
-                      self.__serial_number)
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Current Status: %s on %s', response.get_status_message(),
+                         self.__serial_number)
 
         manual = response.get_status() == self.STATE_MANUAL
         offline = response.get_status() == self.STATE_OFFLINE
 
         if manual or offline:
-            del self.KNOWN_PMS[self.__serial_number]
-            usb.util.release_interface(self.__device, 0)
+            self.__release()
             raise BadStateException(self, response.get_status_message())
 
         finished = response.get_status() == self.STATE_FINISHED
@@ -334,12 +512,14 @@ class PerformanceMonitor(object):
             while True:
                 status = self.get_status().get_status()
                 if status == self.STATE_FINISHED:
-                    logging.debug('Finished: %s', self.__serial_number)
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug('Finished: %s', self.__serial_number)
                     break
                 else:
-                    logging.debug('Waiting for Finish (currently: %d) %d/%d on %s', status,
-                                  retries, self.RESET_RETRY_LIMIT, self.__serial_number)
-                    time.sleep(self.MIN_FRAME_GAP)
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug('Waiting for Finish (currently: %s) %d/%d on %s', status,
+                                     retries, self.RESET_RETRY_LIMIT, self.__serial_number)
+                    time.sleep(self.STATE_WAIT)
                     retries += 1
                     if retries >= self.RESET_RETRY_LIMIT:
                         raise RetryLimitException(
@@ -350,12 +530,14 @@ class PerformanceMonitor(object):
         while True:
             status = self.get_status().get_status()
             if status == self.STATE_IDLE:
-                logging.debug('Idle: %s', self.__serial_number)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Idle: %s', self.__serial_number)
                 break
             else:
-                logging.debug('Waiting for Idle (currently: %d) %d/%d on %s', status,
-                              retries, self.RESET_RETRY_LIMIT, self.__serial_number)
-                time.sleep(self.MIN_FRAME_GAP)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Waiting for Idle (currently: %s) %d/%d on %s', status,
+                                 retries, self.RESET_RETRY_LIMIT, self.__serial_number)
+                time.sleep(self.STATE_WAIT)
                 retries += 1
                 if retries >= self.RESET_RETRY_LIMIT:
                     raise RetryLimitException(
@@ -366,12 +548,14 @@ class PerformanceMonitor(object):
         while True:
             status = self.get_status().get_status()
             if status == self.STATE_READY:
-                logging.debug('Ready: %s', self.__serial_number)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Ready: %s', self.__serial_number)
                 break
             else:
-                logging.debug('Waiting for Ready (currently: %d) %d/%d on %s', status,
-                              retries, self.RESET_RETRY_LIMIT, self.__serial_number)
-                time.sleep(self.MIN_FRAME_GAP)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Waiting for Ready (currently: %s) %d/%d on %s', status,
+                                 retries, self.RESET_RETRY_LIMIT, self.__serial_number)
+                time.sleep(self.STATE_WAIT)
                 retries += 1
                 if retries >= self.RESET_RETRY_LIMIT:
                     raise RetryLimitException(
@@ -384,132 +568,116 @@ class PerformanceMonitor(object):
                     split=None,
                     pace=None,
                     cal_pace=None,
-                    power_pace=None):
+                    power_pace=None,
+                    rest=None):
         """
         If machine is in the ready state, function will set the
         workout and display the start workout screen
         """
-
+        from pyrow.workout import WorkoutPlan
+        self.apply_workout(WorkoutPlan(
+            program=program,
+            workout_time=workout_time,
+            distance=distance,
+            split=split,
+            pace=pace,
+            cal_pace=cal_pace,
+            power_pace=power_pace,
+            rest=rest
+        ))
+
+    def apply_workout(self, plan):
+        """
+        Sets a workout that was validated and encoded ahead of time
+        :param WorkoutPlan plan:
+        :return:
+        """
         self.reset()
         time.sleep(self.RESET_WAIT_MAX)
-        command = []
-
-        # Set Workout Goal
-        program_num = 0
-        if program is not None:
-            self.__validate_value(program, 'Program', 0, 15)
-            program_num = program
-        elif workout_time is not None:
-            if len(workout_time) == 1:
-                # if only seconds in workout_time then pad minutes
-                workout_time.insert(0, 0)
-            if len(workout_time) == 2:
-                # if no hours in workout_time then pad hours
-                workout_time.insert(0, 0)
-            self.__validate_value(workout_time[0], 'Time Hours', 0, 9)
-            self.__validate_value(workout_time[1], 'Time Minutes', 0, 59)
-            self.__validate_value(workout_time[2], 'Time Seconds', 0, 59)
-
-            if workout_time[0] == 0 and workout_time[1] == 0 and workout_time[2] < 20:
-                # checks if workout is < 20 seconds
-                raise ValueError('Workout too short on {0}'.format(self.__serial_number))
-
-            command.extend([self.SET_WORKOUT, workout_time[0],
-                            workout_time[1], workout_time[2]])
-
-        elif distance is not None:
-            self.__validate_value(distance, 'Distance', 100, 50000)
-            command.extend([self.SET_HORIZONTAL, distance, 36])  # 36 = meters
-
-        # Set Split
-        if split is not None:
-            if workout_time is not None and program is None:
-                split_time = int(split * 100)
-                # total workout workout_time (1 sec)
-                time_raw = workout_time[0] * 3600 + workout_time[1] * 60 + workout_time[2]
-                # split workout_time that will occur 30 workout_times (.01 sec)
-                min_split = int(time_raw / 30 * 100 + 0.5)
-                self.__validate_value(
-                    split_time,
-                    'Split Time',
-                    max(2000, min_split),
-                    time_raw * 100
-                )
-                command.extend([self.SET_SPLIT_DURATION, 0, split_time])
-            elif distance is not None and program is None:
-                # split distance that will occur 30 workout_times (m)
-                min_split = int(distance / 30 + 0.5)
-                self.__validate_value(split, 'Split distance', max(100, min_split), distance)
-                command.extend([self.SET_SPLIT_DURATION, 128, split])
-            else:
-                raise ValueError(
-                    'Cannot set split for current goal on {0}'.format(self.__serial_number))
-
-        # Set Pace
-        if pace is not None:
-            power_pace = int(round(2.8 / ((pace / 500.) ** 3)))
-        elif cal_pace is not None:
-            power_pace = int(round((cal_pace - 300.) / (4.0 * 0.8604)))
-        if power_pace is not None:
-            command.extend([self.SET_POWER, power_pace, 88])  # 88 = watts
 
-        command.extend([self.SET_PROGRAM, program_num, 0, self.GO_IN_USE])
-
-        self.send_commands(command)
+        self.send_frame(plan.get_frame())
         time.sleep(self.RESET_WAIT_MAX)
 
-        if not self.__wait_for_workout(command, workout_time, distance):
-            logging.warning('Failed to set workout on %s', self.__serial_number)
-            self.set_workout(
-                program,
-                workout_time,
-                distance,
-                split,
-                pace,
-                cal_pace,
-                power_pace
-            )
+        if not self.__wait_for_workout(plan):
+            LOGGER.warning('Failed to set workout on %s', self.__serial_number)
+            self.apply_workout(plan)
 
-    @staticmethod
-    def __validate_value(value, label, minimum, maximum):
+    def __release(self):
         """
-        Checks that value is an integer and within the specified range
+        Releases the transport so the Performance Monitor can be found again
+        :return:
         """
-        if not isinstance(value, int):
-            raise TypeError(label)
-        if not minimum <= value <= maximum:
-            raise ValueError(label + ' outside of range')
-        return True
+        self.KNOWN_PMS.pop(self.__serial_number, None)
+        self.__transport.close()
 
-    def __wait_for_workout(self, command, workout_time, distance, max_attempts=25):
+    def __dump_trace(self):
         """
-        :param command:
-        :param workout_time:
-        :param distance:
+        Dumps the trace if it has a directory, without hiding the error being handled
         :return:
         """
+        trace = self.__trace
+        if trace is None or trace.get_directory() is None:
+            return
+        try:
+            path = trace.dump(name=self.__serial_number)
+            LOGGER.error('Frames leading to the error on %s dumped to %s',
+                         self.__serial_number, path)
+        except (IOError, OSError) as ex:
+            LOGGER.error('Could not dump the trace of %s: %s', self.__serial_number, ex)
+
+    def __wait_for_workout(self, plan, max_attempts=25):
+        """
+        :param WorkoutPlan plan:
+        :param int max_attempts:
+        :return bool:
+        """
         attempts = 0
         while attempts < max_attempts:
             in_use = self.get_status().get_status() == self.STATE_IN_USE
 
-            if self.SET_HORIZONTAL in command and in_use:
+            if in_use and plan.get_rest() is not None:
+                response = self.send_commands([self.GET_WORKOUT_TYPE, self.GET_TIME,
+                                               self.GET_DISTANCE])
+                if plan.get_distance() is not None:
+                    duration, expected = response.get_distance(), plan.get_distance()
+                else:
+                    duration, expected = response.get_time(), plan.get_seconds()
+                if (response.get_workout_type(), duration) == (plan.get_workout_type(), expected):
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug('Workout set on erg %s in %.1fs', self.__serial_number,
+                                     attempts * self.RESET_WAIT_MAX)
+                    return True
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Erg %s Workout type: %s, interval: %s, expected: %d, %d. '
+                                 'Try %d/%d', self.__serial_number, response.get_workout_type(),
+                                 duration, plan.get_workout_type(), expected, attempts,
+                                 max_attempts)
+
+            elif in_use and plan.get_distance() is not None:
                 erg_distance = self.send_commands([self.GET_DISTANCE]).get_distance()
-                if erg_distance == distance:
-                    logging.debug('Workout set on erg %s in %ds', self.__serial_number,
-                                  attempts * self.RESET_WAIT_MAX)
+                if erg_distance == plan.get_distance():
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug('Workout set on erg %s in %.1fs', self.__serial_number,
+                                     attempts * self.RESET_WAIT_MAX)
                     return True
-                logging.debug('Erg %d Distance: %d, expected: %d. Try %d/%d', self.__serial_number,
-                              erg_distance, distance, attempts, max_attempts)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Erg %s Distance: %s, expected: %d. Try %d/%d',
+                                 self.__serial_number, erg_distance, plan.get_distance(),
+                                 attempts, max_attempts)
 
-            elif self.SET_WORKOUT in command and in_use:
-                length = workout_time[0] * 60 * 60 + workout_time[1] * 60 + workout_time[2]
+            elif in_use and plan.get_workout_time() is not None:
                 erg_time = self.send_commands([self.GET_TIME]).get_time()
-                if erg_time == length:
-                    logging.debug('Workout set on erg %s in %ds', self.__serial_number,
-                                  attempts * self.RESET_WAIT_MAX)
+                if erg_time == plan.get_seconds():
+                    if LOGGER.isEnabledFor(logging.DEBUG):
+                        LOGGER.debug('Workout set on erg %s in %.1fs', self.__serial_number,
+                                     attempts * self.RESET_WAIT_MAX)
                     return True
-                logging.debug('Erg %d Distance: %d, expected: %d. Try %d/%d', self.__serial_number,
-                              erg_time, length, attempts, max_attempts)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Erg %s Time: %s, expected: %d. Try %d/%d', self.__serial_number,
+                                 erg_time, plan.get_seconds(), attempts, max_attempts)
+
+            elif in_use:
+                return True
 
             time.sleep(self.RESET_WAIT_MAX)
 
@@ -0,0 +1,162 @@
+"""
+PyRow.Race
+
+Live standings of a race over a fixed distance across many ergs.
+
+Standings are kept in a sorted list of keys, each sample moves its erg's key using binary
+searches instead of sorting every erg again. Finished ergs rank by their finish time,
+which is interpolated between the two samples either side of the finish line.
+"""
+
+import time
+from bisect import bisect_left, insort
+from collections import namedtuple
+from threading import Lock
+
+Standing = namedtuple('Standing', [
+    'position',
+    'serial_number',
+    'distance',
+    'finish_time',
+    'distance_behind',
+    'time_behind',
+])
+
+
+class _Entry(object):
+    """
+    Progress of one erg
+    """
+
+    def __init__(self, serial_number):
+        self.serial_number = serial_number
+        self.key = None
+        self.time = None
+        self.distance = 0.
+        self.speed = None
+        self.finish_time = None
+
+
+class Race(object):
+    """
+    Race
+    Can be used as a PerformanceMonitor listener
+    """
+
+    def __init__(self, distance, counts_down=True):
+        """
+        :param int distance: Race distance in metres
+        :param bool counts_down: True if the ergs report the distance remaining, as they do
+                                 for workouts set with a distance goal
+        :return:
+        """
+        self.__distance = float(distance)
+        self.__counts_down = counts_down
+        self.__entries = {}
+        self.__order = []
+        self.__listeners = []
+        self.__lock = Lock()
+
+    def add_listener(self, listener):
+        """
+        :param callable listener: Called with the standings whenever a position changes
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def poll(self, performance_monitors):
+        """
+        Polls the screen of every erg once and updates the standings
+        :param [PerformanceMonitor] performance_monitors:
+        :return:
+        """
+        for performance_monitor in performance_monitors:
+            self.update(performance_monitor.get_serial_number(), performance_monitor.get_monitor())
+
+    def update(self, serial_number, response, timestamp=None):
+        """
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp: Used when the response has no work time
+        :return:
+        """
+        distance = response.get_distance()
+        if distance is None:
+            return
+
+        elapsed = response.get_time()
+        if elapsed is None:
+            elapsed = time.time() if timestamp is None else timestamp
+        if self.__counts_down:
+            distance = self.__distance - distance
+
+        with self.__lock:
+            entry = self.__entries.get(serial_number)
+            if entry is None:
+                entry = _Entry(serial_number)
+                self.__entries[serial_number] = entry
+            if entry.finish_time is not None:
+                return
+
+            if entry.time is not None and elapsed > entry.time:
+                entry.speed = (distance - entry.distance) / (elapsed - entry.time)
+                if distance >= self.__distance > entry.distance:
+                    entry.finish_time = entry.time + (
+                        (self.__distance - entry.distance) / entry.speed
+                    )
+            elif distance >= self.__distance:
+                entry.finish_time = elapsed
+
+            entry.time = elapsed
+            entry.distance = min(distance, self.__distance)
+
+            if entry.finish_time is not None:
+                key = (0, entry.finish_time, serial_number)
+            else:
+                key = (1, -entry.distance, serial_number)
+
+            if entry.key is None:
+                old_position = None
+            else:
+                old_position = bisect_left(self.__order, entry.key)
+                del self.__order[old_position]
+            insort(self.__order, key)
+            entry.key = key
+
+            new_position = bisect_left(self.__order, key)
+            changed = old_position != new_position
+            standings = self.__get_standings() if changed and self.__listeners else None
+
+        if standings is not None:
+            for listener in self.__listeners:
+                listener(standings)
+
+    def get_standings(self):
+        """
+        :return [Standing]:
+        """
+        with self.__lock:
+            return self.__get_standings()
+
+    def __get_standings(self):
+        """
+        :return [Standing]:
+        """
+        standings = []
+        leader = None
+        for position, key in enumerate(self.__order):
+            entry = self.__entries[key[2]]
+            if leader is None:
+                leader = entry
+
+            distance_behind = leader.distance - entry.distance
+            if entry.finish_time is not None and leader.finish_time is not None:
+                time_behind = entry.finish_time - leader.finish_time
+            elif entry.speed:
+                time_behind = distance_behind / entry.speed
+            else:
+                time_behind = None
+
+            standings.append(Standing(position + 1, entry.serial_number, entry.distance,
+                                      entry.finish_time, distance_behind, time_behind))
+        return standings
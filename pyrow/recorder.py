@@ -0,0 +1,468 @@
+"""
+PyRow.Recorder
+
+Records workouts to disk without blocking the polling thread. Rows are batched in memory
+and written in bulk by a background WriterPool, which also fsyncs the files periodically.
+
+Two file formats are supported:
+    CSV         one line per row, variable length columns are space separated
+    COLUMNAR    binary blocks, each holding a batch of rows stored column by column
+"""
+
+import csv
+import io
+import math
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from array import array
+
+from pyrow import telemetry
+
+CSV = 'csv'
+COLUMNAR = 'columnar'
+
+# Column types
+DOUBLE = 'd'
+DOUBLES = 'D'  # Variable number of doubles, e.g. a force curve
+
+COLUMNAR_MAGIC = b'PYRC'
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct('<4sHH')  # Magic, Version, Columns
+COLUMNAR_BLOCK = struct.Struct('<II')  # Rows, Bytes
+COLUMNAR_CHECKSUM = struct.Struct('<I')
+
+STROKE_COLUMNS = (
+    ('timestamp', DOUBLE),
+    ('time', DOUBLE),
+    ('distance', DOUBLE),
+    ('spm', DOUBLE),
+    ('pace', DOUBLE),
+    ('power', DOUBLE),
+    ('heartrate', DOUBLE),
+    ('peak_force', DOUBLE),
+    ('average_force', DOUBLE),
+    ('impulse', DOUBLE),
+    ('drive_length', DOUBLE),
+    ('force', DOUBLES),
+)
+
+SAMPLE_COLUMNS = (('timestamp', DOUBLE), ) + tuple(
+    (name, DOUBLE) for name in telemetry.FIELD_NAMES
+)
+
+
+class CsvFormat(object):
+    """
+    CsvFormat
+    """
+
+    EXTENSION = 'csv'
+
+    def __init__(self, columns):
+        """
+        :param tuple columns: (name, type) pairs
+        :return:
+        """
+        self.__columns = columns
+        self.__arrays = [k for k, column in enumerate(columns) if column[1] == DOUBLES]
+
+    def encode_header(self):
+        """
+        :return bytes:
+        """
+        return (','.join(column[0] for column in self.__columns) + '\n').encode('ascii')
+
+    def encode(self, rows):
+        """
+        :param [tuple] rows:
+        :return bytes:
+        """
+        if self.__arrays:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for k in self.__arrays:
+                    row[k] = ' '.join(str(value) for value in row[k])
+
+        out = io.StringIO()
+        csv.writer(out, lineterminator='\n').writerows(rows)
+        return out.getvalue().encode('ascii')
+
+
+class ColumnarFormat(object):
+    """
+    ColumnarFormat
+    Each block is the row count and byte length, the columns and a CRC32 of the columns.
+    Double columns are stored as arrays of little-endian doubles (NaN for None), variable
+    length columns as an array of lengths followed by the concatenated values.
+    """
+
+    EXTENSION = 'pyrc'
+
+    def __init__(self, columns):
+        """
+        :param tuple columns: (name, type) pairs
+        :return:
+        """
+        self.__columns = columns
+
+    def encode_header(self):
+        """
+        :return bytes:
+        """
+        header = bytearray(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION,
+                                                len(self.__columns)))
+        for name, column_type in self.__columns:
+            encoded = name.encode('ascii')
+            header.append(len(encoded))
+            header.extend(encoded)
+            header.extend(column_type.encode('ascii'))
+        return bytes(header)
+
+    def encode(self, rows):
+        """
+        :param [tuple] rows:
+        :return bytes:
+        """
+        nan = float('nan')
+        body = bytearray()
+        for k, column in enumerate(self.__columns):
+            if column[1] == DOUBLES:
+                values = [row[k] or () for row in rows]
+                body.extend(_little_endian(array('I', [len(value) for value in values])))
+                flat = array('d')
+                for value in values:
+                    flat.extend(value)
+                body.extend(_little_endian(flat))
+            else:
+                body.extend(_little_endian(array('d', [
+                    nan if row[k] is None else row[k] for row in rows
+                ])))
+
+        return (COLUMNAR_BLOCK.pack(len(rows), len(body)) + bytes(body) +
+                COLUMNAR_CHECKSUM.pack(zlib.crc32(body) & 0xFFFFFFFF))
+
+
+FORMATS = {
+    CSV: CsvFormat,
+    COLUMNAR: ColumnarFormat,
+}
+
+
+def _little_endian(values):
+    """
+    :param array values:
+    :return bytes:
+    """
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode, data):
+    """
+    :param string typecode:
+    :param bytes data:
+    :return array:
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        values.byteswap()
+    return values
+
+
+def read_columnar(path):
+    """
+    Reads a columnar file, a block that was not completely written is ignored
+    :param string path:
+    :return dict: List of values by column name
+    """
+    with open(path, 'rb') as columnar_file:
+        data = columnar_file.read()
+
+    magic, version, count = COLUMNAR_HEADER.unpack_from(data, 0)
+    if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+        raise ValueError('{0} is not a columnar workout file'.format(path))
+
+    offset = COLUMNAR_HEADER.size
+    columns = []
+    for _ in range(count):
+        length = data[offset]
+        name = data[offset + 1:offset + 1 + length].decode('ascii')
+        columns.append((name, chr(data[offset + 1 + length])))
+        offset += length + 2
+
+    result = {name: [] for name, _ in columns}
+    while offset + COLUMNAR_BLOCK.size <= len(data):
+        rows, size = COLUMNAR_BLOCK.unpack_from(data, offset)
+        start = offset + COLUMNAR_BLOCK.size
+        end = start + size
+        if end + COLUMNAR_CHECKSUM.size > len(data):
+            break
+        body = data[start:end]
+        if COLUMNAR_CHECKSUM.unpack_from(data, end)[0] != zlib.crc32(body) & 0xFFFFFFFF:
+            break
+
+        k = 0
+        for name, column_type in columns:
+            if column_type == DOUBLES:
+                lengths = _from_little_endian('I', body[k:k + 4 * rows])
+                k += 4 * rows
+                flat = _from_little_endian('d', body[k:k + 8 * sum(lengths)])
+                k += 8 * sum(lengths)
+                i = 0
+                for length in lengths:
+                    result[name].append(list(flat[i:i + length]))
+                    i += length
+            else:
+                values = _from_little_endian('d', body[k:k + 8 * rows])
+                k += 8 * rows
+                result[name].extend(None if math.isnan(value) else value for value in values)
+
+        offset = end + COLUMNAR_CHECKSUM.size
+
+    return result
+
+
+class WriterPool(object):
+    """
+    WriterPool
+    Background thread that writes the batches of any number of WorkoutWriters
+    """
+
+    MAX_BATCHES = 1024
+
+    def __init__(self, max_batches=MAX_BATCHES):
+        """
+        :param int max_batches: Batches queued before submit blocks until the thread catches up,
+                                so a slow disk cannot make memory grow without bound
+        :return:
+        """
+        self.__queue = queue.Queue(max_batches)
+        self.__thread = None
+        self.__lock = threading.Lock()
+
+    def submit(self, writer, rows):
+        """
+        Queues rows to be written by the writer on the background thread
+        :param WorkoutWriter writer:
+        :param [tuple] rows: None to close the writer's file
+        :return:
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, name='pyrow-writer')
+                self.__thread.daemon = True
+                self.__thread.start()
+        self.__queue.put((writer, rows))
+
+    def join(self):
+        """
+        Waits until every queued batch has been written
+        :return:
+        """
+        self.__queue.join()
+
+    def __run(self):
+        """
+        :return:
+        """
+        while True:
+            writer, rows = self.__queue.get()
+            try:
+                writer.write_batch(rows)
+            except Exception:  # pylint: disable=broad-except
+                # Writers keep their own errors, the thread must outlive any one of them
+                pass
+            finally:
+                self.__queue.task_done()
+
+
+DEFAULT_POOL = WriterPool()
+
+
+class WorkoutWriter(object):
+    """
+    WorkoutWriter
+    Buffers rows in memory and hands them to a WriterPool in batches
+    """
+
+    BATCH_SIZE = 256
+    FSYNC_INTERVAL = 5.
+
+    def __init__(self, path, columns, file_format=CSV, batch_size=None, fsync_interval=None,
+                 pool=None):
+        """
+        :param string path:
+        :param tuple columns: (name, type) pairs
+        :param string file_format: CSV or COLUMNAR
+        :param int batch_size: Rows buffered before they are handed to the pool
+        :param float fsync_interval: Seconds between two fsyncs of the file
+        :param WriterPool pool:
+        :return:
+        """
+        self.__format = FORMATS[file_format](columns)
+        self.__width = len(columns)
+        self.__batch_size = batch_size or self.BATCH_SIZE
+        self.__fsync_interval = self.FSYNC_INTERVAL if fsync_interval is None else fsync_interval
+        self.__pool = pool or DEFAULT_POOL
+        self.__rows = []
+        self.__last_sync = time.time()
+        self.__error = None
+
+        self.__file = open(path, 'wb')
+        self.__file.write(self.__format.encode_header())
+
+    def append(self, row):
+        """
+        :param tuple row: One value per column
+        :return:
+        """
+        if self.__error is not None:
+            raise self.__error
+        if len(row) != self.__width:
+            raise ValueError('Expected {0} values, got {1}'.format(self.__width, len(row)))
+
+        self.__rows.append(row)
+        if len(self.__rows) >= self.__batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the buffered rows to the pool without waiting for them to be written
+        :return:
+        """
+        if self.__rows:
+            rows, self.__rows = self.__rows, []
+            self.__pool.submit(self, rows)
+
+    def write_batch(self, rows):
+        """
+        Called by the pool on its thread
+        :param [tuple] rows: None to close the file
+        :return:
+        """
+        if rows is None:
+            self.__close_file()
+            return
+
+        try:
+            self.__file.write(self.__format.encode(rows))
+            self.__file.flush()
+            now = time.time()
+            if now - self.__last_sync >= self.__fsync_interval:
+                os.fsync(self.__file.fileno())
+                self.__last_sync = now
+        except Exception as ex:  # pylint: disable=broad-except
+            # Also encode errors, e.g. a value that is not a number, are raised by the writer
+            self.__error = self.__error or ex
+
+    def close(self, wait=True):
+        """
+        Writes all buffered rows, syncs and closes the file
+        :param bool wait: False to leave closing the file to the pool, which does not wait for
+                          the batches of other writers sharing the pool
+        :return:
+        """
+        self.flush()
+        if not wait:
+            self.__pool.submit(self, None)
+            return
+
+        self.__pool.join()
+        self.__close_file()
+        if self.__error is not None:
+            raise self.__error
+
+    def get_error(self):
+        """
+        :return Exception: Error writing the file, None if there was none
+        """
+        return self.__error
+
+    def __close_file(self):
+        """
+        :return:
+        """
+        if self.__file.closed:
+            return
+        try:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        except (IOError, OSError) as ex:
+            self.__error = self.__error or ex
+        finally:
+            self.__file.close()
+
+
+class WorkoutRecorder(object):
+    """
+    WorkoutRecorder
+    Records per-sample and per-stroke rows of a workout on one erg to <prefix>_samples and
+    <prefix>_strokes files
+    """
+
+    def __init__(self, prefix, file_format=CSV, pool=None, serial_number=None):
+        """
+        :param string prefix: Path prefix of the files
+        :param string file_format: CSV or COLUMNAR
+        :param WriterPool pool:
+        :param string serial_number: Erg whose samples are recorded, the erg of the first sample
+                                     if None
+        :return:
+        """
+        self.__serial_number = serial_number
+        extension = FORMATS[file_format].EXTENSION
+        self.__samples = WorkoutWriter('{0}_samples.{1}'.format(prefix, extension),
+                                       SAMPLE_COLUMNS, file_format, pool=pool)
+        self.__strokes = WorkoutWriter('{0}_strokes.{1}'.format(prefix, extension),
+                                       STROKE_COLUMNS, file_format, pool=pool)
+
+    def record_sample(self, serial_number, response, timestamp=None):
+        """
+        PerformanceMonitor listener compatible, the rows do not say which erg they are from so
+        samples from any other erg are rejected
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return:
+        """
+        if self.__serial_number is None:
+            self.__serial_number = serial_number
+        elif serial_number != self.__serial_number:
+            raise ValueError('Recording erg {0}, got a sample from {1}'.format(
+                self.__serial_number, serial_number))
+        if timestamp is None:
+            timestamp = time.time()
+        self.__samples.append((timestamp, ) + telemetry.get_values(response))
+
+    def record_stroke(self, monitor, curve=None, timestamp=None):
+        """
+        :param Response monitor: Response of PerformanceMonitor.get_monitor()
+        :param ForceCurve curve:
+        :param float timestamp:
+        :return:
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        row = [timestamp, monitor.get_time(), monitor.get_distance(), monitor.get_spm(),
+               monitor.get_pace(), monitor.get_power(), monitor.get_heartrate()]
+        if curve is None:
+            row.extend([None, None, None, None, ()])
+        else:
+            row.extend([curve.get_peak_force(), curve.get_average_force(), curve.get_impulse(),
+                        curve.get_length(), array('d', curve.get_points())])
+        self.__strokes.append(tuple(row))
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__samples.close()
+        self.__strokes.close()
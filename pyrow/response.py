@@ -1,3 +1,10 @@
+"""
+PyRow.Response
+"""
+
+from pyrow.csafe.const import COMMAND_IDS, Command
+
+
 class Response(object):  # pylint: disable=R0904
     """
     Response
@@ -24,23 +31,41 @@ class Response(object):  # pylint: disable=R0904
         'Recovery'
     ]
 
+    STROKE_WAIT_MIN_SPEED = 0
+    STROKE_WAIT_FOR_ACCELERATION = 1
+    STROKE_DRIVE = 2
+    STROKE_DWELLING = 3
+    STROKE_RECOVERY = 4
+
     def __init__(self, results):
+        """
+        :param dict results: Values keyed by Command, or by command name
+        :return:
+        """
+        self.__raw = results
+        if any(isinstance(key, str) for key in results):
+            members = COMMAND_IDS
+            results = dict((members.get(key, key), value) for key, value in results.items())
+        elif type(results) is not dict:  # pylint: disable=unidiomatic-typecheck
+            # The getters look up Commands only, a plain dict skips the name lookups of Results
+            results = dict(results)
         self.__results = results
 
     def get_raw(self):
         """
-        :return:
+        :return dict: The results as they were given, results read from a Performance Monitor
+                      can be indexed by Command or by command name
         """
-        return self.__results
+        return self.__raw
 
     def get_time(self):
         """
         Get time remaining
         :return:
         """
-        if 'CSAFE_PM_GET_WORKTIME' in list(self.__results.keys()):
-            return (self.__results['CSAFE_PM_GET_WORKTIME'][0] +
-                    self.__results['CSAFE_PM_GET_WORKTIME'][1]) / 100.
+        if Command.CSAFE_PM_GET_WORKTIME in self.__results:
+            return (self.__results[Command.CSAFE_PM_GET_WORKTIME][0] +
+                    self.__results[Command.CSAFE_PM_GET_WORKTIME][1]) / 100.
         return None
 
     def get_distance(self):
@@ -48,14 +73,14 @@ class Response(object):  # pylint: disable=R0904
         Distance in metres
         :return:
         """
-        if 'CSAFE_PM_GET_WORKDISTANCE' in list(self.__results.keys()):
-            return (self.__results['CSAFE_PM_GET_WORKDISTANCE'][0] +
-                    self.__results['CSAFE_PM_GET_WORKDISTANCE'][1]) / 10.
+        if Command.CSAFE_PM_GET_WORKDISTANCE in self.__results:
+            return (self.__results[Command.CSAFE_PM_GET_WORKDISTANCE][0] +
+                    self.__results[Command.CSAFE_PM_GET_WORKDISTANCE][1]) / 10.
         return None
 
     def get_pace(self):
-        if 'CSAFE_GETPACE_CMD' in list(self.__results.keys()):
-            return float(self.__results['CSAFE_GETPACE_CMD'][0]) / 1000
+        if Command.CSAFE_GETPACE_CMD in self.__results:
+            return float(self.__results[Command.CSAFE_GETPACE_CMD][0]) / 1000
         return None
 
     def get_pace_500(self):
@@ -64,16 +89,16 @@ class Response(object):  # pylint: disable=R0904
         return None
 
     def get_calories(self):
-        if 'CSAFE_GETCALORIES_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETCALORIES_CMD'][0]
+        if Command.CSAFE_GETCALORIES_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETCALORIES_CMD][0]
         return None
 
     def get_stroke_state(self):
         """
         :return int:
         """
-        if 'CSAFE_PM_GET_STROKESTATE' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATE'][0]
+        if Command.CSAFE_PM_GET_STROKESTATE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATE][0]
         return None
 
     def get_stroke_state_message(self):
@@ -88,8 +113,8 @@ class Response(object):  # pylint: disable=R0904
         """
         :return int:
         """
-        if 'CSAFE_GETSTATUS_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETSTATUS_CMD'][0] & 0xF
+        if Command.CSAFE_GETSTATUS_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETSTATUS_CMD][0] & 0xF
 
         return None
 
@@ -106,8 +131,8 @@ class Response(object):  # pylint: disable=R0904
         Strokes per minute
         :return:
         """
-        if 'CSAFE_GETCADENCE_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETCADENCE_CMD'][0]
+        if Command.CSAFE_GETCADENCE_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETCADENCE_CMD][0]
         return None
 
     def get_power(self):
@@ -115,8 +140,8 @@ class Response(object):  # pylint: disable=R0904
         Power in Watts:
         :return:
         """
-        if 'CSAFE_GETPOWER_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETPOWER_CMD'][0]
+        if Command.CSAFE_GETPOWER_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETPOWER_CMD][0]
         return None
 
     def get_heartrate(self):
@@ -124,16 +149,52 @@ class Response(object):  # pylint: disable=R0904
         Beats per minute
         :return:
         """
-        if 'CSAFE_GETHRCUR_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETHRCUR_CMD'][0]
+        if Command.CSAFE_GETHRCUR_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETHRCUR_CMD][0]
+        return None
+
+    def get_drag_factor(self):
+        """
+        :return int:
+        """
+        if Command.CSAFE_PM_GET_DRAGFACTOR in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_DRAGFACTOR][0]
+        return None
+
+    def get_rest_time(self):
+        """
+        Rest time remaining in seconds
+        :return int:
+        """
+        if Command.CSAFE_PM_GET_RESTTIME in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_RESTTIME][0]
+        return None
+
+    def get_error_value(self):
+        """
+        :return int:
+        """
+        if Command.CSAFE_PM_GET_ERRORVALUE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_ERRORVALUE][0]
+        return None
+
+    def get_heartbeat_data(self):
+        """
+        :return:
+        """
+        if Command.CSAFE_PM_GET_HEARTBEATDATA in self.__results:
+            heartbeat_data = self.__results[Command.CSAFE_PM_GET_HEARTBEATDATA]
+            datapoints = heartbeat_data[0] // 2
+
+            return heartbeat_data[1:(datapoints + 1)]
         return None
 
     def get_force_plot(self):
         """
         :return:
         """
-        if 'CSAFE_PM_GET_FORCEPLOTDATA' in list(self.__results.keys()):
-            force_plot_data = self.__results['CSAFE_PM_GET_FORCEPLOTDATA']
+        if Command.CSAFE_PM_GET_FORCEPLOTDATA in self.__results:
+            force_plot_data = self.__results[Command.CSAFE_PM_GET_FORCEPLOTDATA]
             datapoints = force_plot_data[0] // 2
 
             return force_plot_data[1:(datapoints + 1)]
@@ -143,71 +204,71 @@ class Response(object):  # pylint: disable=R0904
         """
         :return:
         """
-        if 'CSAFE_PM_GET_STROKESTATE' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATE'][0]
+        if Command.CSAFE_PM_GET_STROKESTATE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATE][0]
 
         return None
 
     def get_stroke_distance(self):
         """Returns the stroke distance in meters."""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][0] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][0] // 100
 
         return None
 
     def get_stroke_drive_time(self):
         """Returns the stroke drive time in milliseconds."""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][1] * 10
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][1] * 10
 
         return None
 
     def get_stroke_recovery_time(self):
         """Returns the stroke recovery time in milliseconds."""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][2] * 10
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][2] * 10
 
         return None
 
     def get_stroke_length(self):
         """Returns the stroke length in meters"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][3] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][3] // 100
 
         return None
 
     def get_stroke_count(self):
         """Returns the stroke count"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][4]
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][4]
 
         return None
 
     def get_stroke_peak_force(self):
         """Returns the stroke peak force in Newtons"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][5] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][5] // 100
 
         return None
 
     def get_impulse_force(self):
         """Returns the stroke impulse force in kg m/s"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][6] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][6] // 100
 
         return None
 
     def get_stroke_average_force(self):
         """Returns the stroke average force in Newtons"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][7] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][7] // 100
 
         return None
 
     def get_work_per_stroke(self):
         """Returns the work per stroke in Joules"""
-        if 'CSAFE_PM_GET_STROKESTATS' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_STROKESTATS'][8] // 100
+        if Command.CSAFE_PM_GET_STROKESTATS in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_STROKESTATS][8] // 100
 
         return None
 
@@ -215,74 +276,74 @@ class Response(object):  # pylint: disable=R0904
         """
         :return:
         """
-        if 'CSAFE_GETID_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETID_CMD'][0]
+        if Command.CSAFE_GETID_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETID_CMD][0]
         return None
 
     def get_workout_type(self):
         """
         :return:
         """
-        if 'CSAFE_PM_GET_WORKOUTTYPE' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_WORKOUTTYPE'][0]
+        if Command.CSAFE_PM_GET_WORKOUTTYPE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_WORKOUTTYPE][0]
         return None
 
     def get_workout_state(self):
-        if 'CSAFE_PM_GET_WORKOUTSTATE' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_WORKOUTSTATE'][0]
+        if Command.CSAFE_PM_GET_WORKOUTSTATE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_WORKOUTSTATE][0]
         return None
 
     def get_workout_int_type(self):
-        if 'CSAFE_PM_GET_INTERVALTYPE' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_INTERVALTYPE'][0]
+        if Command.CSAFE_PM_GET_INTERVALTYPE in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_INTERVALTYPE][0]
         return None
 
     def get_workout_int_count(self):
-        if 'CSAFE_PM_GET_WORKOUTINTERVALCOUNT' in list(self.__results.keys()):
-            return self.__results['CSAFE_PM_GET_WORKOUTINTERVALCOUNT'][0]
+        if Command.CSAFE_PM_GET_WORKOUTINTERVALCOUNT in self.__results:
+            return self.__results[Command.CSAFE_PM_GET_WORKOUTINTERVALCOUNT][0]
         return None
 
     def get_erg_mfgid(self):
-        if 'CSAFE_GETVERSION_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETVERSION_CMD'][0]
+        if Command.CSAFE_GETVERSION_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETVERSION_CMD][0]
         return None
 
     def get_erg_cid(self):
-        if 'CSAFE_GETVERSION_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETVERSION_CMD'][1]
+        if Command.CSAFE_GETVERSION_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETVERSION_CMD][1]
         return None
 
     def get_erg_model(self):
-        if 'CSAFE_GETVERSION_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETVERSION_CMD'][2]
+        if Command.CSAFE_GETVERSION_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETVERSION_CMD][2]
         return None
 
     def get_erg_hwversion(self):
-        if 'CSAFE_GETVERSION_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETVERSION_CMD'][3]
+        if Command.CSAFE_GETVERSION_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETVERSION_CMD][3]
         return None
 
     def get_erg_swversion(self):
-        if 'CSAFE_GETVERSION_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETVERSION_CMD'][4]
+        if Command.CSAFE_GETVERSION_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETVERSION_CMD][4]
         return None
 
     def get_erg_serial(self):
-        if 'CSAFE_GETSERIAL_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETSERIAL_CMD'][0]
+        if Command.CSAFE_GETSERIAL_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETSERIAL_CMD][0]
         return None
 
     def get_erg_maxrx(self):
-        if 'CSAFE_GETCAPS_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETCAPS_CMD'][0]
+        if Command.CSAFE_GETCAPS_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETCAPS_CMD][0]
         return None
 
     def get_erg_maxtx(self):
-        if 'CSAFE_GETCAPS_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETCAPS_CMD'][1]
+        if Command.CSAFE_GETCAPS_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETCAPS_CMD][1]
         return None
 
     def get_erg_mininterframe(self):
-        if 'CSAFE_GETCAPS_CMD' in list(self.__results.keys()):
-            return self.__results['CSAFE_GETCAPS_CMD'][2]
+        if Command.CSAFE_GETCAPS_CMD in self.__results:
+            return self.__results[Command.CSAFE_GETCAPS_CMD][2]
         return None
@@ -0,0 +1,275 @@
+"""
+PyRow.Serialization
+
+Compact binary encoding of Responses for storage and for passing between processes.
+
+A Response is encoded as the number of commands (varint), the Command id of each command
+(uint16) and then the values of every command packed with the byte widths from
+const.RESP, so the command names are never written. Commands whose values do not fit the schema
+(variable length commands, or values out of range) are written with the id FALLBACK and their
+name and values are appended in the tagged encoding also used by the gateway.
+
+The structs for a set of commands are compiled the first time the set is seen and reused for
+every Response with the same commands, so a Response polled in a loop is packed and unpacked
+with a single struct call. The encoding is 3 to 7 times smaller than pickle and decodes as fast,
+but encoding a dict of lists in Python takes about 1.5 to 2 times as long as pickle's C
+implementation, see benchmarks/serialization.py.
+"""
+
+import struct
+from itertools import chain
+
+from pyrow.csafe import const
+from pyrow.response import Response
+from pyrow.varint import decode_varint, encode_varint, unzigzag, zigzag
+
+FALLBACK = 0xFFFF
+
+# Response lengths that depend on the request
+VARIABLE_IDS = (0x70, 0x92)  # CSAFE_GETCAPS_CMD, CSAFE_GETID_CMD
+
+FORMATS = {0: 'B', 1: 'B', 2: 'H', 4: 'I'}
+
+DOUBLE = struct.Struct('<d')
+
+TAG_NONE = 0x00
+TAG_INT = 0x01
+TAG_FLOAT = 0x02
+TAG_STRING = 0x03
+TAG_LIST = 0x04
+TAG_DICT = 0x05
+TAG_TRUE = 0x06
+TAG_FALSE = 0x07
+
+
+def encode_value(value, out):
+    """
+    :param mixed value: None, bool, int, float, string, list, tuple or dict of those
+    :param bytearray out:
+    :return:
+    """
+    if value is None:
+        out.append(TAG_NONE)
+    elif value is True:
+        out.append(TAG_TRUE)
+    elif value is False:
+        out.append(TAG_FALSE)
+    elif isinstance(value, int):
+        out.append(TAG_INT)
+        encode_varint(zigzag(value), out)
+    elif isinstance(value, float):
+        out.append(TAG_FLOAT)
+        out.extend(DOUBLE.pack(value))
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        out.append(TAG_STRING)
+        encode_varint(len(encoded), out)
+        out.extend(encoded)
+    elif isinstance(value, (list, tuple)):
+        out.append(TAG_LIST)
+        encode_varint(len(value), out)
+        for item in value:
+            encode_value(item, out)
+    elif isinstance(value, dict):
+        out.append(TAG_DICT)
+        encode_varint(len(value), out)
+        for key, item in value.items():
+            encode_value(key, out)
+            encode_value(item, out)
+    else:
+        raise TypeError('Cannot encode {0}'.format(type(value).__name__))
+
+
+def decode_value(data, offset=0):
+    """
+    :param bytes data:
+    :param int offset:
+    :return (mixed, int): Value and the offset after it
+    """
+    tag = data[offset]
+    offset += 1
+    if tag == TAG_NONE:
+        return None, offset
+    if tag == TAG_TRUE:
+        return True, offset
+    if tag == TAG_FALSE:
+        return False, offset
+    if tag == TAG_INT:
+        value, offset = decode_varint(data, offset)
+        return unzigzag(value), offset
+    if tag == TAG_FLOAT:
+        return DOUBLE.unpack_from(data, offset)[0], offset + DOUBLE.size
+    if tag == TAG_STRING:
+        length, offset = decode_varint(data, offset)
+        return bytes(data[offset:offset + length]).decode('utf-8'), offset + length
+    if tag == TAG_LIST:
+        count, offset = decode_varint(data, offset)
+        items = []
+        for _ in range(count):
+            item, offset = decode_value(data, offset)
+            items.append(item)
+        return items, offset
+    if tag == TAG_DICT:
+        count, offset = decode_varint(data, offset)
+        items = {}
+        for _ in range(count):
+            key, offset = decode_value(data, offset)
+            items[key], offset = decode_value(data, offset)
+        return items, offset
+    raise ValueError('Unknown tag {0}'.format(tag))
+
+
+_SCHEMA = {}
+
+
+def _get_schema():
+    """
+    Built on first use so importing this module does not build the command tables
+    :return dict: Command and command name to (response id, struct format of its values)
+    """
+    if not _SCHEMA:
+        schema = {}
+        for response_id, (name, widths) in const.get_resp().items():
+            if response_id in VARIABLE_IDS or any(width not in FORMATS for width in widths):
+                continue
+            entry = (response_id, ''.join(FORMATS[width] for width in widths))
+            schema[name] = entry
+            schema[response_id] = entry
+        _SCHEMA.update(schema)
+    return _SCHEMA
+
+
+class _EncodePlan(object):
+    """
+    Struct of the ids and values of a set of commands that all fit the schema
+    """
+
+    def __init__(self, names, schema):
+        entries = [schema[name] for name in names]
+        self.lengths = tuple(len(entry[1]) for entry in entries)
+        # The count and ids are the same for every Response of the set, only the values are packed
+        header = bytearray()
+        encode_varint(len(names), header)
+        header.extend(struct.pack('<{0}H'.format(len(names)), *(entry[0] for entry in entries)))
+        self.header = bytes(header)
+        self.struct = struct.Struct('<' + ''.join(entry[1] for entry in entries))
+
+
+class _DecodePlan(object):
+    """
+    Commands and struct of the values of a set of response ids
+    """
+
+    def __init__(self, ids, schema):
+        self.slices = []
+        formats = []
+        self.fallbacks = 0
+        position = 0
+        for response_id in ids:
+            if response_id == FALLBACK:
+                self.fallbacks += 1
+                continue
+            length = len(schema[response_id][1])
+            self.slices.append((response_id, position, position + length))
+            formats.append(schema[response_id][1])
+            position += length
+        self.struct = struct.Struct('<' + ''.join(formats))
+
+
+_ENCODE_PLANS = {}
+_DECODE_PLANS = {}
+
+
+def encode_response(response, out=None):
+    """
+    :param Response|dict response:
+    :param bytearray out: Appended to if given
+    :return bytes|bytearray: out if given, otherwise the encoded bytes
+    """
+    results = response.get_raw() if isinstance(response, Response) else response
+    names = tuple(results)
+
+    plan = _ENCODE_PLANS.get(names)
+    if plan is None:
+        schema = _get_schema()
+        if all(name in schema for name in names):
+            plan = _ENCODE_PLANS.setdefault(names, _EncodePlan(names, schema))
+
+    values = results.values()
+    if plan is not None and tuple(map(len, values)) == plan.lengths:
+        try:
+            packed = plan.struct.pack(*chain.from_iterable(values))
+        except struct.error:
+            pass
+        else:
+            if out is None:
+                return plan.header + packed
+            out.extend(plan.header)
+            out.extend(packed)
+            return out
+
+    return _encode_slow(results, names, bytearray() if out is None else out)
+
+
+def _encode_slow(results, names, out):
+    """
+    Encodes each command on its own, falling back to the tagged encoding where needed
+    :param dict results:
+    :param tuple names:
+    :param bytearray out:
+    :return bytes|bytearray:
+    """
+    schema = _get_schema()
+    ids = []
+    packed = bytearray()
+    fallbacks = []
+    for name in names:
+        result = results[name]
+        entry = schema.get(name)
+        if entry is not None and len(result) == len(entry[1]):
+            try:
+                packed.extend(struct.pack('<' + entry[1], *result))
+            except struct.error:
+                pass
+            else:
+                ids.append(entry[0])
+                continue
+        ids.append(FALLBACK)
+        fallbacks.append(name)
+
+    encode_varint(len(names), out)
+    out.extend(struct.pack('<{0}H'.format(len(ids)), *ids))
+    out.extend(packed)
+    for name in fallbacks:
+        encode_value(name, out)
+        encode_value(results[name], out)
+    return out
+
+
+def decode_response(data, offset=0):
+    """
+    :param bytes data:
+    :param int offset:
+    :return (Response, int): Response and the offset after it
+    """
+    count, offset = decode_varint(data, offset)
+    end = offset + 2 * count
+    ids = bytes(data[offset:end])
+
+    plan = _DECODE_PLANS.get(ids)
+    if plan is None:
+        plan = _DECODE_PLANS.setdefault(ids, _DecodePlan(
+            struct.unpack('<{0}H'.format(count), ids), _get_schema()))
+
+    values = plan.struct.unpack_from(data, end)
+    offset = end + plan.struct.size
+
+    results = const.Results(
+        (name, list(values[start:end])) for name, start, end in plan.slices)
+
+    members = const.COMMAND_IDS
+    for _ in range(plan.fallbacks):
+        name, offset = decode_value(data, offset)
+        results[members.get(name, name)], offset = decode_value(data, offset)
+
+    return Response(results), offset
@@ -0,0 +1,236 @@
+"""
+PyRow.Sessions
+
+Records every workout on any number of ergs without waiting on one erg at a time. Each erg's
+status is followed from the responses it already sends: a session opens when the erg goes in
+use and closes when it finishes, is reset, or its workout ends, so one file is written per
+workout.
+
+Samples are handed straight to a WorkoutWriter that shares one WriterPool with the other
+sessions, so at most a batch of rows per erg and the pool's queue are held in memory however
+long a session runs. Sessions are closed without waiting for the pool, so finishing on one erg
+does not hold up polling the others.
+"""
+
+import os
+import time
+from collections import namedtuple
+from threading import Lock
+
+from pyrow import log, telemetry
+from pyrow.csafe.const import Command
+from pyrow.intervals import END_STATES
+from pyrow.recorder import COLUMNAR, DEFAULT_POOL, FORMATS, SAMPLE_COLUMNS, WorkoutWriter
+
+STATE_READY = 1
+STATE_IDLE = 2
+STATE_HAVE_ID = 3
+STATE_IN_USE = 5
+STATE_FINISHED = 7
+
+# Statuses an erg goes back to when it is reset without finishing the workout
+RESET_STATES = frozenset([
+    STATE_READY,
+    STATE_IDLE,
+    STATE_HAVE_ID,
+])
+
+# PM specific commands are kept together so they share one wrapper
+POLL_COMMANDS = [
+    Command.CSAFE_PM_GET_WORKTIME,
+    Command.CSAFE_PM_GET_WORKDISTANCE,
+    Command.CSAFE_PM_GET_WORKOUTSTATE,
+    Command.CSAFE_PM_GET_STROKESTATE,
+    Command.CSAFE_GETCADENCE_CMD,
+    Command.CSAFE_GETPOWER_CMD,
+    Command.CSAFE_GETPACE_CMD,
+    Command.CSAFE_GETCALORIES_CMD,
+    Command.CSAFE_GETHRCUR_CMD,
+]
+
+FINISHED = 'finished'
+RESET = 'reset'
+ENDED = 'ended'
+CLOSED = 'closed'
+
+Session = namedtuple('Session', [
+    'serial_number',
+    'path',
+    'start',
+    'end',
+    'samples',
+    'reason',
+])
+
+LOGGER = log.PM
+
+
+class _Session(object):
+    """
+    Session in progress on one erg
+    """
+
+    def __init__(self, serial_number, path, writer, start):
+        self.serial_number = serial_number
+        self.path = path
+        self.writer = writer
+        self.start = start
+        self.end = start
+        self.samples = 0
+
+    def to_session(self, reason=None):
+        """
+        :param string reason: Why the session closed, None while it is in progress
+        :return Session:
+        """
+        return Session(self.serial_number, self.path, self.start, self.end, self.samples,
+                       reason)
+
+
+class SessionRecorder(object):
+    """
+    SessionRecorder
+    Can be used as a PerformanceMonitor listener, every response includes the status
+    """
+
+    def __init__(self, directory, file_format=COLUMNAR, pool=None, batch_size=None):
+        """
+        :param string directory: Where the session files are written
+        :param string file_format: CSV or COLUMNAR
+        :param WriterPool pool: Shared by the writers of every session
+        :param int batch_size: Rows buffered per session before they are handed to the pool
+        :return:
+        """
+        self.__directory = directory
+        self.__format = file_format
+        self.__pool = pool or DEFAULT_POOL
+        self.__batch_size = batch_size
+        self.__sessions = {}
+        self.__counts = {}
+        self.__listeners = []
+        self.__lock = Lock()
+
+    def add_listener(self, listener):
+        """
+        :param callable listener: Called with each Session when it closes
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def poll(self, performance_monitors, now=None):
+        """
+        Polls every erg once and records the sample if it is in a session
+        :param [PerformanceMonitor] performance_monitors:
+        :param float now:
+        :return:
+        """
+        for performance_monitor in performance_monitors:
+            self.update(performance_monitor.get_serial_number(),
+                        performance_monitor.send_commands(POLL_COMMANDS), now)
+
+    def update(self, serial_number, response, timestamp=None):
+        """
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return Session: The session that closed, None if no session closed
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        status = response.get_status()
+
+        with self.__lock:
+            session = self.__sessions.get(serial_number)
+            if session is None:
+                # An erg can stay in use after its workout has ended, e.g. while it shows the log
+                if status != STATE_IN_USE or response.get_workout_state() in END_STATES:
+                    return None
+                session = self.__open(serial_number, timestamp)
+
+            session.writer.append((timestamp, ) + telemetry.get_values(response))
+            session.end = timestamp
+            session.samples += 1
+
+            if status == STATE_FINISHED:
+                reason = FINISHED
+            elif status in RESET_STATES:
+                reason = RESET
+            elif response.get_workout_state() in END_STATES:
+                reason = ENDED
+            else:
+                return None
+            closed = self.__close(serial_number, reason)
+
+        for listener in self.__listeners:
+            listener(closed)
+        return closed
+
+    def get_session(self, serial_number):
+        """
+        :param string serial_number:
+        :return Session: The session in progress, None between workouts
+        """
+        with self.__lock:
+            session = self.__sessions.get(serial_number)
+            return None if session is None else session.to_session()
+
+    def get_sessions(self):
+        """
+        :return [Session]: Sessions in progress
+        """
+        with self.__lock:
+            return [session.to_session() for session in self.__sessions.values()]
+
+    def close(self):
+        """
+        Closes every session in progress and waits for their files to be written
+        :return [Session]: Sessions that were closed
+        """
+        with self.__lock:
+            writers = [session.writer for session in self.__sessions.values()]
+            closed = [self.__close(serial_number, CLOSED)
+                      for serial_number in list(self.__sessions)]
+
+        self.__pool.join()
+        for writer in writers:
+            if writer.get_error() is not None:
+                raise writer.get_error()
+        for session in closed:
+            for listener in self.__listeners:
+                listener(session)
+        return closed
+
+    def __open(self, serial_number, timestamp):
+        """
+        :param string serial_number:
+        :param float timestamp:
+        :return _Session:
+        """
+        # Numbered per erg, so sessions started within the same second never share a file
+        started = time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp))
+        number = self.__counts.get(serial_number, 0)
+        while True:
+            number += 1
+            path = os.path.join(self.__directory, '{0}-{1}-{2}.{3}'.format(
+                serial_number, started, number, FORMATS[self.__format].EXTENSION))
+            if not os.path.exists(path):
+                break
+        self.__counts[serial_number] = number
+        writer = WorkoutWriter(path, SAMPLE_COLUMNS, self.__format,
+                               batch_size=self.__batch_size, pool=self.__pool)
+        session = _Session(serial_number, path, writer, timestamp)
+        self.__sessions[serial_number] = session
+        LOGGER.info('Session started on erg %s: %s', serial_number, path)
+        return session
+
+    def __close(self, serial_number, reason):
+        """
+        Leaves the pool to write and close the file
+        :param string serial_number:
+        :param string reason:
+        :return Session:
+        """
+        session = self.__sessions.pop(serial_number)
+        session.writer.close(wait=False)
+        LOGGER.info('Session %s on erg %s after %d samples', reason, serial_number,
+                    session.samples)
+        return session.to_session(reason)
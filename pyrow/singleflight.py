@@ -0,0 +1,67 @@
+"""
+PyRow.SingleFlight
+
+Collapses concurrent calls with the same key onto one call, the callers that arrive while it
+is in flight wait for it and share its result.
+"""
+
+from threading import Event, Lock
+
+
+class _Call(object):
+    """
+    A call in flight
+    """
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    SingleFlight
+    """
+
+    def __init__(self):
+        self.__lock = Lock()
+        self.__calls = {}
+        self.__merged = 0
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        :param hashable key:
+        :param callable function:
+        :return mixed: Result of the function, shared by every caller with the same key
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+            else:
+                self.__merged += 1
+
+        if leader:
+            try:
+                call.result = function(*args, **kwargs)
+            except Exception as ex:  # pylint: disable=broad-except
+                call.error = ex
+            finally:
+                with self.__lock:
+                    del self.__calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def get_merged_count(self):
+        """
+        :return int: Number of calls that shared another call's result
+        """
+        return self.__merged
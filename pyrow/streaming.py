@@ -0,0 +1,188 @@
+"""
+PyRow.Streaming
+
+Streams erg telemetry to TCP clients with the compact binary delta encoding of pyrow.delta.
+
+Needs Python 3.5 for async/await, so this module is only imported on 3.5 and later. Clients
+only need pyrow.delta to decode the stream.
+"""
+
+import asyncio
+import time
+
+from pyrow import telemetry
+from pyrow.delta import DeltaEncoder, to_integers
+
+
+class _Client(object):
+    """
+    State of one connected client
+    """
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.encoder = DeltaEncoder()
+        self.pending = {}
+        self.wake = asyncio.Event()
+
+
+class TelemetryServer(object):
+    """
+    TelemetryServer
+    Serves telemetry to TCP clients, PerformanceMonitor listener compatible.
+
+    Samples for a client are conflated per erg and sent at most MAX_RATE times a second.
+    While a client's socket buffer is above HIGH_WATER only the latest sample of each erg is
+    kept, a client whose buffer exceeds MAX_BUFFER is disconnected.
+    """
+
+    MAX_RATE = 10.
+    HIGH_WATER = 64 * 1024
+    MAX_BUFFER = 1024 * 1024
+
+    def __init__(self, host='127.0.0.1', port=0, max_rate=None, high_water=None,
+                 max_buffer=None):
+        """
+        :param string host:
+        :param int port: 0 to pick a free port
+        :param float max_rate: Samples a second per erg for each client
+        :param int high_water: Bytes buffered before samples are conflated
+        :param int max_buffer: Bytes buffered before a client is disconnected
+        :return:
+        """
+        self.__host = host
+        self.__port = port
+        self.__interval = 1. / (max_rate or self.MAX_RATE)
+        self.__high_water = self.HIGH_WATER if high_water is None else high_water
+        self.__max_buffer = self.MAX_BUFFER if max_buffer is None else max_buffer
+
+        self.__loop = None
+        self.__server = None
+        self.__clients = set()
+        self.__latest = {}
+        self.__shed_count = 0
+
+    async def start(self):
+        """
+        Starts listening on the running event loop
+        :return:
+        """
+        # get_event_loop returns the running loop inside a coroutine, get_running_loop is 3.7+
+        self.__loop = asyncio.get_event_loop()
+        self.__server = await asyncio.start_server(self.__serve, self.__host, self.__port)
+        self.__port = self.__server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        :return:
+        """
+        self.__loop = None
+        self.__server.close()
+        for client in list(self.__clients):
+            client.writer.close()
+        await self.__server.wait_closed()
+
+    def get_port(self):
+        """
+        :return int:
+        """
+        return self.__port
+
+    def get_client_count(self):
+        """
+        :return int:
+        """
+        return len(self.__clients)
+
+    def get_shed_count(self):
+        """
+        :return int: Number of clients disconnected for being too slow
+        """
+        return self.__shed_count
+
+    def publish(self, serial_number, response, timestamp=None):
+        """
+        Queues the response for every client, can be called from any thread. Responses
+        published while the server is not running are dropped
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return:
+        """
+        loop = self.__loop
+        if loop is None:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        values = to_integers(telemetry.get_values(response))
+        try:
+            loop.call_soon_threadsafe(self.__publish, serial_number, timestamp, values)
+        except RuntimeError:
+            # The loop closed since it was read
+            pass
+
+    def __publish(self, serial_number, timestamp, values):
+        """
+        :param string serial_number:
+        :param float timestamp:
+        :param tuple values:
+        :return:
+        """
+        previous = self.__latest.get(serial_number)
+        if previous is not None:
+            values = telemetry.merge_values(previous[1], values)
+        self.__latest[serial_number] = (timestamp, values)
+
+        for client in self.__clients:
+            client.pending[serial_number] = (timestamp, values)
+            client.wake.set()
+
+    async def __serve(self, reader, writer):
+        """
+        :param StreamReader reader:
+        :param StreamWriter writer:
+        :return:
+        """
+        client = _Client(writer)
+        client.pending.update(self.__latest)
+        if client.pending:
+            client.wake.set()
+        self.__clients.add(client)
+
+        sender = asyncio.ensure_future(self.__send(client))
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            self.__clients.discard(client)
+            writer.close()
+
+    async def __send(self, client):
+        """
+        :param _Client client:
+        :return:
+        """
+        while True:
+            await client.wake.wait()
+            client.wake.clear()
+
+            buffered = client.writer.transport.get_write_buffer_size()
+            if buffered > self.__max_buffer:
+                self.__shed_count += 1
+                self.__clients.discard(client)
+                client.writer.close()
+                return
+
+            if buffered <= self.__high_water:
+                pending, client.pending = client.pending, {}
+                out = bytearray()
+                for serial_number, (timestamp, values) in pending.items():
+                    client.encoder.encode(serial_number, timestamp, values, out)
+                client.writer.write(bytes(out))
+            else:
+                client.wake.set()
+
+            await asyncio.sleep(self.__interval)
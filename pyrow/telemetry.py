@@ -0,0 +1,46 @@
+"""
+PyRow.Telemetry
+
+The fixed set of Response fields that are shared with other processes and clients.
+"""
+
+from collections import namedtuple
+
+# (field name, Response getter, resolution), a resolution of 1 means the field is an integer
+FIELDS = (
+    ('time', 'get_time', 100),
+    ('distance', 'get_distance', 10),
+    ('spm', 'get_spm', 1),
+    ('power', 'get_power', 1),
+    ('pace', 'get_pace', 1000),
+    ('calories', 'get_calories', 1),
+    ('heartrate', 'get_heartrate', 1),
+    ('status', 'get_status', 1),
+    ('stroke_state', 'get_stroke_state', 1),
+    ('workout_state', 'get_workout_state', 1),
+)
+
+FIELD_NAMES = tuple(field[0] for field in FIELDS)
+
+Sample = namedtuple('Sample', ('serial_number', 'timestamp') + FIELD_NAMES)
+
+
+def get_values(response):
+    """
+    Reads the telemetry fields from a Response, fields that are not in the response are None
+    :param Response response:
+    :return tuple:
+    """
+    return tuple(getattr(response, field[1])() for field in FIELDS)
+
+
+def merge_values(previous, values):
+    """
+    Keeps the previous value of any field that the latest response did not contain
+    :param tuple previous:
+    :param tuple values:
+    :return tuple:
+    """
+    if previous is None:
+        return values
+    return tuple(old if new is None else new for old, new in zip(previous, values))
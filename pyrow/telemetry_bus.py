@@ -0,0 +1,293 @@
+"""
+PyRow.TelemetryBus
+
+Shares the latest telemetry of every erg with other processes through a fixed-layout
+shared memory segment. Only the process that owns the USB interfaces publishes, any number
+of processes can read.
+
+Each erg has its own slot guarded by a sequence lock: the publisher makes the sequence
+number odd while it writes the slot and even again once it is done, readers retry until
+they see the same even sequence number before and after unpacking the slot.
+
+The segment is a memory mapped file in SEGMENT_DIRECTORY, /dev/shm where it exists so the
+pages never go to disk, and works on every supported Python. A multiprocessing.shared_memory
+segment, new in Python 3.8, can be used instead by passing shared_memory=True to both the
+publisher and the readers.
+"""
+
+import binascii
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from threading import Lock
+
+from pyrow import telemetry
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # Python < 3.8
+    SharedMemory = None
+
+MAGIC = b'PYRW'
+VERSION = 1
+DEFAULT_SLOTS = 32
+SERIAL_LENGTH = 16
+
+HEADER = struct.Struct('<4sHHHH')  # Magic, Version, Slots, Fields, Reserved
+SEQUENCE = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<{0}sd{1}d'.format(SERIAL_LENGTH, len(telemetry.FIELDS)))
+SLOT_SIZE = SEQUENCE.size + PAYLOAD.size
+
+READ_RETRY_LIMIT = 1000
+
+SEGMENT_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class _MappedSegment(object):
+    """
+    Segment backed by a memory mapped file, with the buf, name, close and unlink of
+    SharedMemory
+    """
+
+    def __init__(self, name=None, create=False, size=0):
+        """
+        :param string name: File name in SEGMENT_DIRECTORY, generated if None
+        :param bool create:
+        :param int size: Bytes, only used when the segment is created
+        :return:
+        """
+        if name is None:
+            name = 'pyrow_' + binascii.hexlify(os.urandom(8)).decode('ascii')
+        self.name = name
+        self.__path = os.path.join(SEGMENT_DIRECTORY, name)
+
+        if create:
+            descriptor = os.open(self.__path, os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o600)
+        else:
+            descriptor = os.open(self.__path, os.O_RDWR)
+        try:
+            if create:
+                os.write(descriptor, bytes(size))
+            self.__map = mmap.mmap(descriptor, os.fstat(descriptor).st_size)
+        finally:
+            os.close(descriptor)
+        self.buf = memoryview(self.__map)
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__map.close()
+
+    def unlink(self):
+        """
+        :return:
+        """
+        os.unlink(self.__path)
+
+
+def _open(shared_memory, **kwargs):
+    """
+    :param bool shared_memory: Use multiprocessing.shared_memory rather than a mapped file
+    :param kwargs: Arguments of SharedMemory
+    :return _MappedSegment|SharedMemory:
+    """
+    if not shared_memory:
+        return _MappedSegment(**kwargs)
+    if SharedMemory is None:
+        raise NotImplementedError('multiprocessing.shared_memory is only available from '
+                                  'Python 3.8, use the default mapped file segment')
+    return SharedMemory(**kwargs)
+
+
+def get_size(slots):
+    """
+    :param int slots:
+    :return int: Size in bytes of a segment holding the given number of slots
+    """
+    return HEADER.size + slots * SLOT_SIZE
+
+
+class TelemetryPublisher(object):
+    """
+    TelemetryPublisher
+    Writes the latest telemetry of each erg into shared memory, can be used as a
+    PerformanceMonitor listener
+    """
+
+    def __init__(self, name=None, slots=DEFAULT_SLOTS, shared_memory=False):
+        """
+        :param string name: Name of the segment, generated if None
+        :param int slots: Maximum number of ergs
+        :param bool shared_memory: Use multiprocessing.shared_memory, Python 3.8+
+        :return:
+        """
+        self.__memory = _open(shared_memory, name=name, create=True, size=get_size(slots))
+        self.__buffer = self.__memory.buf
+        self.__slots = slots
+        self.__slot_index = {}
+        self.__sequences = []
+        self.__values = []
+        self.__lock = Lock()
+
+        self.__buffer[:get_size(slots)] = bytes(get_size(slots))
+        HEADER.pack_into(self.__buffer, 0, MAGIC, VERSION, slots, len(telemetry.FIELDS), 0)
+
+    def get_name(self):
+        """
+        :return string:
+        """
+        return self.__memory.name
+
+    def publish(self, serial_number, response, timestamp=None):
+        """
+        Writes the fields of the response into the erg's slot, fields that are missing
+        from the response keep their previous value
+        :param string serial_number:
+        :param Response response:
+        :param float timestamp:
+        :return:
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self.__lock:
+            index = self.__slot_index.get(serial_number)
+            if index is None:
+                index = self.__allocate(serial_number)
+
+            values = telemetry.merge_values(self.__values[index], telemetry.get_values(response))
+            self.__values[index] = values
+
+            offset = HEADER.size + index * SLOT_SIZE
+            sequence = self.__sequences[index] + 1
+            SEQUENCE.pack_into(self.__buffer, offset, sequence)
+            PAYLOAD.pack_into(
+                self.__buffer,
+                offset + SEQUENCE.size,
+                serial_number.encode('ascii'),
+                timestamp,
+                *[float('nan') if value is None else value for value in values]
+            )
+            sequence += 1
+            SEQUENCE.pack_into(self.__buffer, offset, sequence)
+            self.__sequences[index] = sequence
+
+    def close(self):
+        """
+        Closes and removes the segment
+        :return:
+        """
+        self.__buffer.release()
+        self.__memory.close()
+        self.__memory.unlink()
+
+    def __allocate(self, serial_number):
+        """
+        :param string serial_number:
+        :return int:
+        """
+        if len(self.__slot_index) >= self.__slots:
+            raise ValueError('No free telemetry slot for {0}'.format(serial_number))
+        if len(serial_number) > SERIAL_LENGTH:
+            raise ValueError('Serial number too long: {0}'.format(serial_number))
+
+        index = len(self.__slot_index)
+        self.__slot_index[serial_number] = index
+        self.__sequences.append(0)
+        self.__values.append(None)
+        return index
+
+
+class TelemetryReader(object):
+    """
+    TelemetryReader
+    Reads telemetry published by a TelemetryPublisher in another process
+    """
+
+    def __init__(self, name, shared_memory=False):
+        """
+        :param string name: Name of the segment
+        :param bool shared_memory: Whether the publisher uses multiprocessing.shared_memory
+        :return:
+        """
+        self.__memory = _open(shared_memory, name=name)
+        self.__buffer = self.__memory.buf
+
+        magic, version, slots, fields, _ = HEADER.unpack_from(self.__buffer, 0)
+        if magic != MAGIC or version != VERSION or fields != len(telemetry.FIELDS):
+            self.close()
+            raise ValueError('{0} is not a compatible telemetry segment'.format(name))
+
+        self.__slots = slots
+        self.__slot_index = {}
+
+    def read(self, serial_number):
+        """
+        :param string serial_number:
+        :return Sample: Latest sample of the erg or None if it has not been published
+        """
+        index = self.__slot_index.get(serial_number)
+        if index is not None:
+            sample = self.__read_slot(index)
+            if sample is not None and sample.serial_number == serial_number:
+                return sample
+
+        self.read_all()
+        index = self.__slot_index.get(serial_number)
+        if index is None:
+            return None
+        return self.__read_slot(index)
+
+    def read_all(self):
+        """
+        :return dict: Latest sample of every published erg by serial number
+        """
+        samples = {}
+        for index in range(self.__slots):
+            sample = self.__read_slot(index)
+            if sample is not None:
+                samples[sample.serial_number] = sample
+                self.__slot_index[sample.serial_number] = index
+        return samples
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__buffer.release()
+        self.__memory.close()
+
+    def __read_slot(self, index):
+        """
+        :param int index:
+        :return Sample: None if the slot is unused
+        """
+        offset = HEADER.size + index * SLOT_SIZE
+        for _ in range(READ_RETRY_LIMIT):
+            before, = SEQUENCE.unpack_from(self.__buffer, offset)
+            if before & 1:
+                continue
+            payload = PAYLOAD.unpack_from(self.__buffer, offset + SEQUENCE.size)
+            after, = SEQUENCE.unpack_from(self.__buffer, offset)
+            if before == after:
+                break
+        else:
+            raise RuntimeError('Telemetry slot {0} is never consistent'.format(index))
+
+        if before == 0:
+            return None
+
+        values = []
+        for field, value in zip(telemetry.FIELDS, payload[2:]):
+            if math.isnan(value):
+                values.append(None)
+            elif field[2] == 1:
+                values.append(int(value))
+            else:
+                values.append(value)
+
+        return telemetry.Sample(payload[0].rstrip(b'\0').decode('ascii'), payload[1], *values)
@@ -0,0 +1,122 @@
+"""
+PyRow.Trace
+
+Keeps the last frames exchanged with a Performance Monitor in a fixed size ring buffer that is
+allocated up front, so recording a frame is a slice copy with no allocation or logging. The
+buffer is written in the capture format when asked to, or by the PerformanceMonitor when a
+frame fails, so the frames leading up to a problem can be replayed.
+"""
+
+import os
+import time
+from array import array
+from threading import Lock
+
+from pyrow import capture
+
+
+class FrameTrace(object):
+    """
+    FrameTrace
+    """
+
+    REQUEST = capture.REQUEST
+    RESPONSE = capture.RESPONSE
+
+    CAPACITY = 512
+    MAX_LENGTH = 121  # Largest HID report
+
+    def __init__(self, capacity=CAPACITY, directory=None, max_length=MAX_LENGTH):
+        """
+        :param int capacity: Number of frames kept
+        :param string directory: Where the PerformanceMonitor dumps the trace when a frame fails
+        :param int max_length: Longer frames are cut to this length
+        :return:
+        """
+        self.__capacity = capacity
+        self.__directory = directory
+        self.__max_length = max_length
+        self.__data = bytearray(capacity * max_length)
+        self.__timestamps = array('d', bytes(8 * capacity))
+        self.__directions = bytearray(capacity)
+        self.__lengths = array('H', bytes(2 * capacity))
+        self.__count = 0
+        self.__dumps = 0
+        self.__lock = Lock()
+
+    def get_directory(self):
+        """
+        :return string:
+        """
+        return self.__directory
+
+    def record(self, direction, data, timestamp=None):
+        """
+        :param int direction: capture.REQUEST or capture.RESPONSE
+        :param [int]|bytes data: Raw report
+        :param float timestamp:
+        :return:
+        """
+        length = min(len(data), self.__max_length)
+        with self.__lock:
+            index = self.__count % self.__capacity
+            offset = index * self.__max_length
+            self.__data[offset:offset + length] = data[:length]
+            self.__timestamps[index] = time.time() if timestamp is None else timestamp
+            self.__directions[index] = direction
+            self.__lengths[index] = length
+            self.__count += 1
+
+    def get_count(self):
+        """
+        :return int: Number of frames recorded, including those no longer kept
+        """
+        return self.__count
+
+    def get_records(self):
+        """
+        :return [(float, int, bytes)]: Frames kept, oldest first
+        """
+        with self.__lock:
+            count = min(self.__count, self.__capacity)
+            first = self.__count - count
+            records = []
+            for k in range(first, self.__count):
+                index = k % self.__capacity
+                offset = index * self.__max_length
+                records.append((self.__timestamps[index], self.__directions[index],
+                                bytes(self.__data[offset:offset + self.__lengths[index]])))
+        return records
+
+    def dump(self, path=None, name='trace'):
+        """
+        :param string path: Defaults to a file in the directory named after name, the time and
+                            a number
+        :param string name:
+        :return string: Path of the capture file
+        """
+        if path is None:
+            if self.__directory is None:
+                raise ValueError('No path or directory to dump the trace to')
+            # Numbered, so a burst of failures within the same second keeps every dump
+            dumped = time.strftime('%Y%m%d-%H%M%S')
+            with self.__lock:
+                number = self.__dumps
+                while True:
+                    number += 1
+                    path = os.path.join(self.__directory, '{0}-{1}-{2}.pyrf'.format(
+                        name, dumped, number))
+                    if not os.path.exists(path):
+                        break
+                self.__dumps = number
+
+        with open(path, 'wb') as capture_file:
+            capture_file.write(capture.encode_records(self.get_records()))
+        return path
+
+    def clear(self):
+        """
+        :return:
+        """
+        with self.__lock:
+            self.__count = 0
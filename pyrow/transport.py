@@ -0,0 +1,403 @@
+"""
+PyRow.Transport
+
+Transports move raw CSAFE frames between a PerformanceMonitor and a Performance Monitor:
+    UsbTransport        a Performance Monitor connected with USB (pyusb)
+    TcpTransport        a Performance Monitor shared by a TransportBridge on another host, see
+                        pyrow.bridge
+    LoopbackTransport   an in-process simulated Performance Monitor, for tests and simulation
+    AddressedTransport  one of several daisy-chained Performance Monitors on a SharedLink
+
+Each transport sets its own MIN_FRAME_GAP, the time a PerformanceMonitor waits between two
+frames, and its own timeouts.
+"""
+
+import queue
+import sys
+import threading
+import time
+from collections import deque
+
+from pyrow import log
+from pyrow.csafe import framing
+from pyrow.exceptions import TransportException
+
+LOGGER = log.USB
+WARNINGS = log.RateLimitedLog(LOGGER)
+
+
+def _usb():
+    """
+    Imports pyusb on first device access, so tools that only decode frames do not pay for
+    loading it and probing its backends
+    :return module:
+    """
+    import usb.util
+    return usb
+
+
+def find_usb_devices(vendor_id):
+    """
+    :param int vendor_id:
+    :return [Device]: pyusb devices of the vendor
+    """
+    return _usb().core.find(find_all=True, idVendor=vendor_id)
+
+
+class Transport(object):
+    """
+    Transport
+    """
+
+    MIN_FRAME_GAP = 0.
+
+    def get_manufacturer(self):
+        """
+        :return string:
+        """
+        raise NotImplementedError()
+
+    def get_product(self):
+        """
+        :return string:
+        """
+        raise NotImplementedError()
+
+    def get_serial_number(self):
+        """
+        :return string:
+        """
+        raise NotImplementedError()
+
+    def get_product_id(self):
+        """
+        :return int: USB product id, see PerformanceMonitor.PM_VERSION
+        """
+        raise NotImplementedError()
+
+    def write(self, data):
+        """
+        :param [int] data: HID report
+        :return int: Length of the report to read back
+        """
+        raise NotImplementedError()
+
+    def read(self, length):
+        """
+        :param int length:
+        :return [int]: HID report
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        :return:
+        """
+        pass
+
+
+class UsbTransport(Transport):
+    """
+    UsbTransport
+    """
+
+    MIN_FRAME_GAP = .050
+    TIMEOUT = 2000
+    READ_TIMEOUT = 20000
+
+    def __init__(self, device):
+        """
+        :param Device device: pyusb device
+        :return:
+        """
+        self.__device = device
+        if sys.platform != 'win32':
+            if device.is_kernel_driver_active(0):
+                device.detach_kernel_driver(0)
+            else:
+                LOGGER.debug('USB Kernel driver not on %s', sys.platform)
+
+        usb = _usb()
+        usb.util.claim_interface(device, 0)
+
+        try:
+            device.set_configuration()
+        except usb.USBError:
+            pass
+
+        interface = device[0][(0, 0)]
+        self.__in_address = interface[0].bEndpointAddress
+        self.__out_address = interface[1].bEndpointAddress
+
+        self.__manufacturer = usb.util.get_string(self.__device, self.__device.iManufacturer)
+        self.__product = usb.util.get_string(self.__device, self.__device.iProduct)
+        self.__serial_number = usb.util.get_string(self.__device, self.__device.iSerialNumber)
+
+    def get_manufacturer(self):
+        return self.__manufacturer
+
+    def get_product(self):
+        return self.__product
+
+    def get_serial_number(self):
+        return self.__serial_number
+
+    def get_product_id(self):
+        return self.__device.idProduct
+
+    def write(self, data):
+        return self.__device.write(self.__out_address, data, timeout=self.TIMEOUT)
+
+    def read(self, length):
+        return self.__device.read(self.__in_address, length, timeout=self.READ_TIMEOUT)
+
+    def close(self):
+        _usb().util.release_interface(self.__device, 0)
+
+
+class LoopbackTransport(Transport):
+    """
+    LoopbackTransport
+    Frames written by the PerformanceMonitor are either answered by a handler or queued for
+    the simulated side to receive_request() and send_response()
+    """
+
+    TIMEOUT = 2.
+
+    def __init__(self, handler=None, serial_number='000000000', product_id=0x0003):
+        """
+        :param callable handler: Given each request report, returns the response report
+        :param string serial_number:
+        :param int product_id:
+        :return:
+        """
+        self.__handler = handler
+        self.__serial_number = serial_number
+        self.__product_id = product_id
+        self.__requests = queue.Queue()
+        self.__responses = queue.Queue()
+
+    def get_manufacturer(self):
+        return 'Concept2'
+
+    def get_product(self):
+        return 'Loopback Performance Monitor'
+
+    def get_serial_number(self):
+        return self.__serial_number
+
+    def get_product_id(self):
+        return self.__product_id
+
+    def write(self, data):
+        if self.__handler is None:
+            self.__requests.put(list(data))
+        else:
+            self.__responses.put(list(self.__handler(list(data))))
+        return len(data)
+
+    def read(self, length):
+        try:
+            return self.__responses.get(timeout=self.TIMEOUT)[:length]
+        except queue.Empty:
+            raise TransportException('Timed out reading from {0}'.format(self.__serial_number))
+
+    def receive_request(self, timeout=None):
+        """
+        :param float timeout:
+        :return [int]: Next report written by the PerformanceMonitor
+        """
+        try:
+            return self.__requests.get(timeout=timeout)
+        except queue.Empty:
+            raise TransportException('No request for {0}'.format(self.__serial_number))
+
+    def send_response(self, data):
+        """
+        :param [int] data: Report for the PerformanceMonitor to read
+        :return:
+        """
+        self.__responses.put(list(data))
+
+
+class AddressedTransport(Transport):
+    """
+    AddressedTransport
+    Sends the frames of one PerformanceMonitor to its address on a SharedLink. Frames are paced
+    per address by the link, MIN_FRAME_GAP is 0 here.
+    """
+
+    def __init__(self, link, address, serial_number):
+        """
+        :param SharedLink link:
+        :param int address:
+        :param string serial_number:
+        :return:
+        """
+        self.__link = link
+        self.__address = address
+        self.__serial_number = serial_number
+
+    def get_address(self):
+        """
+        :return int:
+        """
+        return self.__address
+
+    def get_manufacturer(self):
+        return self.__link.get_transport().get_manufacturer()
+
+    def get_product(self):
+        return self.__link.get_transport().get_product()
+
+    def get_serial_number(self):
+        return self.__serial_number
+
+    def get_product_id(self):
+        return self.__link.get_transport().get_product_id()
+
+    def write(self, data):
+        return self.__link.write(self.__address, data)
+
+    def read(self, length):
+        return self.__link.read(self.__address, length)
+
+    def close(self):
+        self.__link.release(self.__address)
+
+
+class SharedLink(object):
+    """
+    SharedLink
+    Shares one transport between daisy-chained Performance Monitors. Each frame is sent as an
+    extended frame to the address of its erg and responses are handed to the erg they came
+    from, so ergs can have frames in flight at the same time and are only kept MIN_FRAME_GAP
+    apart from their own previous frame.
+    """
+
+    LINK_FRAME_GAP = 0.
+
+    def __init__(self, transport):
+        """
+        :param Transport transport:
+        :return:
+        """
+        self.__transport = transport
+        self.__gap = transport.MIN_FRAME_GAP
+        self.__transports = {}
+        self.__last_write = {}
+        self.__locks = {}
+        self.__lengths = {}
+        self.__responses = {}
+        self.__last_frame = 0.
+        self.__write_lock = threading.Lock()
+        self.__condition = threading.Condition()
+        self.__reading = False
+
+    def get_transport(self, address=None, serial_number=None):
+        """
+        :param int address: None for the link's own transport
+        :param string serial_number: Defaults to the link's serial number and the address
+        :return Transport:
+        """
+        if address is None:
+            return self.__transport
+
+        transport = self.__transports.get(address)
+        if transport is None:
+            if serial_number is None:
+                serial_number = '{0}-{1:02X}'.format(self.__transport.get_serial_number(), address)
+            with self.__condition:
+                self.__locks[address] = threading.Lock()
+                self.__last_write[address] = 0.
+                self.__lengths[address] = 0
+                self.__responses[address] = deque()
+                transport = AddressedTransport(self, address, serial_number)
+                self.__transports[address] = transport
+        return transport
+
+    def get_addresses(self):
+        """
+        :return [int]:
+        """
+        return sorted(self.__transports)
+
+    def write(self, address, data):
+        """
+        Writes to the address, keeping its frames MIN_FRAME_GAP of the link's transport apart
+        :param int address:
+        :param [int] data: HID report with a standard frame
+        :return int: Length of the report to read back
+        """
+        report = framing.address(list(data), address)
+        with self.__locks[address]:
+            delta = time.time() - self.__last_write[address]
+            if delta < self.__gap:
+                time.sleep(self.__gap - delta)
+
+            with self.__write_lock:
+                delta = time.time() - self.__last_frame
+                if delta < self.LINK_FRAME_GAP:
+                    time.sleep(self.LINK_FRAME_GAP - delta)
+                length = self.__transport.write(report)
+                self.__last_frame = time.time()
+
+            self.__last_write[address] = self.__last_frame
+            self.__lengths[address] = length
+        return length
+
+    def read(self, address, length):
+        """
+        Reads the next response from the address. Only one thread reads the link at a time,
+        responses it reads for other addresses are queued for them.
+        :param int address:
+        :param int length:
+        :return [int]: HID report
+        """
+        with self.__condition:
+            while True:
+                responses = self.__responses[address]
+                if responses:
+                    return responses.popleft()[:length]
+                if not self.__reading:
+                    break
+                self.__condition.wait()
+            self.__reading = True
+
+        try:
+            while True:
+                report = self.__transport.read(max(length, max(self.__lengths.values())))
+                addresses = framing.get_addresses(report)
+                # Standard frames have no source, they can only be the reader's
+                source = address if addresses is None else addresses[1]
+                if source == address:
+                    return report[:length]
+
+                with self.__condition:
+                    if source in self.__responses:
+                        self.__responses[source].append(report)
+                        self.__condition.notify_all()
+                    else:
+                        WARNINGS.warning(source, 'Response from unknown address %d', source)
+        finally:
+            with self.__condition:
+                self.__reading = False
+                self.__condition.notify_all()
+
+    def release(self, address):
+        """
+        Drops the address, the link's transport is closed with the last one
+        :param int address:
+        :return:
+        """
+        with self.__condition:
+            self.__transports.pop(address, None)
+            if not self.__transports:
+                self.__transport.close()
+
+    def close(self):
+        """
+        :return:
+        """
+        self.__transports.clear()
+        self.__transport.close()
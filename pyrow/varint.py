@@ -0,0 +1,51 @@
+"""
+PyRow.Varint
+
+Variable length integers shared by the binary encodings: unsigned LEB128 varints, with zigzag
+mapping signed integers onto unsigned ones so small negative values stay short.
+"""
+
+
+def encode_varint(value, out):
+    """
+    :param int value: Unsigned integer
+    :param bytearray out:
+    :return:
+    """
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """
+    :param bytes data:
+    :param int offset:
+    :return (int, int): Value and the offset after it
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def zigzag(value):
+    """
+    :param int value:
+    :return int:
+    """
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value):
+    """
+    :param int value:
+    :return int:
+    """
+    return (value >> 1) ^ -(value & 1)
@@ -0,0 +1,228 @@
+"""
+PyRow.Workout
+
+A WorkoutPlan is validated and encoded into a CSAFE frame once when it is created, so the same
+piece can be programmed on any number of Performance Monitors without repeating the work.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pyrow.csafe.cmd import CsafeCmd
+from pyrow.csafe.const import Command
+from pyrow.metrics import calorie_pace_to_watts, pace_to_watts
+
+SET_WORKOUT = Command.CSAFE_SETTWORK_CMD
+SET_HORIZONTAL = Command.CSAFE_SETHORIZONTAL_CMD
+SET_SPLIT_DURATION = Command.CSAFE_PM_SET_SPLITDURATION
+SET_POWER = Command.CSAFE_SETPOWER_CMD
+SET_PROGRAM = Command.CSAFE_SETPROGRAM_CMD
+SET_WORKOUT_TYPE = Command.CSAFE_PM_SET_WORKOUTTYPE
+SET_WORKOUT_DURATION = Command.CSAFE_PM_SET_WORKOUTDURATION
+SET_REST_DURATION = Command.CSAFE_PM_SET_RESTDURATION
+SET_CONFIGURE_WORKOUT = Command.CSAFE_PM_SET_CONFIGUREWORKOUT
+SET_SCREEN_STATE = Command.CSAFE_PM_SET_SCREENSTATE
+GO_IN_USE = Command.CSAFE_GOINUSE_CMD
+
+DURATION_TIME = 0
+DURATION_DISTANCE = 128
+UNITS_METERS = 36
+UNITS_WATTS = 88
+
+WORKOUT_FIXED_TIME_INTERVAL = 6
+WORKOUT_FIXED_DISTANCE_INTERVAL = 7
+
+SCREEN_TYPE_WORKOUT = 1
+SCREEN_PREPARE_TO_ROW = 1
+
+MAX_REST = 595
+
+
+def _validate_value(value, label, minimum, maximum):
+    """
+    Checks that value is an integer and within the specified range
+    :param int value:
+    :param string label:
+    :param int minimum:
+    :param int maximum:
+    :return:
+    """
+    if not isinstance(value, int):
+        raise TypeError(label)
+    if not minimum <= value <= maximum:
+        raise ValueError(label + ' outside of range')
+
+
+class WorkoutPlan(object):
+    """
+    WorkoutPlan
+    Immutable, every argument is validated and the command frame is encoded on creation
+    """
+
+    def __init__(self,
+                 program=None,
+                 workout_time=None,
+                 distance=None,
+                 split=None,
+                 pace=None,
+                 cal_pace=None,
+                 power_pace=None,
+                 rest=None):
+        """
+        :param int program: Preprogrammed workout number
+        :param [int] workout_time: [seconds], [minutes, seconds] or [hours, minutes, seconds]
+        :param int distance: Meters
+        :param int|float split: Seconds for a timed workout, meters for a distance workout
+        :param float pace: Seconds per 500m
+        :param float cal_pace: Calories per hour
+        :param int power_pace: Watts
+        :param int rest: Seconds of rest, makes workout_time or distance a repeating interval
+        :return:
+        """
+        self.__program = program
+        self.__workout_time = None
+        self.__distance = None
+        self.__rest = rest
+
+        command = []
+
+        # Set Workout Goal
+        program_num = 0
+        if program is not None:
+            _validate_value(program, 'Program', 0, 15)
+            program_num = program
+        elif workout_time is not None:
+            # Pad hours and minutes without touching the caller's list
+            workout_time = tuple([0] * (3 - len(workout_time)) + list(workout_time))
+            _validate_value(workout_time[0], 'Time Hours', 0, 9)
+            _validate_value(workout_time[1], 'Time Minutes', 0, 59)
+            _validate_value(workout_time[2], 'Time Seconds', 0, 59)
+
+            if workout_time[0] == 0 and workout_time[1] == 0 and workout_time[2] < 20:
+                # checks if workout is < 20 seconds
+                raise ValueError('Workout too short')
+
+            self.__workout_time = workout_time
+        elif distance is not None:
+            _validate_value(distance, 'Distance', 100, 50000)
+            self.__distance = distance
+
+        if rest is not None:
+            _validate_value(rest, 'Rest', 0, MAX_REST)
+            if self.__workout_time is not None:
+                command.extend([SET_WORKOUT_TYPE, WORKOUT_FIXED_TIME_INTERVAL,
+                                SET_WORKOUT_DURATION, DURATION_TIME, self.get_seconds() * 100])
+            elif self.__distance is not None:
+                command.extend([SET_WORKOUT_TYPE, WORKOUT_FIXED_DISTANCE_INTERVAL,
+                                SET_WORKOUT_DURATION, DURATION_DISTANCE, self.__distance])
+            else:
+                raise ValueError('Cannot rest without a time or distance interval')
+            command.extend([SET_REST_DURATION, rest])
+        elif self.__workout_time is not None:
+            command.extend([SET_WORKOUT] + list(self.__workout_time))
+        elif self.__distance is not None:
+            command.extend([SET_HORIZONTAL, self.__distance, UNITS_METERS])
+
+        # Set Split
+        if split is not None:
+            if rest is not None:
+                raise ValueError('Cannot set split for an interval workout')
+            if self.__workout_time is not None:
+                split_time = int(split * 100)
+                time_raw = self.get_seconds()
+                # split workout_time that will occur 30 workout_times (.01 sec)
+                min_split = int(time_raw / 30 * 100 + 0.5)
+                _validate_value(split_time, 'Split Time', max(2000, min_split), time_raw * 100)
+                command.extend([SET_SPLIT_DURATION, DURATION_TIME, split_time])
+            elif self.__distance is not None:
+                # split distance that will occur 30 workout_times (m)
+                min_split = int(self.__distance / 30 + 0.5)
+                _validate_value(split, 'Split distance', max(100, min_split), self.__distance)
+                command.extend([SET_SPLIT_DURATION, DURATION_DISTANCE, split])
+            else:
+                raise ValueError('Cannot set split for current goal')
+
+        # Set Pace
+        if pace is not None:
+            power_pace = pace_to_watts(pace)
+        elif cal_pace is not None:
+            power_pace = calorie_pace_to_watts(cal_pace)
+        if power_pace is not None:
+            command.extend([SET_POWER, power_pace, UNITS_WATTS])
+
+        if rest is not None:
+            command.extend([SET_CONFIGURE_WORKOUT, 1,
+                            SET_SCREEN_STATE, SCREEN_TYPE_WORKOUT, SCREEN_PREPARE_TO_ROW])
+        else:
+            command.extend([SET_PROGRAM, program_num, 0, GO_IN_USE])
+
+        self.__commands = tuple(command)
+        self.__frame = tuple(CsafeCmd.write(command))
+
+    def get_commands(self):
+        """
+        :return tuple:
+        """
+        return self.__commands
+
+    def get_frame(self):
+        """
+        :return tuple: Encoded report, ready to be written to a Performance Monitor
+        """
+        return self.__frame
+
+    def get_program(self):
+        """
+        :return int:
+        """
+        return self.__program
+
+    def get_workout_time(self):
+        """
+        :return (int, int, int): Hours, minutes and seconds
+        """
+        return self.__workout_time
+
+    def get_seconds(self):
+        """
+        :return int: Length of the timed workout or interval
+        """
+        if self.__workout_time is None:
+            return None
+        return self.__workout_time[0] * 3600 + self.__workout_time[1] * 60 + self.__workout_time[2]
+
+    def get_distance(self):
+        """
+        :return int: Meters of the distance workout or interval
+        """
+        return self.__distance
+
+    def get_rest(self):
+        """
+        :return int: Seconds of rest between intervals, None if the workout has no intervals
+        """
+        return self.__rest
+
+    def get_workout_type(self):
+        """
+        :return int: Workout type the Performance Monitor reports for an interval workout, None
+                     if the workout has no intervals
+        """
+        if self.__rest is None:
+            return None
+        if self.__workout_time is not None:
+            return WORKOUT_FIXED_TIME_INTERVAL
+        return WORKOUT_FIXED_DISTANCE_INTERVAL
+
+    def apply(self, performance_monitors):
+        """
+        Sets the workout on every Performance Monitor at the same time
+        :param [PerformanceMonitor] performance_monitors:
+        :return:
+        """
+        performance_monitors = list(performance_monitors)
+        if not performance_monitors:
+            return
+        with ThreadPoolExecutor(max_workers=len(performance_monitors)) as executor:
+            for future in [executor.submit(performance_monitor.apply_workout, self)
+                           for performance_monitor in performance_monitors]:
+                future.result()
@@ -24,15 +24,18 @@ class CsafeCmd(MagicMock):
         self.__responses = responses
         self.read_call_count = 0
 
-    def read(self, transmission):
+    def read(self, transmission, strict=False, model=None):
         """
         :param transmission:
+        :param strict:
         :return []:
         """
         if self.read_call_count >= len(self.__responses):
             raise Exception('Not enough mocked responses')
         response = self.__responses[self.read_call_count]
         self.read_call_count += 1
+        if isinstance(response, Exception):
+            raise response
         logging.debug('Read: %s', response)
         return response
 
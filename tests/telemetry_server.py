@@ -0,0 +1,95 @@
+"""
+tests.PyRow.Concept2.TelemetryServerTests
+
+Uses async/await, so it is only imported by tests.test_streaming on Python 3.5 and later
+"""
+import asyncio
+from unittest import TestCase
+
+from pyrow.delta import DeltaDecoder
+from pyrow.response import Response
+from pyrow.streaming import TelemetryServer
+
+
+def run_loop(coroutine):
+    """
+    Runs the coroutine like asyncio.run, which is 3.7+
+    :param coroutine coroutine:
+    :return: Result of the coroutine
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        # Connection handlers still waiting on their clients are cancelled before closing
+        all_tasks = getattr(asyncio, 'all_tasks', None) or asyncio.Task.all_tasks
+        tasks = all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class TelemetryServerTests(TestCase):
+    """
+    Tests for TelemetryServer
+    """
+
+    def test_publish_before_start(self):
+        """
+        TelemetryServer.publish - it should drop responses while the server is not running
+        :return:
+        """
+        server = TelemetryServer()
+        server.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}), 1.0)
+        self.assertEqual(server.get_client_count(), 0)
+
+    def test_publish(self):
+        """
+        TelemetryServer.publish - it should stream published responses to clients
+        :return:
+        """
+        async def run():
+            server = TelemetryServer(max_rate=1000)
+            await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.get_port())
+            while server.get_client_count() == 0:
+                await asyncio.sleep(0.001)
+
+            server.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}), 1.0)
+            decoder = DeltaDecoder()
+            samples = []
+            while not samples:
+                samples = decoder.feed(await reader.read(1024))
+
+            writer.close()
+            await server.close()
+            return samples
+
+        samples = run_loop(run())
+
+        self.assertEqual(samples[0].serial_number, '400124190')
+        self.assertEqual(samples[0].spm, 24)
+
+    def test_slow_client_is_shed(self):
+        """
+        TelemetryServer - it should disconnect a client whose buffer is over the limit
+        :return:
+        """
+        async def run():
+            server = TelemetryServer(max_buffer=-1)
+            await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.get_port())
+            while server.get_client_count() == 0:
+                await asyncio.sleep(0.001)
+
+            server.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}))
+            data = await reader.read(1024)
+
+            writer.close()
+            await server.close()
+            return data, server.get_shed_count()
+
+        self.assertEqual(run_loop(run()), (b'', 1))
@@ -0,0 +1,80 @@
+"""
+tests.PyRow.Concept2.ArchiveTests
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from pyrow import archive, capture
+
+
+def response_frame(status, spm, power, stroke_state):
+    """
+    :param int status:
+    :param int spm:
+    :param int power:
+    :param int stroke_state:
+    :return bytes:
+    """
+    message = [status, 0xA7, 3, spm, 0, 0, 0xB4, 3, power, 0, 0, 0x1A, 3, 0xBF, 1, stroke_state]
+    checksum = 0
+    for byte in message:
+        checksum ^= byte
+    return bytes([0x01, 0xF1] + message + [checksum, 0xF2])
+
+
+class ArchiveTests(TestCase):
+    """
+    Tests for process_session and process_archive
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        for k in range(3):
+            path = os.path.join(self.directory, 'session{0}.pyrf'.format(k))
+            with open(path, 'wb') as capture_file:
+                capture_file.write(capture.encode_records([
+                    (0., capture.REQUEST, b'\x01\xf1\xa7\xa7\xf2'),
+                    (0., capture.RESPONSE, response_frame(5, 20, 100 + k, 4)),
+                    (1., capture.RESPONSE, response_frame(5, 24, 200, 2)),
+                    (2., capture.RESPONSE, response_frame(5, 24, 150, 4)),
+                    (3., capture.RESPONSE, response_frame(5, 24, 150, 2)),
+                    (4., capture.RESPONSE, b'\x01\xf1\x05\x00\xf2'),
+                ]))
+            self.paths.append(path)
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        shutil.rmtree(self.directory)
+
+    def test_process_session(self):
+        """
+        process_session - it should summarise a capture file
+        :return:
+        """
+        summary = archive.process_session(self.paths[0])
+
+        self.assertEqual(summary.frames, 5)
+        self.assertEqual(summary.errors, 1)
+        self.assertEqual(summary.strokes, 2)
+        self.assertEqual(summary.duration, 3)
+        self.assertEqual(summary.average_spm, 23)
+        self.assertEqual(summary.average_power, 150)
+        self.assertEqual(summary.max_power, 200)
+
+    def test_process_archive(self):
+        """
+        process_archive - it should process every file and keep their order
+        :return:
+        """
+        summaries = archive.process_archive(self.paths, workers=2)
+
+        self.assertEqual([summary.path for summary in summaries], self.paths)
+        self.assertEqual(summaries[2], archive.process_session(self.paths[2]))
@@ -0,0 +1,133 @@
+"""
+tests.PyRow.Concept2.CacheTests
+"""
+import threading
+import time
+from unittest import TestCase
+
+from pyrow.cache import ResponseCache
+from pyrow.csafe.const import Command, is_query, is_stream
+
+
+class Fetcher(object):
+    """
+    Counts calls and returns the call number
+    """
+
+    def __init__(self, delay=0.):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.calls
+
+
+class ResponseCacheTests(TestCase):
+    """
+    Tests for ResponseCache
+    """
+
+    def test_hit(self):
+        """
+        ResponseCache.get - it should answer from the cache while the entry is fresh
+        :return:
+        """
+        cache = ResponseCache(10)
+        fetch = Fetcher()
+
+        self.assertEqual(cache.get('status', fetch), 1)
+        self.assertEqual(cache.get('status', fetch), 1)
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(cache.get_stats().hits, 1)
+        self.assertEqual(cache.get_stats().misses, 1)
+
+    def test_expiry(self):
+        """
+        ResponseCache.get - it should fetch again once the entry is older than the ttl
+        :return:
+        """
+        cache = ResponseCache(0.01)
+        fetch = Fetcher()
+        cache.get('status', fetch)
+        time.sleep(0.02)
+
+        self.assertEqual(cache.get('status', fetch), 2)
+        self.assertEqual(cache.get_stats().misses, 2)
+
+    def test_invalidate(self):
+        """
+        ResponseCache.invalidate - it should drop every entry
+        :return:
+        """
+        cache = ResponseCache(10)
+        fetch = Fetcher()
+        cache.get('status', fetch)
+        cache.get('monitor', fetch)
+        cache.invalidate()
+
+        self.assertEqual(cache.get('status', fetch), 3)
+        self.assertEqual(cache.get_stats().invalidations, 1)
+
+    def test_invalidate_in_flight(self):
+        """
+        ResponseCache.invalidate - it should not keep a Response fetched before the invalidation
+        :return:
+        """
+        cache = ResponseCache(10)
+        fetch = Fetcher()
+
+        def fetch_and_invalidate():
+            cache.invalidate()
+            return fetch()
+
+        cache.get('status', fetch_and_invalidate)
+
+        self.assertEqual(cache.get('status', fetch), 2)
+
+    def test_concurrent_misses(self):
+        """
+        ResponseCache.get - it should collapse concurrent misses onto one fetch
+        :return:
+        """
+        cache = ResponseCache(10)
+        fetch = Fetcher(0.05)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get('status', fetch)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1, 1, 1, 1])
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(cache.get_stats().merged, 3)
+
+
+class CommandTests(TestCase):
+    """
+    Tests for is_query and is_stream
+    """
+
+    def test_is_query(self):
+        """
+        is_query - it should only accept commands that read from the Performance Monitor, and
+        tell arguments from commands by position
+        :return:
+        """
+        self.assertTrue(is_query(['CSAFE_GETSTATUS_CMD', 'CSAFE_PM_GET_FORCEPLOTDATA', 32]))
+        self.assertFalse(is_query(['CSAFE_GETSTATUS_CMD', 'CSAFE_GOIDLE_CMD']))
+        self.assertTrue(is_query([Command.CSAFE_PM_GET_FORCEPLOTDATA, 0x82]))
+        self.assertFalse(is_query([Command.CSAFE_GETSTATUS_CMD, Command.CSAFE_GOIDLE_CMD]))
+
+    def test_is_stream(self):
+        """
+        is_stream - it should detect commands whose data is consumed by reading it
+        :return:
+        """
+        self.assertTrue(is_stream(['CSAFE_PM_GET_WORKTIME', 'CSAFE_PM_GET_HEARTBEATDATA', 32]))
+        self.assertFalse(is_stream(['CSAFE_PM_GET_WORKTIME', 'CSAFE_GETSTATUS_CMD']))
+        self.assertTrue(is_stream([Command.CSAFE_PM_GET_FORCEPLOTDATA, 32]))
+        self.assertFalse(is_stream([Command.CSAFE_PM_GET_STROKESTATS, 0x1A6B]))
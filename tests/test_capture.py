@@ -0,0 +1,67 @@
+"""
+tests.PyRow.Concept2.CaptureTests
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from pyrow import capture
+from pyrow.capture import CaptureWriter
+
+
+class CaptureTests(TestCase):
+    """
+    Tests for CaptureWriter and read_records
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'session.pyrf')
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        shutil.rmtree(self.directory)
+
+    def test_read_records(self):
+        """
+        read_records - it should return the records written by CaptureWriter
+        :return:
+        """
+        writer = CaptureWriter(self.path)
+        writer.write(1.5, capture.REQUEST, b'\x01\xf1\x80\x80\xf2')
+        writer.write(1.6, capture.RESPONSE, [1, 0xF1, 0x01, 0x01, 0xF2])
+        writer.close()
+
+        self.assertEqual(list(capture.read_records(self.path, chunk_size=3)), [
+            (1.5, capture.REQUEST, b'\x01\xf1\x80\x80\xf2'),
+            (1.6, capture.RESPONSE, b'\x01\xf1\x01\x01\xf2'),
+        ])
+
+    def test_truncated_record_is_ignored(self):
+        """
+        read_records - it should ignore a record that was not completely written
+        :return:
+        """
+        with open(self.path, 'wb') as capture_file:
+            capture_file.write(capture.encode_records([
+                (1.5, capture.REQUEST, b'\x01\xf1\x80\x80\xf2'),
+                (1.6, capture.RESPONSE, b'\x01\xf1\x01\x01\xf2'),
+            ])[:-1])
+
+        self.assertEqual(len(list(capture.read_records(self.path))), 1)
+
+    def test_not_a_capture_file(self):
+        """
+        read_records - it should raise a ValueError for other files
+        :return:
+        """
+        with open(self.path, 'wb') as capture_file:
+            capture_file.write(b'workout')
+
+        self.assertRaises(ValueError, list, capture.read_records(self.path))
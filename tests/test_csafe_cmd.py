@@ -0,0 +1,158 @@
+"""
+tests.PyRow.CSAFE.CsafeCmdTests
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrow.csafe import framing, sizing
+from pyrow.csafe.cmd import CsafeCmd
+from pyrow.csafe.const import Command
+from pyrow.exceptions import (ByteCountException, ChecksumException, FrameException,
+                              StartFlagException, StopFlagException, TruncatedFrameException)
+from pyrow.response import Response
+
+
+def report(message, checksum=None):
+    """
+    :param [int] message: Status and commands of the response
+    :param int checksum: Defaults to the correct checksum
+    :return [int]: HID report
+    """
+    if checksum is None:
+        checksum = framing.checksum(bytes(message))
+    frame = [0xF1] + list(framing.stuff(bytes(message))) + [checksum, 0xF2]
+    return [0x01] + frame + [0] * (20 - len(frame))
+
+
+class StrictReadTests(TestCase):
+    """
+    Tests for CsafeCmd.read with strict set
+    """
+
+    CADENCE = [0x05, 0xA7, 3, 28, 0, 84]
+
+    def setUp(self):
+        """
+        :return:
+        """
+        CsafeCmd.reset_error_counts()
+
+    def test_read(self):
+        """
+        CsafeCmd.read - it should decode a valid frame the same with or without strict
+        :return:
+        """
+        expected = {Command.CSAFE_GETSTATUS_CMD: [5], Command.CSAFE_GETCADENCE_CMD: [28, 84]}
+
+        self.assertEqual(CsafeCmd.read(report(self.CADENCE), strict=True), expected)
+        self.assertEqual(CsafeCmd.read(report(self.CADENCE)), expected)
+        self.assertEqual(CsafeCmd.get_error_counts(), {})
+
+    def test_checksum(self):
+        """
+        CsafeCmd.read - it should raise a ChecksumException carrying the report and offset
+        :return:
+        """
+        transmission = report(self.CADENCE, checksum=0x00)
+
+        with self.assertRaises(ChecksumException) as context:
+            CsafeCmd.read(transmission, strict=True)
+        self.assertEqual(context.exception.get_transmission(), transmission)
+        self.assertEqual(context.exception.get_offset(), 8)
+
+        self.assertEqual(CsafeCmd.read(transmission), [])
+        self.assertEqual(CsafeCmd.get_error_counts(), {'ChecksumException': 2})
+
+    def test_flags(self):
+        """
+        CsafeCmd.read - it should raise when the start or stop flag is missing
+        :return:
+        """
+        transmission = report(self.CADENCE)
+
+        self.assertRaises(StartFlagException, CsafeCmd.read, [0x01, 0x00] + transmission[2:],
+                          True)
+        self.assertRaises(StopFlagException, CsafeCmd.read, transmission[:9], True)
+        self.assertEqual(CsafeCmd.get_error_counts(),
+                         {'StartFlagException': 1, 'StopFlagException': 1})
+
+    def test_byte_count(self):
+        """
+        CsafeCmd.read - it should only count a mismatched data byte count, even when strict
+        :return:
+        """
+        transmission = report([0x05, 0xA7, 2, 28, 0, 84])
+
+        self.assertEqual(CsafeCmd.read(transmission, strict=True)[Command.CSAFE_GETCADENCE_CMD],
+                         [28, 84])
+        CsafeCmd.read(transmission)
+        self.assertEqual(CsafeCmd.get_error_counts(), {ByteCountException.__name__: 2})
+
+    def test_trailing_stuffing_flag(self):
+        """
+        CsafeCmd.read - it should raise a TruncatedFrameException for a frame that ends in a byte
+        stuffing flag
+        :return:
+        """
+        transmission = [0x01, 0xF1, 0x09, 0xF3, 0xF2] + [0] * 16
+
+        with self.assertRaises(TruncatedFrameException) as context:
+            CsafeCmd.read(transmission, strict=True)
+        self.assertEqual(context.exception.get_offset(), 3)
+
+        self.assertEqual(CsafeCmd.read(transmission), [])
+        self.assertEqual(CsafeCmd.get_error_counts(), {'TruncatedFrameException': 2})
+
+    def test_truncated(self):
+        """
+        CsafeCmd.read - it should raise a TruncatedFrameException for frames that end inside a
+        command or have unknown commands
+        :return:
+        """
+        self.assertRaises(TruncatedFrameException, CsafeCmd.read,
+                          report([0x05, 0xB0, 1, 150, 0xA7, 3, 28]), True)
+        self.assertRaises(TruncatedFrameException, CsafeCmd.read,
+                          report([0x05, 0xFF, 0]), True)
+        self.assertRaises(FrameException, CsafeCmd.read, report([]), True)
+        self.assertEqual(CsafeCmd.get_error_counts(), {'TruncatedFrameException': 3})
+
+
+class ResultsTests(TestCase):
+    """
+    Tests for the results CsafeCmd.read returns
+    """
+
+    def test_names(self):
+        """
+        CsafeCmd.read - it should return results that can be indexed by command name
+        :return:
+        """
+        raw = Response(CsafeCmd.read(report([0x05, 0xB4, 3, 150, 0, 88]))).get_raw()
+
+        self.assertIn('CSAFE_GETPOWER_CMD', raw)
+        self.assertIn(Command.CSAFE_GETPOWER_CMD, raw)
+        self.assertEqual(raw['CSAFE_GETPOWER_CMD'], [150, 88])
+        self.assertEqual(raw['CSAFE_GETSTATUS_CMD'], [5])
+        self.assertEqual(raw.get('CSAFE_GETCADENCE_CMD', []), [])
+        self.assertNotIn('CSAFE_GETCADENCE_CMD', raw)
+        self.assertRaises(KeyError, raw.__getitem__, 'CSAFE_GETCADENCE_CMD')
+        self.assertRaises(KeyError, raw.__getitem__, 'NOT_A_COMMAND')
+
+    def test_model(self):
+        """
+        CsafeCmd.read - it should teach the response size to the given model only
+        :return:
+        """
+        transmission = report([0x05, 0xB4, 3, 0xF0, 0xF1, 0xF2])
+        model = sizing.ResponseSizeModel(tail=1.)
+        commands = [Command.CSAFE_GETPOWER_CMD]
+        self.assertEqual(model.get_response_size(commands), 10)
+
+        with patch.object(sizing.MODEL, 'observe') as observe:
+            CsafeCmd.read(transmission, model=None)
+            CsafeCmd.read(transmission, model=model)
+            observe.assert_not_called()
+            CsafeCmd.read(transmission)
+            self.assertEqual(observe.call_count, 1)
+
+        self.assertEqual(model.get_response_size(commands), 13)
@@ -0,0 +1,69 @@
+"""
+tests.PyRow.Concept2.DeltaTests
+"""
+from unittest import TestCase
+
+from pyrow import delta
+from pyrow.delta import DeltaDecoder, DeltaEncoder
+
+
+class DeltaEncodingTests(TestCase):
+    """
+    Tests for DeltaEncoder and DeltaDecoder
+    """
+
+    def test_round_trip(self):
+        """
+        DeltaDecoder.feed - it should decode the samples written by DeltaEncoder
+        :return:
+        """
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        first = delta.to_integers((1.5, 100.5, 24, 150, 0.25, 10, None, 5, 2, 1))
+        second = delta.to_integers((2.0, 104.0, 25, 150, 0.25, 10, None, 5, 4, 1))
+
+        out = bytearray()
+        encoder.encode('400124190', 100.0, first, out)
+        encoder.encode('400124190', 100.5, second, out)
+
+        samples = decoder.feed(bytes(out[:3]))
+        samples.extend(decoder.feed(bytes(out[3:])))
+
+        self.assertEqual(len(samples), 2)
+        self.assertEqual(samples[0].serial_number, '400124190')
+        self.assertEqual(samples[0].distance, 100.5)
+        self.assertEqual(samples[1].timestamp, 100.5)
+        self.assertEqual(samples[1].time, 2.0)
+        self.assertEqual(samples[1].stroke_state, 4)
+        self.assertIsNone(samples[1].heartrate)
+        self.assertEqual(samples[1].calories, 10)
+
+    def test_zero(self):
+        """
+        DeltaDecoder.feed - it should tell fields that are zero from fields that are not known
+        :return:
+        """
+        encoder = DeltaEncoder()
+        out = bytearray()
+        encoder.encode('400124190', 1.0, (0, None, 0, None, 0, 0, None, 5, 0, 0), out)
+
+        sample = DeltaDecoder().feed(bytes(out))[0]
+
+        self.assertEqual((sample.time, sample.spm, sample.status), (0, 0, 5))
+        self.assertIsNone(sample.distance)
+        self.assertIsNone(sample.heartrate)
+
+    def test_unchanged_fields_are_not_sent(self):
+        """
+        DeltaEncoder.encode - it should only send the fields that changed
+        :return:
+        """
+        encoder = DeltaEncoder()
+        values = delta.to_integers((1.5, 100.5, 24, 150, 0.25, 10, 120, 5, 2, 1))
+        first = bytearray()
+        encoder.encode('400124190', 100.0, values, first)
+        second = bytearray()
+        encoder.encode('400124190', 100.0, values, second)
+
+        # Length, type, erg id, timestamp delta, empty bitmap
+        self.assertEqual(bytes(second), bytes([4, delta.MESSAGE_SAMPLE, 0, 0, 0]))
@@ -0,0 +1,103 @@
+"""
+tests.PyRow.Concept2.ForceCurveTests
+"""
+from unittest import TestCase
+
+from pyrow.force_curve import ForceCurve, ForceCurveAssembler
+from pyrow.response import Response
+
+
+def force_plot_response(stroke_state, points):
+    """
+    :param int stroke_state:
+    :param [int] points:
+    :return Response:
+    """
+    return Response({
+        'CSAFE_PM_GET_FORCEPLOTDATA': [len(points) * 2] + points + [0] * (16 - len(points)),
+        'CSAFE_PM_GET_STROKESTATE': [stroke_state],
+    })
+
+
+class ForceCurveTests(TestCase):
+    """
+    Tests for ForceCurve
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.curve = ForceCurve(capacity=8, sample_interval=0.5)
+        self.curve.extend([0, 10, 30])
+        self.curve.extend([20])
+
+    def test_statistics(self):
+        """
+        ForceCurve - it should keep the statistics of the points added so far
+        :return:
+        """
+        self.assertEqual(list(self.curve.get_points()), [0, 10, 30, 20])
+        self.assertEqual(self.curve.get_length(), 4)
+        self.assertEqual(self.curve.get_drive_time(), 2.)
+        self.assertEqual(self.curve.get_peak_force(), 30)
+        self.assertEqual(self.curve.get_average_force(), 15)
+        self.assertEqual(self.curve.get_impulse(), (5 + 20 + 25) * 0.5)
+        self.assertAlmostEqual(self.curve.get_peak_position(), 2 / 3.)
+        self.assertEqual(self.curve.get_shape_ratio(), 0.5)
+
+    def test_capacity(self):
+        """
+        ForceCurve.extend - it should drop points that do not fit into the buffer
+        :return:
+        """
+        self.curve.extend(range(10))
+
+        self.assertEqual(self.curve.get_length(), 8)
+        self.assertEqual(self.curve.get_dropped(), 6)
+
+    def test_clear(self):
+        """
+        ForceCurve.clear - it should empty the curve
+        :return:
+        """
+        self.curve.clear()
+
+        self.assertEqual(self.curve.get_length(), 0)
+        self.assertIsNone(self.curve.get_peak_force())
+        self.assertEqual(self.curve.get_impulse(), 0)
+
+    def test_resample(self):
+        """
+        ForceCurve.resample - it should interpolate the curve onto a fixed number of points
+        :return:
+        """
+        self.assertEqual(list(self.curve.resample(7)), [0, 5, 10, 20, 30, 25, 20])
+        self.assertEqual(list(ForceCurve().resample(2)), [0, 0])
+
+
+class ForceCurveAssemblerTests(TestCase):
+    """
+    Tests for ForceCurveAssembler
+    """
+
+    def test_update(self):
+        """
+        ForceCurveAssembler.update - it should return a curve once the drive is complete
+        :return:
+        """
+        assembler = ForceCurveAssembler()
+
+        self.assertIsNone(assembler.update(force_plot_response(4, [])))
+        self.assertIsNone(assembler.update(force_plot_response(2, [10, 20])))
+        self.assertIsNone(assembler.update(force_plot_response(2, [40])))
+        self.assertIsNone(assembler.update(force_plot_response(4, [30])))
+
+        curve = assembler.update(force_plot_response(4, []))
+
+        self.assertEqual(list(curve.get_points()), [10, 20, 40, 30])
+        self.assertIsNone(assembler.update(force_plot_response(4, [])))
+
+        assembler.update(force_plot_response(2, [5]))
+        self.assertEqual(list(assembler.update(force_plot_response(3, [])).get_points()), [5])
+        self.assertEqual(list(curve.get_points()), [10, 20, 40, 30])
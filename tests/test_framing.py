@@ -0,0 +1,164 @@
+"""
+tests.PyRow.CSAFE.FramingTests
+"""
+import random
+from unittest import TestCase
+
+from pyrow.csafe import framing
+
+
+def reference_stuff(message):
+    """
+    Checksum and byte stuffing loop CsafeCmd.write used before the framing module
+    :param [int] message:
+    :return ([int], int):
+    """
+    message = list(message)
+    checksum = 0x0
+    j = 0
+    while j < len(message):
+        checksum = checksum ^ message[j]
+        if 0xF0 <= message[j] <= 0xF3:
+            message.insert(j, 0xF3)
+            j += 1
+            message[j] &= 0x3
+        j += 1
+    return message, checksum
+
+
+def reference_unstuff(message):
+    """
+    Unstuffing and checksum loop CsafeCmd read frames with before the framing module
+    :param [int] message:
+    :return ([int], int):
+    """
+    message = list(message)
+    i = 0
+    checksum = 0
+    while i < len(message):
+        if message[i] == 0xF3:
+            stuff_value = message.pop(i + 1)
+            message[i] = 0xF0 | stuff_value
+        checksum = checksum ^ message[i]
+        i += 1
+    return message, checksum
+
+
+def random_message(rand, flags=False):
+    """
+    :param random.Random rand:
+    :param bool flags: Mostly frame flags, to exercise the stuffing
+    :return bytes:
+    """
+    length = rand.randint(0, 130)
+    if flags:
+        return bytes(rand.choice([0x00, 0x03, 0xF0, 0xF1, 0xF2, 0xF3]) for _ in range(length))
+    return bytes(rand.randint(0, 0xFF) for _ in range(length))
+
+
+class FramingTests(TestCase):
+    """
+    Fuzz tests of the framing module against the loops it replaced
+    """
+
+    RUNS = 2000
+
+    def test_checksum(self):
+        """
+        checksum - it should match the byte by byte XOR for every length
+        :return:
+        """
+        rand = random.Random(43)
+        for length in range(140):
+            data = bytes(rand.randint(0, 0xFF) for _ in range(length))
+            self.assertEqual(framing.checksum(data), reference_stuff(data)[1])
+
+    def test_stuff(self):
+        """
+        stuff - it should produce the same bytes as the old stuffing loop
+        :return:
+        """
+        rand = random.Random(1)
+        for run in range(self.RUNS):
+            data = random_message(rand, run % 2 == 0)
+            self.assertEqual(list(framing.stuff(data)), reference_stuff(data)[0], data)
+
+    def test_unstuff(self):
+        """
+        unstuff - it should reverse stuff and match the old unstuffing loop
+        :return:
+        """
+        rand = random.Random(2)
+        for run in range(self.RUNS):
+            data = random_message(rand, run % 2 == 0)
+            stuffed = framing.stuff(data)
+            self.assertEqual(framing.unstuff(stuffed), data)
+            self.assertEqual(list(framing.unstuff(stuffed)), reference_unstuff(stuffed)[0])
+
+    def test_unstuff_malformed(self):
+        """
+        unstuff - it should match the old loop when a stuffing flag is followed by other bytes
+        :return:
+        """
+        rand = random.Random(3)
+        for _ in range(self.RUNS):
+            data = random_message(rand, True)
+            # A trailing stuffing flag has no byte to pop, as before
+            try:
+                expected = reference_unstuff(data)[0]
+            except IndexError:
+                self.assertRaises(IndexError, framing.unstuff, data)
+                continue
+            self.assertEqual(list(framing.unstuff(data)), expected, data)
+
+    def test_received_checksum(self):
+        """
+        checksum - it should be 0 for a received frame with its checksum byte
+        :return:
+        """
+        rand = random.Random(4)
+        for _ in range(200):
+            data = random_message(rand)
+            stuffed = framing.stuff(data) + bytes([framing.checksum(data)])
+            self.assertEqual(framing.checksum(framing.unstuff(stuffed)), 0)
+            self.assertEqual(reference_unstuff(stuffed)[1], 0)
+
+
+class AddressTests(TestCase):
+    """
+    Tests for extended frame addressing
+    """
+
+    STATUS = [0x01, 0xF1, 0x80, 0x80, 0xF2] + [0] * 16
+
+    def test_address(self):
+        """
+        address - it should turn a standard frame into an extended frame to the destination
+        :return:
+        """
+        report = framing.address(self.STATUS, 0x02)
+
+        self.assertEqual(report[:8], [0x01, 0xF0, 0x02, 0x00, 0x80, 0x80, 0xF2, 0])
+        self.assertEqual(len(report), 21)
+        self.assertEqual(framing.get_addresses(report), (0x02, 0x00))
+        self.assertIsNone(framing.get_addresses(self.STATUS))
+
+    def test_address_report_size(self):
+        """
+        address - it should move the frame to a larger report when it no longer fits
+        :return:
+        """
+        report = [0x01, 0xF1] + [0x80] * 18 + [0xF2]
+        addressed = framing.address(report, 0x02)
+
+        self.assertEqual(addressed[0], 0x04)
+        self.assertEqual(len(addressed), 63)
+
+    def test_invalid_address(self):
+        """
+        address - it should refuse addresses that would be read as frame flags
+        :return:
+        """
+        self.assertRaises(ValueError, framing.address, self.STATUS, 0xF1)
+        self.assertRaises(ValueError, framing.address, self.STATUS, 0x100)
+        self.assertRaises(ValueError, framing.address, framing.address(self.STATUS, 1), 2)
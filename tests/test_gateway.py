@@ -0,0 +1,177 @@
+"""
+tests.PyRow.Concept2.GatewayTests
+"""
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from pyrow import gateway
+from pyrow.exceptions import GatewayException
+from pyrow.gateway import Gateway, GatewayClient
+from pyrow.response import Response
+
+
+class FakePerformanceMonitor(object):
+    """
+    PerformanceMonitor that holds each frame until released
+    """
+
+    def __init__(self, serial_number):
+        self.serial_number = serial_number
+        self.release = threading.Event()
+        self.frames = 0
+        self.set_workout = MagicMock()
+
+    def get_serial_number(self):
+        return self.serial_number
+
+    def send_commands(self, commands):
+        self.release.wait(5)
+        self.frames += 1
+        return Response({'CSAFE_GETSTATUS_CMD': [5], 'COMMANDS': commands})
+
+    def get_monitor(self, force_plot=False, extra_metrics=False, heartbeat=False):
+        return self.send_commands(['SCREEN', force_plot, extra_metrics, heartbeat])
+
+
+class CodecTests(TestCase):
+    """
+    Tests for encode_value and decode_value
+    """
+
+    def test_round_trip(self):
+        """
+        decode_value - it should decode the values written by encode_value
+        :return:
+        """
+        value = {'CSAFE_GETID_CMD': ['12345'], 'a': [None, True, False, -3, 1.5, {}]}
+        out = bytearray()
+        gateway.encode_value(value, out)
+
+        self.assertEqual(gateway.decode_value(bytes(out)), (value, len(out)))
+
+
+class GatewayTests(TestCase):
+    """
+    Tests for Gateway and GatewayClient
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.erg = FakePerformanceMonitor('400124190')
+        self.gateway = Gateway([self.erg], ('127.0.0.1', 0))
+        self.gateway.start()
+        self.client = GatewayClient(self.gateway.get_address(), timeout=5)
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        self.erg.release.set()
+        self.client.close()
+        self.gateway.close()
+
+    def test_send_commands(self):
+        """
+        GatewayClient.send_commands - it should return the erg's Response
+        :return:
+        """
+        self.erg.release.set()
+
+        self.assertEqual(self.client.list_ergs(), ['400124190'])
+        response = self.client.send_commands('400124190', ['CSAFE_GETSTATUS_CMD'])
+        self.assertEqual(response.get_status(), 5)
+        self.assertEqual(response.get_raw()['COMMANDS'], ['CSAFE_GETSTATUS_CMD'])
+
+    def test_duplicate_queries_are_merged(self):
+        """
+        Gateway - it should send identical concurrent queries to the erg once
+        :return:
+        """
+        other = GatewayClient(self.gateway.get_address(), timeout=5)
+        first = self.client.submit(gateway.OP_GET_MONITOR, ['400124190', True, False, False])
+        second = other.submit(gateway.OP_GET_MONITOR, ['400124190', True, False, False])
+        while self.gateway.get_merged_count() == 0:
+            threading.Event().wait(0.001)
+        self.erg.release.set()
+
+        self.assertEqual(first.result(5).get_raw(), second.result(5).get_raw())
+        self.assertEqual(self.erg.frames, 1)
+        other.close()
+
+    def test_writes_are_not_merged(self):
+        """
+        Gateway - it should send every command that changes the erg
+        :return:
+        """
+        self.erg.release.set()
+        futures = [self.client.submit(gateway.OP_SEND_COMMANDS,
+                                      ['400124190', ['CSAFE_GOIDLE_CMD']]) for _ in range(3)]
+        for future in futures:
+            future.result(5)
+
+        self.assertEqual(self.erg.frames, 3)
+
+    def test_set_workout(self):
+        """
+        GatewayClient.set_workout - it should set the workout on the erg
+        :return:
+        """
+        self.client.set_workout('400124190', distance=2000, split=100)
+
+        self.erg.set_workout.assert_called_once_with(distance=2000, split=100)
+
+    def test_unknown_erg(self):
+        """
+        GatewayClient - it should raise a GatewayException for an unknown erg
+        :return:
+        """
+        self.assertRaises(GatewayException, self.client.send_commands, '1', [])
+
+    def test_unix_socket(self):
+        """
+        Gateway - it should serve clients on a Unix socket
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'gateway.sock')
+        unix_gateway = Gateway([self.erg], path)
+        unix_gateway.start()
+        client = GatewayClient(path, timeout=5)
+
+        self.assertEqual(client.list_ergs(), ['400124190'])
+
+        client.close()
+        unix_gateway.close()
+
+    def test_decode_error(self):
+        """
+        GatewayClient - it should fail every request in flight with the error of a reply it
+        cannot decode
+        :return:
+        """
+        futures = [
+            self.client.submit(gateway.OP_SEND_COMMANDS, ['400124190', ['CSAFE_GETSTATUS_CMD']]),
+            self.client.submit(gateway.OP_GET_MONITOR, ['400124190', False, False, False]),
+        ]
+        with patch.object(gateway, 'decode_response', side_effect=ValueError('Bad reply')):
+            self.erg.release.set()
+            for future in futures:
+                self.assertRaisesRegex(ValueError, 'Bad reply', future.result, 5)
+
+        self.assertRaises(GatewayException, self.client.submit, gateway.OP_LIST, [])
+
+    def test_no_unix_sockets(self):
+        """
+        Gateway - it should raise a ValueError for a path where Unix sockets are not available
+        :return:
+        """
+        with patch.object(gateway, '_UnixServer', None):
+            self.assertRaises(ValueError, Gateway, [self.erg], 'gateway.sock')
+            self.assertRaises(ValueError, GatewayClient, 'gateway.sock')
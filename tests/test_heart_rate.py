@@ -0,0 +1,92 @@
+"""
+tests.PyRow.Concept2.HeartRateTests
+"""
+import math
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow.heart_rate import HeartRateChannel, HeartRateSeries
+from pyrow.response import Response
+
+
+def rmssd(intervals):
+    """
+    :param [float] intervals:
+    :return float:
+    """
+    differences = [(b - a) ** 2 for a, b in zip(intervals, intervals[1:])]
+    return math.sqrt(sum(differences) / len(differences))
+
+
+class HeartRateSeriesTests(TestCase):
+    """
+    Tests for HeartRateSeries
+    """
+
+    def test_heart_rate(self):
+        """
+        HeartRateSeries.get_heart_rate - it should return the beats per minute of the window
+        :return:
+        """
+        series = HeartRateSeries(4)
+        self.assertIsNone(series.get_heart_rate())
+
+        series.extend([1000, 1000, 500, 500])
+
+        self.assertEqual(series.get_heart_rate(), 80.)
+
+    def test_rolling_window(self):
+        """
+        HeartRateSeries - it should only keep the last window intervals
+        :return:
+        """
+        intervals = [800, 810, 790, 850, 700, 760, 820, 805, 795, 900]
+        series = HeartRateSeries(4)
+        series.extend(intervals)
+
+        self.assertEqual(series.get_intervals(), intervals[-4:])
+        self.assertAlmostEqual(series.get_rmssd(), rmssd(intervals[-4:]))
+        self.assertAlmostEqual(series.get_heart_rate(), 60000. / (sum(intervals[-4:]) / 4.))
+        self.assertEqual(series.get_beats(), 10)
+
+    def test_artifacts(self):
+        """
+        HeartRateSeries.add - it should reject intervals that cannot be heartbeats
+        :return:
+        """
+        series = HeartRateSeries()
+
+        self.assertFalse(series.add(0))
+        self.assertFalse(series.add(5000))
+        self.assertTrue(series.add(800))
+        self.assertEqual(series.get_rejected(), 2)
+        self.assertIsNone(series.get_rmssd())
+
+
+class HeartRateChannelTests(TestCase):
+    """
+    Tests for HeartRateChannel
+    """
+
+    def test_update(self):
+        """
+        HeartRateChannel.update - it should add the heartbeat data of each erg to its series
+        :return:
+        """
+        channel = HeartRateChannel(8)
+        listener = MagicMock()
+        channel.add_listener(listener)
+
+        channel.update('1', Response({
+            'CSAFE_GETHRCUR_CMD': [70],
+            'CSAFE_PM_GET_HEARTBEATDATA': [6, 1000, 1000, 1000, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+                                           0, 0]
+        }))
+        channel.update('2', Response({'CSAFE_GETHRCUR_CMD': [90]}))
+
+        self.assertEqual(channel.get_series('1').get_intervals(), [1000, 1000, 1000])
+        self.assertEqual(channel.get_heart_rate('1'), 60.)
+        self.assertEqual(channel.get_rmssd('1'), 0.)
+        self.assertEqual(channel.get_heart_rate('2'), 90)
+        self.assertIsNone(channel.get_rmssd('2'))
+        listener.assert_called_once_with('1', channel.get_series('1'))
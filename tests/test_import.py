@@ -0,0 +1,43 @@
+"""
+tests.PyRow.Concept2.ImportTests
+"""
+import subprocess
+import sys
+from unittest import TestCase
+
+
+def run(code):
+    """
+    Runs code in a fresh interpreter
+    :param string code:
+    :return string: stdout
+    """
+    return subprocess.check_output([sys.executable, '-c', code], universal_newlines=True)
+
+
+class ImportTests(TestCase):
+    """
+    Tests for what gets loaded on import
+    """
+
+    def test_usb_is_loaded_lazily(self):
+        """
+        pyrow.performance_monitor - it should not import pyusb until a device is accessed
+        :return:
+        """
+        self.assertEqual(
+            run('import sys, pyrow.performance_monitor; print("usb" in sys.modules)'),
+            'False\n'
+        )
+
+    def test_tables_are_built_lazily(self):
+        """
+        pyrow.csafe.const - it should only build the command tables on first access
+        :return:
+        """
+        self.assertEqual(
+            run('from pyrow.csafe import const; import pyrow.csafe.cmd; '
+                'print(const._CMDS is None); const.get_cmds(); print(const._CMDS is None); '
+                'print(const.CMDS is const.get_cmds())'),
+            'True\nFalse\nTrue\n'
+        )
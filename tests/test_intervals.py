@@ -0,0 +1,129 @@
+"""
+tests.PyRow.Concept2.IntervalsTests
+"""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow import intervals
+from pyrow.intervals import IntervalTracker
+from pyrow.response import Response
+
+
+def sample(state, distance=None, power=None, rest_time=None):
+    """
+    :param int state: Workout state
+    :param float distance: Metres
+    :param int power: Watts
+    :param int rest_time: Seconds
+    :return Response:
+    """
+    results = {'CSAFE_PM_GET_WORKOUTSTATE': [state]}
+    if distance is not None:
+        results['CSAFE_PM_GET_WORKDISTANCE'] = [int(distance * 10), 0]
+    if power is not None:
+        results['CSAFE_GETPOWER_CMD'] = [power, 88]
+    if rest_time is not None:
+        results['CSAFE_PM_GET_RESTTIME'] = [rest_time]
+    return Response(results)
+
+
+class IntervalTrackerTests(TestCase):
+    """
+    Tests for IntervalTracker
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.tracker = IntervalTracker(work_delay=.1, rest_delay=1., wake_before=5.)
+
+    def test_transitions(self):
+        """
+        IntervalTracker.update - it should end an interval when the erg starts or stops resting
+        :return:
+        """
+        listener = MagicMock()
+        self.tracker.add_listener(listener)
+        work = intervals.WORKOUT_STATE_INTERVAL_WORK_DISTANCE
+        rest = intervals.WORKOUT_STATE_INTERVAL_REST
+
+        self.assertIsNone(self.tracker.update('1', sample(work, 500, 200), 0.))
+        self.assertIsNone(self.tracker.update('1', sample(work, 250, 300), 50.))
+        self.assertIsNone(self.tracker.update('1', sample(work, 0, 250), 100.))
+        first = self.tracker.update('1', sample(rest, rest_time=60), 101.)
+        self.tracker.update('1', sample(rest, rest_time=30), 131.)
+        rest_interval = self.tracker.update('1', sample(work, 500, 100), 161.)
+
+        self.assertEqual(first.number, 1)
+        self.assertFalse(first.resting)
+        self.assertEqual(first.distance, 500)
+        self.assertEqual(first.average_power, 250)
+        self.assertEqual(first.max_power, 300)
+        self.assertEqual((first.start, first.end, first.samples), (0., 100., 3))
+        self.assertTrue(rest_interval.resting)
+        self.assertEqual(rest_interval.number, 1)
+        self.assertEqual(self.tracker.get_current('1').number, 2)
+        self.assertEqual(self.tracker.get_intervals('1'), [first, rest_interval])
+        self.assertEqual(listener.call_count, 2)
+
+    def test_without_workout_state(self):
+        """
+        IntervalTracker.update - it should ignore responses without the workout state
+        :return:
+        """
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_WORK_TIME, 100), 0.)
+
+        self.assertIsNone(self.tracker.update('1', Response({'CSAFE_GETSTATUS_CMD': [5]}), 10.))
+
+        current = self.tracker.get_current('1')
+        self.assertEqual((current.end, current.samples), (0., 1))
+
+    def test_end(self):
+        """
+        IntervalTracker.update - it should end the last interval when the workout ends
+        :return:
+        """
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_WORK_TIME, 100), 0.)
+        last = self.tracker.update('1', sample(intervals.WORKOUT_STATE_END), 10.)
+
+        self.assertEqual(last.number, 1)
+        self.assertIsNone(self.tracker.get_current('1'))
+
+    def test_poll_delay(self):
+        """
+        IntervalTracker.get_poll_delay - it should slow down during rest until it nearly ends
+        :return:
+        """
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_WORK_TIME), 0.)
+        self.assertEqual(self.tracker.get_poll_delay('1'), .1)
+
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_REST, rest_time=60), 1.)
+        self.assertTrue(self.tracker.is_resting('1'))
+        self.assertEqual(self.tracker.get_poll_delay('1'), 1.)
+
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_REST, rest_time=6), 2.)
+        self.assertAlmostEqual(self.tracker.get_poll_delay('1'), 1.)
+
+        self.tracker.update('1', sample(intervals.WORKOUT_STATE_INTERVAL_REST, rest_time=5), 3.)
+        self.assertEqual(self.tracker.get_poll_delay('1'), .1)
+
+    def test_poll(self):
+        """
+        IntervalTracker.poll - it should only poll the ergs that are due
+        :return:
+        """
+        working = MagicMock()
+        working.get_serial_number.return_value = '1'
+        working.send_commands.return_value = sample(intervals.WORKOUT_STATE_ROW)
+        resting = MagicMock()
+        resting.get_serial_number.return_value = '2'
+        resting.send_commands.return_value = sample(intervals.WORKOUT_STATE_INTERVAL_REST,
+                                                    rest_time=60)
+
+        self.assertAlmostEqual(self.tracker.poll([working, resting], 0.), .1)
+        self.tracker.poll([working, resting], .1)
+
+        self.assertEqual(working.send_commands.call_count, 2)
+        self.assertEqual(resting.send_commands.call_count, 1)
+        resting.send_commands.assert_called_with(intervals.POLL_COMMANDS)
@@ -0,0 +1,103 @@
+"""
+tests.PyRow.LogTests
+"""
+import logging
+from unittest import TestCase
+
+from pyrow import log
+from pyrow.log import RateLimitedLog
+
+
+class RecordHandler(logging.Handler):
+    """
+    Keeps the records it handles
+    """
+
+    def __init__(self):
+        """
+        :return:
+        """
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        """
+        :param LogRecord record:
+        :return:
+        """
+        self.records.append(record)
+
+
+class RateLimitedLogTests(TestCase):
+    """
+    Tests for RateLimitedLog
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.logger = logging.getLogger('pyrow.test')
+        self.logger.setLevel(logging.WARNING)
+        self.handler = RecordHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_loggers(self):
+        """
+        log - it should name a logger per layer under pyrow
+        :return:
+        """
+        self.assertEqual(log.USB.name, 'pyrow.usb')
+        self.assertEqual(log.CSAFE.name, 'pyrow.csafe')
+        self.assertEqual(log.PM.name, 'pyrow.pm')
+        self.assertTrue(any(isinstance(handler, logging.NullHandler)
+                            for handler in log.ROOT.handlers))
+
+    def test_limit(self):
+        """
+        RateLimitedLog.log - it should log the first message of a key and suppress the rest within
+        the interval
+        :return:
+        """
+        warnings = RateLimitedLog(self.logger, interval=3600.)
+
+        self.assertTrue(warnings.warning('checksum', 'Bad checksum from %s', 'PM1'))
+        self.assertFalse(warnings.warning('checksum', 'Bad checksum from %s', 'PM1'))
+        self.assertTrue(warnings.error('length', 'Bad length'))
+
+        self.assertEqual([record.getMessage() for record in self.handler.records],
+                         ['Bad checksum from PM1', 'Bad length'])
+
+    def test_suppressed(self):
+        """
+        RateLimitedLog.log - it should add the number of suppressed messages once the interval
+        has passed
+        :return:
+        """
+        limited = RateLimitedLog(self.logger, interval=3600.)
+        limited.warning('checksum', 'Bad checksum')
+        limited.warning('checksum', 'Bad checksum')
+        limited.warning('checksum', 'Bad checksum')
+        limited._RateLimitedLog__interval = 0.
+        limited.warning('checksum', 'Bad checksum')
+
+        self.assertEqual(self.handler.records[-1].getMessage(),
+                         'Bad checksum (2 similar messages suppressed)')
+
+    def test_disabled(self):
+        """
+        RateLimitedLog.log - it should not log or count messages below the logger level
+        :return:
+        """
+        warnings = RateLimitedLog(self.logger)
+
+        self.assertFalse(warnings.log(logging.DEBUG, 'poll', 'Polled'))
+        self.assertTrue(warnings.warning('poll', 'Polled'))
+        self.assertEqual(len(self.handler.records), 1)
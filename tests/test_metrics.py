@@ -0,0 +1,109 @@
+"""
+tests.PyRow.Concept2.MetricsTests
+"""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow import metrics
+from pyrow.metrics import MetricsEngine, WindowedAverage
+from pyrow.response import Response
+
+
+class ConversionTests(TestCase):
+    """
+    Tests for the pace and power conversions
+    """
+
+    def test_pace_to_watts(self):
+        """
+        pace_to_watts - it should convert a 500m pace to watts
+        :return:
+        """
+        self.assertEqual(metrics.pace_to_watts(120), 203)
+        self.assertAlmostEqual(metrics.watts_to_pace(2.8 / (120 / 500.) ** 3), 120)
+        self.assertIsNone(metrics.watts_to_pace(0))
+
+    def test_calorie_pace_to_watts(self):
+        """
+        calorie_pace_to_watts - it should convert calories per hour to watts
+        :return:
+        """
+        self.assertEqual(metrics.calorie_pace_to_watts(1000), 203)
+
+
+class WindowedAverageTests(TestCase):
+    """
+    Tests for WindowedAverage
+    """
+
+    def test_get(self):
+        """
+        WindowedAverage.get - it should average the values inside the window
+        :return:
+        """
+        average = WindowedAverage(10)
+        self.assertIsNone(average.get())
+
+        average.add(0, 10)
+        average.add(5, 20)
+        self.assertEqual(average.get(), 15)
+
+        average.add(12, 30)
+        self.assertEqual(average.get(), 25)
+
+
+class MetricsEngineTests(TestCase):
+    """
+    Tests for MetricsEngine
+    """
+
+    def test_update(self):
+        """
+        MetricsEngine.update - it should return a snapshot of the derived metrics
+        :return:
+        """
+        engine = MetricsEngine(window=10, alpha=0.5)
+        engine.update('400124190', Response({'CSAFE_GETCADENCE_CMD': [20, 0],
+                                             'CSAFE_GETPOWER_CMD': [100, 0]}), 0)
+        snapshot = engine.update('400124190', Response({'CSAFE_GETCADENCE_CMD': [30, 0]}), 1)
+
+        self.assertEqual(snapshot.spm, 30)
+        self.assertEqual(snapshot.power, 100)
+        self.assertEqual(snapshot.average_spm, 25)
+        self.assertEqual(snapshot.ewma_spm, 25)
+        self.assertAlmostEqual(snapshot.pace_500, metrics.watts_to_pace(100))
+        self.assertEqual(snapshot.samples, 2)
+        self.assertEqual(engine.get_snapshot('400124190'), snapshot)
+        self.assertIsNone(engine.get_snapshot('400124191'))
+
+    def test_projected_finish(self):
+        """
+        MetricsEngine.update - it should project the finish time of distance pieces
+        :return:
+        """
+        engine = MetricsEngine()
+        response = Response({'CSAFE_PM_GET_WORKTIME': [6000, 0],
+                             'CSAFE_PM_GET_WORKDISTANCE': [10000, 0],
+                             'CSAFE_GETPACE_CMD': [240, 0]})
+
+        self.assertIsNone(engine.update('400124190', response, 0).projected_finish)
+
+        engine.set_distance_piece('400124190')
+
+        self.assertEqual(engine.update('400124190', response, 1).projected_finish, 300)
+
+    def test_subscribe(self):
+        """
+        MetricsEngine.subscribe - it should call subscribers with each snapshot of the erg
+        :return:
+        """
+        engine = MetricsEngine()
+        callback = MagicMock()
+        engine.subscribe('400124190', callback)
+
+        snapshot = engine.update('400124190', Response({}))
+        engine.update('400124191', Response({}))
+        engine.unsubscribe('400124190', callback)
+        engine.update('400124190', Response({}))
+
+        callback.assert_called_once_with(snapshot)
@@ -0,0 +1,94 @@
+"""
+tests.PyRow.CSAFE.PackingTests
+"""
+from unittest import TestCase
+
+from pyrow.csafe import const, packing, sizing
+from pyrow.csafe.const import Command
+
+SCREEN = [Command.CSAFE_PM_GET_WORKTIME, Command.CSAFE_GETCADENCE_CMD,
+          Command.CSAFE_PM_GET_WORKDISTANCE, Command.CSAFE_GETPOWER_CMD]
+FORCE_PLOT = [Command.CSAFE_PM_GET_FORCEPLOTDATA, 32, Command.CSAFE_PM_GET_STROKESTATE]
+HEARTBEAT = [Command.CSAFE_PM_GET_HEARTBEATDATA, 32]
+STROKE_STATS = [Command.CSAFE_PM_GET_STROKESTATS, 32, Command.CSAFE_PM_GET_STROKESTATE]
+
+
+def frame_sizes(frame):
+    """
+    :param [] frame: Commands and their arguments of one frame
+    :return (int, int): Worst case request and estimated response sizes
+    """
+    commands = list(const.iter_commands(frame))
+    wrappers = packing.WRAPPER_BYTES if any(map(packing.is_wrapped, commands)) else 0
+    request = packing.FRAME_BYTES + 1 + wrappers + sum(map(packing.request_size, commands))
+    return request, sizing.MODEL.get_response_size(commands)
+
+
+class PackingTests(TestCase):
+    """
+    Tests for pack and PackingPlan
+    """
+
+    def test_single_frame(self):
+        """
+        pack - it should keep commands that fit in one frame, with the wrapped commands together
+        :return:
+        """
+        frames = packing.pack(SCREEN)
+
+        self.assertEqual(frames, [[
+            Command.CSAFE_GETCADENCE_CMD, Command.CSAFE_GETPOWER_CMD,
+            Command.CSAFE_PM_GET_WORKTIME, Command.CSAFE_PM_GET_WORKDISTANCE
+        ]])
+
+    def test_split(self):
+        """
+        pack - it should split queries into the fewest frames that fit the largest report
+        :return:
+        """
+        commands = SCREEN + FORCE_PLOT + STROKE_STATS + HEARTBEAT
+        frames = packing.pack(commands)
+
+        self.assertEqual(len(frames), 2)
+        for frame in frames:
+            for size in frame_sizes(frame):
+                self.assertLessEqual(size, packing.MAX_REPORT)
+
+        sent = [command for frame in frames for command in frame]
+        self.assertEqual(sent.count(Command.CSAFE_PM_GET_STROKESTATE), 1)
+        self.assertEqual(set(sent), set(commands))
+        # Arguments stay behind their command
+        for frame in frames:
+            for i, command in enumerate(frame):
+                if command in (Command.CSAFE_PM_GET_FORCEPLOTDATA,
+                               Command.CSAFE_PM_GET_HEARTBEATDATA,
+                               Command.CSAFE_PM_GET_STROKESTATS):
+                    self.assertEqual(frame[i + 1], 32)
+
+    def test_ordered(self):
+        """
+        pack - it should keep the order of commands that change the Performance Monitor
+        :return:
+        """
+        commands = []
+        for hour in range(16):
+            commands.extend([Command.CSAFE_SETTIME_CMD, hour, 0, 0])
+        frames = packing.pack(commands)
+
+        self.assertEqual(len(frames), 2)
+        self.assertEqual([command for frame in frames for command in frame], commands)
+
+        commands = [Command.CSAFE_PM_GET_FORCEPLOTDATA, 32, Command.CSAFE_GOIDLE_CMD]
+        self.assertEqual(packing.pack(commands), [commands])
+
+    def test_plan_cache(self):
+        """
+        get_plan - it should reuse the plan of a set of commands with other arguments
+        :return:
+        """
+        plan = packing.get_plan(FORCE_PLOT + HEARTBEAT)
+
+        self.assertIs(packing.get_plan(['CSAFE_PM_GET_FORCEPLOTDATA', 16,
+                                        'CSAFE_PM_GET_STROKESTATE',
+                                        'CSAFE_PM_GET_HEARTBEATDATA', 16]), plan)
+        self.assertEqual(plan.apply(FORCE_PLOT + HEARTBEAT), [FORCE_PLOT + HEARTBEAT])
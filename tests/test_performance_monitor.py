@@ -1,9 +1,12 @@
 """
 tests.PyRow.Concept2.PerformanceMonitorTests
 """
+import os
+import shutil
 import sys
+import tempfile
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from freezegun import freeze_time
 
@@ -31,7 +34,9 @@ sys.modules['usb'].core.find = MagicMock(return_value=[PM3()])
 sys.modules['Lock'] = MagicMock()
 sys.modules['Lock'].acquire = MagicMock()
 
-from pyrow.exceptions import BadStateException, RetryLimitException  # noqa E402
+from pyrow.csafe import const, sizing  # noqa E402
+from pyrow.exceptions import (BadStateException, ChecksumException,  # noqa E402
+                              RetryLimitException, StopFlagException)
 from pyrow.performance_monitor import PerformanceMonitor  # noqa E402
 from pyrow.response import Response  # noqa E402
 
@@ -94,7 +99,7 @@ class PerformanceMonitorTests(TestCase):
         self.performance_monitor.set_clock()
 
         self.performance_monitor.send_commands.assert_called_with(
-            ['CSAFE_SETTIME_CMD', 14, 45, 22, 'CSAFE_SETDATE_CMD', 115, 11, 10]
+            [PerformanceMonitor.SET_TIME, 14, 45, 22, PerformanceMonitor.SET_DATE, 115, 11, 10]
         )
 
     def test_get_manufacturer(self):
@@ -155,6 +160,83 @@ class PerformanceMonitorTests(TestCase):
             Response
         )
 
+    def test_bad_frame(self):
+        """
+        PerformanceMonitor.send_commands - it should send the frame again when the response
+        cannot be decoded, up to FRAME_RETRY_LIMIT times
+        :return:
+        """
+        error = ChecksumException([0x01, 0xF1, 0x05, 0x00, 0xF2], 3, 'Checksum error')
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses([
+            error,
+            {
+                'CSAFE_GETSTATUS_CMD': [5]
+            }
+        ])
+
+        self.assertEqual(self.performance_monitor.get_status().get_status(), 5)
+
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses(
+            [error] * (PerformanceMonitor.FRAME_RETRY_LIMIT + 1)
+        )
+
+        self.assertRaises(ChecksumException, self.performance_monitor.get_status)
+
+    def test_response_overflow(self):
+        """
+        PerformanceMonitor.send_commands - it should ask again in a larger report when the
+        response does not fit the report, and keep the larger size for those commands
+        :return:
+        """
+        commands = [PerformanceMonitor.GET_STATUS, PerformanceMonitor.GET_ERROR_VALUE]
+        csafe_cmd = sys.modules['pyrow.csafe.cmd'].CsafeCmd
+        csafe_cmd.set_responses([
+            StopFlagException([0x01, 0xF1] + [0x00] * 19, 21, 'No Stop Flag found'),
+            {
+                'CSAFE_GETSTATUS_CMD': [5]
+            }
+        ])
+
+        with patch.object(csafe_cmd, 'write', side_effect=[[0x01] * 21, [0x04] * 63]) as write:
+            self.assertEqual(self.performance_monitor.send_commands(commands).get_status(), 5)
+
+        self.assertEqual(write.call_count, 2)
+        self.assertEqual(csafe_cmd.read_call_count, 2)
+        self.assertGreater(sizing.MODEL.get_response_size(commands), 21)
+
+    def test_trace(self):
+        """
+        PerformanceMonitor.enable_trace - it should record each request and response and dump
+        them when a frame keeps failing
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        trace = self.performance_monitor.enable_trace(16, directory)
+        error = ChecksumException([0x01, 0xF1, 0x05, 0x00, 0xF2], 3, 'Checksum error')
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses(
+            [{'CSAFE_GETSTATUS_CMD': [5]}] + [error] * (PerformanceMonitor.FRAME_RETRY_LIMIT + 1)
+        )
+
+        self.performance_monitor.get_status()
+        self.assertEqual(trace.get_count(), 2)
+        self.assertEqual(os.listdir(directory), [])
+
+        self.assertRaises(ChecksumException, self.performance_monitor.get_status)
+        self.assertEqual(len(os.listdir(directory)), 1)
+        self.assertIs(self.performance_monitor.get_trace(), trace)
+
+    def test_frame_gap(self):
+        """
+        PerformanceMonitor.get_frame_gap - it should use MIN_FRAME_GAP if set and the transport's
+        otherwise
+        :return:
+        """
+        self.assertEqual(self.performance_monitor.get_frame_gap(), .050)
+
+        self.performance_monitor.MIN_FRAME_GAP = .2
+        self.assertEqual(self.performance_monitor.get_frame_gap(), .2)
+
     def test_get_status(self):
         """
         PerformanceMonitor.get_status - it should return a Response with the PM's status in
@@ -270,3 +352,155 @@ class PerformanceMonitorTests(TestCase):
             RetryLimitException,
             self.performance_monitor.reset
         )
+
+    def test_add_listener(self):
+        """
+        PerformanceMonitor.add_listener - it should give listeners every Response
+        :return:
+        """
+        listener = MagicMock()
+        self.performance_monitor.add_listener(listener)
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses([
+            {
+                'CSAFE_GETSTATUS_CMD': [2]  # Idle state
+            }
+        ])
+
+        response = self.performance_monitor.send_commands([PerformanceMonitor.GET_STATUS])
+
+        listener.assert_called_once_with('400124190', response)
+
+    def test_get_monitor(self):
+        """
+        PerformanceMonitor.get_monitor - it should poll the screen and the optional groups
+        :return:
+        """
+        self.performance_monitor.send_commands = MagicMock()
+        self.performance_monitor.get_monitor(heartbeat=True)
+        self.performance_monitor.get_monitor()
+
+        self.assertEqual(
+            self.performance_monitor.send_commands.call_args_list[0][0][0],
+            PerformanceMonitor.GET_SCREEN + PerformanceMonitor.GET_HEARTBEAT
+        )
+        self.assertIn(PerformanceMonitor.GET_DRAG_FACTOR, PerformanceMonitor.GET_SCREEN)
+        self.assertIn(PerformanceMonitor.GET_REST_TIME, PerformanceMonitor.GET_SCREEN)
+        self.performance_monitor.send_commands.assert_called_with(PerformanceMonitor.GET_SCREEN)
+
+    def test_get_monitor_full_detail(self):
+        """
+        PerformanceMonitor.get_monitor - it should send every group once, in frames whose
+        responses fit the largest report
+        :return:
+        """
+        self.performance_monitor.send_commands = MagicMock(return_value=Response({}))
+        self.performance_monitor.get_monitor(force_plot=True, extra_metrics=True, heartbeat=True)
+
+        frames = [call[0][0] for call in self.performance_monitor.send_commands.call_args_list]
+        commands = [command for frame in frames for command in const.iter_commands(frame)]
+
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(commands.count(PerformanceMonitor.GET_STROKE_STATE), 1)
+        self.assertEqual(set(commands), set(const.iter_commands(
+            PerformanceMonitor.GET_SCREEN + PerformanceMonitor.GET_FORCE_PLOT +
+            PerformanceMonitor.GET_EXTRA_METRICS + PerformanceMonitor.GET_HEARTBEAT)))
+        for frame in frames:
+            self.assertLessEqual(
+                sizing.MODEL.get_response_size(list(const.iter_commands(frame))),
+                sizing.MAX_REPORT)
+
+    def test_cache(self):
+        """
+        PerformanceMonitor.enable_cache - it should answer repeated queries from the cache
+        until a command is written
+        :return:
+        """
+        cache = self.performance_monitor.enable_cache(10)
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses([
+            {
+                'CSAFE_GETSTATUS_CMD': [5]
+            },
+            {
+                'CSAFE_GOFINISHED_CMD': []
+            },
+            {
+                'CSAFE_GETSTATUS_CMD': [7]
+            }
+        ])
+
+        self.assertEqual(self.performance_monitor.get_status().get_status(), 5)
+        self.assertEqual(self.performance_monitor.get_status().get_status(), 5)
+        self.performance_monitor.send_commands([PerformanceMonitor.GO_FINISHED])
+        self.assertEqual(self.performance_monitor.get_status().get_status(), 7)
+        self.assertEqual(cache.get_stats().hits, 1)
+        self.assertEqual(cache.get_stats().misses, 2)
+
+    def test_set_workout(self):
+        """
+        PerformanceMonitor.set_workout - it should apply a WorkoutPlan of the arguments
+        :return:
+        """
+        self.performance_monitor.apply_workout = MagicMock()
+        workout_time = [30]
+        self.performance_monitor.set_workout(workout_time=workout_time)
+
+        plan = self.performance_monitor.apply_workout.call_args[0][0]
+        self.assertEqual(plan.get_workout_time(), (0, 0, 30))
+        self.assertEqual(workout_time, [30])
+
+    def test_wait_for_interval_workout(self):
+        """
+        PerformanceMonitor.apply_workout - it should only accept an interval workout once the
+        erg reports the workout type and interval of the plan
+        :return:
+        """
+        from pyrow.workout import WORKOUT_FIXED_TIME_INTERVAL, WorkoutPlan
+        plan = WorkoutPlan(workout_time=[30], rest=10)
+        self.performance_monitor.RESET_WAIT_MAX = 0
+        wait_for_workout = self.performance_monitor._PerformanceMonitor__wait_for_workout
+        in_use = {'CSAFE_GETSTATUS_CMD': [PerformanceMonitor.STATE_IN_USE]}
+        sys.modules['pyrow.csafe.cmd'].CsafeCmd.set_responses([
+            in_use,
+            {'CSAFE_PM_GET_WORKOUTTYPE': [0], 'CSAFE_PM_GET_WORKTIME': [3000, 0]},
+            in_use,
+            {'CSAFE_PM_GET_WORKOUTTYPE': [WORKOUT_FIXED_TIME_INTERVAL],
+             'CSAFE_PM_GET_WORKTIME': [2000, 0]},
+            in_use,
+            {'CSAFE_PM_GET_WORKOUTTYPE': [WORKOUT_FIXED_TIME_INTERVAL],
+             'CSAFE_PM_GET_WORKTIME': [3000, 0]},
+        ])
+
+        self.assertFalse(wait_for_workout(plan, max_attempts=2))
+        self.assertTrue(wait_for_workout(plan, max_attempts=1))
+
+    def test_send_packed(self):
+        """
+        PerformanceMonitor.send_packed - it should split commands that do not fit one frame and
+        merge the responses
+        :return:
+        """
+        self.performance_monitor.send_commands = MagicMock(side_effect=[
+            Response({'CSAFE_GETSTATUS_CMD': [5], 'CSAFE_PM_GET_FORCEPLOTDATA': [0]}),
+            Response({'CSAFE_GETSTATUS_CMD': [5], 'CSAFE_PM_GET_HEARTBEATDATA': [0]}),
+        ])
+        response = self.performance_monitor.send_packed(
+            PerformanceMonitor.GET_SCREEN + PerformanceMonitor.GET_FORCE_PLOT +
+            PerformanceMonitor.GET_HEARTBEAT
+        )
+
+        self.assertEqual(self.performance_monitor.send_commands.call_count, 2)
+        self.assertEqual(response.get_status(), 5)
+        self.assertEqual(response.get_force_plot(), [])
+        self.assertEqual(response.get_heartbeat_data(), [])
+
+    def test_get_force_plot(self):
+        """
+        PerformanceMonitor.get_force_plot - it should request heartbeat data in the same frame
+        :return:
+        """
+        self.performance_monitor.send_commands = MagicMock()
+        self.performance_monitor.get_force_plot(heartbeat=True)
+
+        self.performance_monitor.send_commands.assert_called_once_with(
+            PerformanceMonitor.GET_FORCE_PLOT + PerformanceMonitor.GET_HEARTBEAT
+        )
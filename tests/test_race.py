@@ -0,0 +1,98 @@
+"""
+tests.PyRow.Concept2.RaceTests
+"""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow.race import Race
+from pyrow.response import Response
+
+
+def monitor_response(work_time, distance_remaining):
+    """
+    :param float work_time: Seconds
+    :param float distance_remaining: Metres
+    :return Response:
+    """
+    return Response({
+        'CSAFE_PM_GET_WORKTIME': [int(work_time * 100), 0],
+        'CSAFE_PM_GET_WORKDISTANCE': [int(distance_remaining * 10), 0],
+    })
+
+
+class RaceTests(TestCase):
+    """
+    Tests for Race
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.race = Race(500)
+        self.listener = MagicMock()
+        self.race.add_listener(self.listener)
+
+    def test_standings(self):
+        """
+        Race.get_standings - it should order the ergs by distance covered
+        :return:
+        """
+        self.race.update('A', monitor_response(0, 500))
+        self.race.update('B', monitor_response(0, 500))
+        self.race.update('A', monitor_response(10, 450))
+        self.race.update('B', monitor_response(10, 440))
+
+        standings = self.race.get_standings()
+
+        self.assertEqual([standing.serial_number for standing in standings], ['B', 'A'])
+        self.assertEqual(standings[0].distance, 60)
+        self.assertEqual(standings[1].distance_behind, 10)
+        self.assertEqual(standings[1].time_behind, 2)
+
+    def test_listener_only_on_position_change(self):
+        """
+        Race.add_listener - it should only call listeners when positions change
+        :return:
+        """
+        self.race.update('A', monitor_response(0, 500))
+        self.race.update('B', monitor_response(0, 500))
+        self.race.update('A', monitor_response(10, 450))
+        self.listener.reset_mock()
+
+        self.race.update('A', monitor_response(20, 400))
+        self.listener.assert_not_called()
+
+        self.race.update('B', monitor_response(20, 390))
+        self.assertEqual(self.listener.call_args[0][0][0].serial_number, 'B')
+
+    def test_finish_time_is_interpolated(self):
+        """
+        Race.update - it should interpolate the finish time between two samples
+        :return:
+        """
+        self.race.update('A', monitor_response(90, 10))
+        self.race.update('A', monitor_response(92, -10))
+        self.race.update('B', monitor_response(90, 5))
+        self.race.update('B', monitor_response(91, -5))
+        self.race.update('B', monitor_response(92, -15))
+
+        standings = self.race.get_standings()
+
+        self.assertEqual([standing.serial_number for standing in standings], ['B', 'A'])
+        self.assertEqual(standings[0].finish_time, 90.5)
+        self.assertEqual(standings[1].finish_time, 91)
+        self.assertEqual(standings[1].time_behind, 0.5)
+
+    def test_poll(self):
+        """
+        Race.poll - it should update the race with the monitor of every erg
+        :return:
+        """
+        erg = MagicMock()
+        erg.get_serial_number.return_value = 'A'
+        erg.get_monitor.return_value = monitor_response(10, 450)
+
+        self.race.poll([erg])
+
+        self.assertEqual(self.race.get_standings()[0].distance, 50)
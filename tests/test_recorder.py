@@ -0,0 +1,178 @@
+"""
+tests.PyRow.Concept2.RecorderTests
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from pyrow import recorder
+from pyrow.force_curve import ForceCurve
+from pyrow.recorder import WorkoutRecorder, WorkoutWriter, WriterPool
+from pyrow.response import Response
+
+
+class WorkoutWriterTests(TestCase):
+    """
+    Tests for WorkoutWriter
+    """
+
+    COLUMNS = (('time', recorder.DOUBLE), ('force', recorder.DOUBLES))
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'workout')
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        shutil.rmtree(self.directory)
+
+    def test_csv(self):
+        """
+        WorkoutWriter - it should write rows as CSV
+        :return:
+        """
+        writer = WorkoutWriter(self.path, self.COLUMNS, recorder.CSV, batch_size=2)
+        writer.append((1.5, [10, 20]))
+        writer.append((None, []))
+        writer.append((2.5, [30]))
+        writer.close()
+
+        with open(self.path) as csv_file:
+            self.assertEqual(csv_file.read(), 'time,force\n1.5,10 20\n,\n2.5,30\n')
+
+    def test_columnar(self):
+        """
+        WorkoutWriter - it should write rows that read_columnar reads back
+        :return:
+        """
+        writer = WorkoutWriter(self.path, self.COLUMNS, recorder.COLUMNAR, batch_size=2)
+        writer.append((1.5, [10, 20]))
+        writer.append((None, []))
+        writer.append((2.5, [30]))
+        writer.close()
+
+        self.assertEqual(recorder.read_columnar(self.path), {
+            'time': [1.5, None, 2.5],
+            'force': [[10, 20], [], [30]],
+        })
+
+    def test_columnar_ignores_incomplete_block(self):
+        """
+        read_columnar - it should ignore a block that was not completely written
+        :return:
+        """
+        writer = WorkoutWriter(self.path, self.COLUMNS, recorder.COLUMNAR, batch_size=1)
+        writer.append((1.5, [10, 20]))
+        writer.append((2.5, [30]))
+        writer.close()
+
+        with open(self.path, 'r+b') as columnar_file:
+            columnar_file.truncate(os.path.getsize(self.path) - 1)
+
+        self.assertEqual(recorder.read_columnar(self.path)['time'], [1.5])
+
+    def test_append_checks_width(self):
+        """
+        WorkoutWriter.append - it should raise a ValueError if the row has the wrong width
+        :return:
+        """
+        writer = WorkoutWriter(self.path, self.COLUMNS)
+
+        self.assertRaises(ValueError, writer.append, (1.5, ))
+        writer.close()
+
+    def test_close_without_waiting(self):
+        """
+        WorkoutWriter.close - it should leave closing the file to the pool when not waiting
+        :return:
+        """
+        pool = WriterPool(max_batches=1)
+
+        writer = WorkoutWriter(self.path, self.COLUMNS, recorder.COLUMNAR, pool=pool)
+        writer.append((1.5, [10]))
+        writer.close(wait=False)
+        pool.join()
+
+        self.assertIsNone(writer.get_error())
+        self.assertEqual(recorder.read_columnar(self.path)['time'], [1.5])
+
+    def test_encode_error(self):
+        """
+        WorkoutWriter.write_batch - it should keep an encode error for the writer and leave the
+        pool running
+        :return:
+        """
+        pool = WriterPool(max_batches=1)
+
+        bad = WorkoutWriter(self.path, self.COLUMNS, recorder.COLUMNAR, batch_size=1, pool=pool)
+        bad.append(('fast', [10]))
+        pool.join()
+        self.assertIsInstance(bad.get_error(), Exception)
+        self.assertRaises(Exception, bad.append, (1.5, [10]))
+        self.assertRaises(Exception, bad.close)
+
+        good = WorkoutWriter(self.path + '2', self.COLUMNS, recorder.COLUMNAR, batch_size=1,
+                             pool=pool)
+        for k in range(3):
+            good.append((k, [k]))
+        good.close()
+        self.assertEqual(recorder.read_columnar(self.path + '2')['time'], [0, 1, 2])
+
+
+class WorkoutRecorderTests(TestCase):
+    """
+    Tests for WorkoutRecorder
+    """
+
+    def test_record(self):
+        """
+        WorkoutRecorder - it should record samples and strokes to separate files
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        prefix = os.path.join(directory, 'workout')
+
+        workout_recorder = WorkoutRecorder(prefix, recorder.COLUMNAR)
+        monitor = Response({'CSAFE_PM_GET_WORKDISTANCE': [1000, 0],
+                            'CSAFE_GETCADENCE_CMD': [24, 0]})
+        curve = ForceCurve()
+        curve.extend([10, 30, 20])
+        workout_recorder.record_sample('400124190', monitor, 1.)
+        workout_recorder.record_stroke(monitor, curve, 2.)
+        workout_recorder.close()
+
+        samples = recorder.read_columnar(prefix + '_samples.pyrc')
+        strokes = recorder.read_columnar(prefix + '_strokes.pyrc')
+
+        self.assertEqual(samples['distance'], [100.])
+        self.assertEqual(samples['power'], [None])
+        self.assertEqual(strokes['spm'], [24])
+        self.assertEqual(strokes['peak_force'], [30])
+        self.assertEqual(strokes['force'], [[10, 30, 20]])
+
+    def test_one_erg(self):
+        """
+        WorkoutRecorder.record_sample - it should reject samples from another erg
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        response = Response({'CSAFE_GETCADENCE_CMD': [24, 0]})
+
+        workout_recorder = WorkoutRecorder(os.path.join(directory, 'first'))
+        workout_recorder.record_sample('400124190', response, 1.)
+        self.assertRaises(ValueError, workout_recorder.record_sample, '400124191', response, 2.)
+        workout_recorder.close()
+
+        workout_recorder = WorkoutRecorder(os.path.join(directory, 'second'),
+                                           serial_number='400124191')
+        self.assertRaises(ValueError, workout_recorder.record_sample, '400124190', response, 1.)
+        workout_recorder.record_sample('400124191', response, 2.)
+        workout_recorder.close()
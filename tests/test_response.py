@@ -5,6 +5,7 @@ tests.PyRow.Concept2.ResponseTests
 from unittest import TestCase
 from unittest.mock import MagicMock
 
+from pyrow.csafe.const import Command
 from pyrow.response import Response
 
 
@@ -26,6 +27,18 @@ class ResponseTests(TestCase):
             results
         )
 
+    def test_command_keys(self):
+        """
+        Response - it should accept results keyed by Command or by command name
+        :return:
+        """
+        by_command = Response({Command.CSAFE_GETPOWER_CMD: [245, 88]})
+        by_name = Response({'CSAFE_GETPOWER_CMD': [245, 88], 'OTHER': [1]})
+
+        self.assertEqual(by_command.get_power(), 245)
+        self.assertEqual(by_name.get_power(), 245)
+        self.assertEqual(by_name.get_raw(), {'CSAFE_GETPOWER_CMD': [245, 88], 'OTHER': [1]})
+
     def test_get_time(self):
         """
         Response.get_time - it should return the time remaining if it exists
@@ -353,6 +366,113 @@ class ResponseTests(TestCase):
             None
         )
 
+    def test_get_drag_factor(self):
+        """
+        Response.get_drag_factor - it should return the drag factor if it exists
+        :return:
+        """
+        results = {
+            'CSAFE_PM_GET_DRAGFACTOR': [
+                120
+            ]
+        }
+
+        response = Response(results)
+
+        self.assertEqual(
+            response.get_drag_factor(),
+            120
+        )
+
+        # Test for none
+        response = Response({})
+
+        self.assertEqual(
+            response.get_drag_factor(),
+            None
+        )
+
+    def test_get_rest_time(self):
+        """
+        Response.get_rest_time - it should return the rest time if it exists
+        :return:
+        """
+        results = {
+            'CSAFE_PM_GET_RESTTIME': [
+                60
+            ]
+        }
+
+        response = Response(results)
+
+        self.assertEqual(
+            response.get_rest_time(),
+            60
+        )
+
+        # Test for none
+        response = Response({})
+
+        self.assertEqual(
+            response.get_rest_time(),
+            None
+        )
+
+    def test_get_error_value(self):
+        """
+        Response.get_error_value - it should return the error value if it exists
+        :return:
+        """
+        results = {
+            'CSAFE_PM_GET_ERRORVALUE': [
+                3
+            ]
+        }
+
+        response = Response(results)
+
+        self.assertEqual(
+            response.get_error_value(),
+            3
+        )
+
+        # Test for none
+        response = Response({})
+
+        self.assertEqual(
+            response.get_error_value(),
+            None
+        )
+
+    def test_get_heartbeat_data(self):
+        """
+        Response.get_heartbeat_data - it should return the heartbeat data if it exists
+        :return:
+        """
+        results = {
+            'CSAFE_PM_GET_HEARTBEATDATA': [
+                4,
+                800,
+                810,
+                0
+            ]
+        }
+
+        response = Response(results)
+
+        self.assertEqual(
+            response.get_heartbeat_data(),
+            [800, 810]
+        )
+
+        # Test for none
+        response = Response({})
+
+        self.assertEqual(
+            response.get_heartbeat_data(),
+            None
+        )
+
     def test_get_force_plot(self):
         """
         Response.get_force_plot() - it should return the force plot if it exists
@@ -0,0 +1,110 @@
+"""
+tests.PyRow.Concept2.SerializationTests
+"""
+import pickle
+from unittest import TestCase
+
+from pyrow import serialization
+from pyrow.csafe.const import COMMAND_IDS, Command
+from pyrow.response import Response
+from pyrow.serialization import decode_response, encode_response
+
+SCREEN = {
+    'CSAFE_GETSTATUS_CMD': [5],
+    'CSAFE_PM_GET_WORKTIME': [123456, 12],
+    'CSAFE_PM_GET_WORKDISTANCE': [15000, 3],
+    'CSAFE_PM_GET_DRAGFACTOR': [118],
+    'CSAFE_PM_GET_RESTTIME': [0],
+    'CSAFE_GETCADENCE_CMD': [28, 84],
+    'CSAFE_GETPOWER_CMD': [245, 88],
+    'CSAFE_GETCALORIES_CMD': [87],
+    'CSAFE_GETHRCUR_CMD': [152],
+}
+
+
+def by_command(results):
+    """
+    :param dict results: Values keyed by command name
+    :return dict: Values keyed by Command where the name is known
+    """
+    return dict((COMMAND_IDS.get(key, key), value) for key, value in results.items())
+
+
+class SerializationTests(TestCase):
+    """
+    Tests for encode_response and decode_response
+    """
+
+    def test_round_trip(self):
+        """
+        decode_response - it should decode the Response written by encode_response
+        :return:
+        """
+        data = encode_response(Response(SCREEN))
+        response, offset = decode_response(data)
+
+        self.assertEqual(response.get_raw(), by_command(SCREEN))
+        self.assertEqual(offset, len(data))
+        self.assertEqual(response.get_power(), 245)
+
+    def test_compact(self):
+        """
+        encode_response - it should be several times smaller than pickle
+        :return:
+        """
+        data = encode_response(SCREEN)
+
+        self.assertLess(len(data) * 5, len(pickle.dumps(SCREEN, pickle.HIGHEST_PROTOCOL)))
+
+    def test_fallback(self):
+        """
+        encode_response - it should keep commands that do not fit the schema
+        :return:
+        """
+        results = {
+            'CSAFE_GETID_CMD': ['12345'],
+            'CSAFE_GETHRCUR_CMD': [300],
+            'CSAFE_GETPOWER_CMD': [245, 88],
+            'COMMANDS': ['SCREEN', True],
+        }
+
+        response, _ = decode_response(encode_response(results))
+
+        self.assertEqual(response.get_raw(), by_command(results))
+
+    def test_stream(self):
+        """
+        decode_response - it should decode Responses appended one after another
+        :return:
+        """
+        out = bytearray()
+        encode_response(SCREEN, out)
+        encode_response({'CSAFE_GETSTATUS_CMD': [7]}, out)
+
+        first, offset = decode_response(out)
+        second, offset = decode_response(out, offset)
+
+        self.assertEqual(first.get_raw(), by_command(SCREEN))
+        self.assertEqual(second.get_status(), 7)
+        self.assertEqual(offset, len(out))
+
+    def test_tagged_values(self):
+        """
+        decode_value - it should decode the values written by encode_value
+        :return:
+        """
+        value = {'a': [None, True, False, -3, 1.5, 'b', {}]}
+        out = bytearray()
+        serialization.encode_value(value, out)
+
+        self.assertEqual(serialization.decode_value(bytes(out)), (value, len(out)))
+
+    def test_commands(self):
+        """
+        encode_value - it should send Commands as their ids
+        :return:
+        """
+        out = bytearray()
+        serialization.encode_value([Command.CSAFE_GETPOWER_CMD, 32], out)
+
+        self.assertEqual(serialization.decode_value(bytes(out))[0], [0xB4, 32])
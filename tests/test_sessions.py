@@ -0,0 +1,135 @@
+"""
+tests.PyRow.Concept2.SessionsTests
+"""
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow import intervals, recorder, sessions
+from pyrow.recorder import WriterPool
+from pyrow.response import Response
+from pyrow.sessions import SessionRecorder
+
+
+def sample(status, distance=None, state=intervals.WORKOUT_STATE_ROW):
+    """
+    :param int status: Performance Monitor status
+    :param float distance: Metres
+    :param int state: Workout state
+    :return Response:
+    """
+    results = {'CSAFE_GETSTATUS_CMD': [status], 'CSAFE_PM_GET_WORKOUTSTATE': [state]}
+    if distance is not None:
+        results['CSAFE_PM_GET_WORKDISTANCE'] = [int(distance * 10), 0]
+    return Response(results)
+
+
+class SessionRecorderTests(TestCase):
+    """
+    Tests for SessionRecorder
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.pool = WriterPool()
+        self.recorder = SessionRecorder(self.directory, pool=self.pool, batch_size=2)
+        self.closed = []
+        self.recorder.add_listener(self.closed.append)
+
+    def test_segment(self):
+        """
+        SessionRecorder.update - it should record from in use until finished, one file per
+        session
+        :return:
+        """
+        self.assertIsNone(self.recorder.update('1', sample(sessions.STATE_READY), 0.))
+        self.assertIsNone(self.recorder.get_session('1'))
+
+        for k in range(5):
+            self.assertIsNone(self.recorder.update('1', sample(sessions.STATE_IN_USE, k), k))
+        first = self.recorder.update('1', sample(sessions.STATE_FINISHED, 5), 5.)
+        self.assertIsNone(self.recorder.update('1', sample(sessions.STATE_FINISHED, 5), 6.))
+
+        self.recorder.update('1', sample(sessions.STATE_IN_USE, 0), 3600.)
+        second = self.recorder.update('1', sample(sessions.STATE_READY), 3601.)
+        self.pool.join()
+
+        self.assertEqual(first.reason, sessions.FINISHED)
+        self.assertEqual((first.start, first.end, first.samples), (0., 5., 6))
+        self.assertEqual(second.reason, sessions.RESET)
+        self.assertNotEqual(first.path, second.path)
+        self.assertEqual(self.closed, [first, second])
+
+        values = recorder.read_columnar(first.path)
+        self.assertEqual(values['timestamp'], [0., 1., 2., 3., 4., 5.])
+        self.assertEqual(values['distance'], [0., 1., 2., 3., 4., 5.])
+        self.assertEqual(recorder.read_columnar(second.path)['status'],
+                         [sessions.STATE_IN_USE, sessions.STATE_READY])
+
+    def test_ergs(self):
+        """
+        SessionRecorder.update - it should keep a session per erg
+        :return:
+        """
+        self.recorder.update('1', sample(sessions.STATE_IN_USE), 0.)
+        self.recorder.update('2', sample(sessions.STATE_IN_USE), 1.)
+        ended = self.recorder.update(
+            '2', sample(sessions.STATE_IN_USE, state=intervals.WORKOUT_STATE_END), 2.)
+
+        self.assertEqual(ended.reason, sessions.ENDED)
+        self.assertEqual([session.serial_number for session in self.recorder.get_sessions()],
+                         ['1'])
+
+        closed = self.recorder.close()
+        self.assertEqual([(session.serial_number, session.reason) for session in closed],
+                         [('1', sessions.CLOSED)])
+        self.assertEqual(recorder.read_columnar(closed[0].path)['timestamp'], [0.])
+        self.assertEqual(self.recorder.get_sessions(), [])
+
+    def test_poll(self):
+        """
+        SessionRecorder.poll - it should poll every erg once
+        :return:
+        """
+        performance_monitor = MagicMock()
+        performance_monitor.get_serial_number.return_value = '1'
+        performance_monitor.send_commands.return_value = sample(sessions.STATE_IN_USE, 250)
+
+        self.recorder.poll([performance_monitor], 10.)
+
+        performance_monitor.send_commands.assert_called_once_with(sessions.POLL_COMMANDS)
+        self.assertEqual(self.recorder.get_session('1').samples, 1)
+        self.recorder.close()
+
+    def test_ended(self):
+        """
+        SessionRecorder.update - it should not open a session for an erg whose workout has ended
+        :return:
+        """
+        logged = sample(sessions.STATE_IN_USE, state=intervals.WORKOUT_STATE_LOGGED)
+        for k in range(3):
+            self.assertIsNone(self.recorder.update('1', logged, float(k)))
+        self.assertIsNone(self.recorder.get_session('1'))
+        self.assertEqual(self.closed, [])
+
+    def test_unique_paths(self):
+        """
+        SessionRecorder.update - it should write sessions started in the same second to
+        separate files
+        :return:
+        """
+        paths = set()
+        for k in range(3):
+            self.recorder.update('1', sample(sessions.STATE_IN_USE), 10. + k / 10.)
+            paths.add(self.recorder.update('1', sample(sessions.STATE_FINISHED),
+                                           10. + k / 10.).path)
+        self.pool.join()
+
+        self.assertEqual(len(paths), 3)
+        for path in paths:
+            self.assertEqual(len(recorder.read_columnar(path)['timestamp']), 2)
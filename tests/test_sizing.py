@@ -0,0 +1,108 @@
+"""
+tests.PyRow.CSAFE.SizingTests
+"""
+from unittest import TestCase
+
+from pyrow.csafe import sizing
+from pyrow.csafe.const import Command
+
+SCREEN = [Command.CSAFE_PM_GET_WORKTIME, Command.CSAFE_PM_GET_WORKDISTANCE,
+          Command.CSAFE_PM_GET_DRAGFACTOR, Command.CSAFE_GETCADENCE_CMD,
+          Command.CSAFE_GETPOWER_CMD]
+FORCE_PLOT = [Command.CSAFE_PM_GET_FORCEPLOTDATA, Command.CSAFE_PM_GET_STROKESTATE]
+
+
+class ResponseSizeModelTests(TestCase):
+    """
+    Tests for ResponseSizeModel
+    """
+
+    def test_response_size(self):
+        """
+        ResponseSizeModel.get_response_size - it should add the stuffing allowance to the
+        unstuffed length of the response
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+        # Frame, one wrapper, 5 commands and their data
+        unstuffed = sizing.FRAME_BYTES + 2 + 10 + 5 + 5 + 1 + 3 + 3
+
+        self.assertEqual(model.get_response_size(SCREEN),
+                         unstuffed + model.get_allowance(5 + 5 + 1 + 3 + 3 + 1))
+        self.assertLessEqual(model.get_response_size([Command.CSAFE_GETSTATUS_CMD]), 21)
+        self.assertLessEqual(model.get_response_size(FORCE_PLOT), 63)
+
+    def test_allowance(self):
+        """
+        ResponseSizeModel.get_allowance - it should allow for fewer stuffed bytes than data bytes
+        and for more as the data grows
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+
+        self.assertEqual(model.get_allowance(0), 0)
+        self.assertEqual(model.get_allowance(1), 1)
+        self.assertLess(model.get_allowance(70), 70)
+        self.assertLessEqual(model.get_allowance(30), model.get_allowance(70))
+        self.assertLess(sizing.ResponseSizeModel(tail=1e-3).get_allowance(70),
+                        model.get_allowance(70))
+
+    def test_longest(self):
+        """
+        ResponseSizeModel.observe - it should not estimate less than the longest response read
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+        model.observe([Command.CSAFE_GETSTATUS_CMD] + FORCE_PLOT, 90, 40, 0)
+
+        self.assertEqual(model.get_response_size(FORCE_PLOT), 90)
+        self.assertLess(model.get_response_size(SCREEN), 90)
+
+    def test_longest_expires(self):
+        """
+        ResponseSizeModel.observe - it should forget a long response once MIN_SAMPLES data bytes
+        have been read without it
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+        estimate = model.get_response_size(FORCE_PLOT)
+        model.observe(FORCE_PLOT, 90, 40, 0)
+        model.observe(FORCE_PLOT, 50, sizing.MIN_SAMPLES, 0)
+
+        self.assertEqual(model.get_response_size(FORCE_PLOT), 90)
+
+        model.observe(FORCE_PLOT, 50, sizing.MIN_SAMPLES, 0)
+
+        self.assertLess(model.get_response_size(FORCE_PLOT), 90)
+        self.assertLessEqual(model.get_response_size(FORCE_PLOT), estimate)
+
+    def test_overflow(self):
+        """
+        ResponseSizeModel.overflow - it should estimate more than the report that was too small
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+        self.assertLessEqual(model.get_response_size(FORCE_PLOT), 63)
+
+        model.overflow([Command.CSAFE_GETSTATUS_CMD] + FORCE_PLOT, 63)
+
+        self.assertEqual(model.get_response_size(FORCE_PLOT), 64)
+
+    def test_rate(self):
+        """
+        ResponseSizeModel.observe - it should measure the stuffing rate once enough data is read
+        :return:
+        """
+        model = sizing.ResponseSizeModel()
+        allowance = model.get_allowance(70)
+        model.observe(SCREEN, 40, sizing.MIN_SAMPLES - 1, 0)
+
+        self.assertEqual(model.get_rate(), sizing.STUFFING_RATE)
+
+        model.observe(SCREEN, 40, 1, 0)
+
+        self.assertEqual(model.get_rate(), 1. / sizing.MIN_SAMPLES)
+        self.assertLess(model.get_allowance(70), allowance)
+
+        model.reset()
+        self.assertEqual(model.get_allowance(70), allowance)
@@ -0,0 +1,8 @@
+"""
+tests.PyRow.Concept2.StreamingTests
+"""
+import sys
+
+# TelemetryServer needs async/await, which is a syntax error before Python 3.5
+if sys.version_info >= (3, 5):
+    from tests.telemetry_server import TelemetryServerTests  # noqa: F401
@@ -0,0 +1,154 @@
+"""
+tests.PyRow.Concept2.TelemetryBusTests
+"""
+import os
+from unittest import TestCase, skipIf
+
+from pyrow import telemetry_bus
+from pyrow.response import Response
+from pyrow.telemetry_bus import TelemetryPublisher, TelemetryReader
+
+
+class TelemetryBusTests(TestCase):
+    """
+    Tests for TelemetryPublisher and TelemetryReader on a mapped file segment
+    """
+
+    SHARED_MEMORY = False
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.publisher = TelemetryPublisher(slots=2, shared_memory=self.SHARED_MEMORY)
+        self.reader = TelemetryReader(self.publisher.get_name(),
+                                      shared_memory=self.SHARED_MEMORY)
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        self.reader.close()
+        self.publisher.close()
+
+    def test_read(self):
+        """
+        TelemetryReader.read - it should return the latest published sample of the erg
+        :return:
+        """
+        self.assertIsNone(self.reader.read('400124190'))
+
+        self.publisher.publish('400124190', Response({
+            'CSAFE_GETSTATUS_CMD': [5],
+            'CSAFE_PM_GET_WORKDISTANCE': [1000, 5],
+            'CSAFE_GETCADENCE_CMD': [24, 0],
+        }), 10.5)
+
+        sample = self.reader.read('400124190')
+
+        self.assertEqual(sample.serial_number, '400124190')
+        self.assertEqual(sample.timestamp, 10.5)
+        self.assertEqual(sample.distance, 100.5)
+        self.assertEqual(sample.spm, 24)
+        self.assertEqual(sample.status, 5)
+        self.assertIsNone(sample.power)
+
+    def test_publish_keeps_previous_values(self):
+        """
+        TelemetryPublisher.publish - it should keep fields that are missing from the response
+        :return:
+        """
+        self.publisher.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}))
+        self.publisher.publish('400124190', Response({'CSAFE_GETPOWER_CMD': [150, 0]}))
+
+        sample = self.reader.read('400124190')
+
+        self.assertEqual(sample.spm, 24)
+        self.assertEqual(sample.power, 150)
+
+    def test_read_all(self):
+        """
+        TelemetryReader.read_all - it should return a sample for every published erg
+        :return:
+        """
+        self.publisher.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}))
+        self.publisher.publish('400124191', Response({'CSAFE_GETCADENCE_CMD': [30, 0]}))
+
+        samples = self.reader.read_all()
+
+        self.assertEqual(samples['400124190'].spm, 24)
+        self.assertEqual(samples['400124191'].spm, 30)
+
+    def test_publish_too_many_ergs(self):
+        """
+        TelemetryPublisher.publish - it should raise a ValueError when all slots are used
+        :return:
+        """
+        for serial_number in ('1', '2'):
+            self.publisher.publish(serial_number, Response({}))
+
+        self.assertRaises(ValueError, self.publisher.publish, '3', Response({}))
+
+    def test_read_during_write(self):
+        """
+        TelemetryReader.read - it should not return a slot while it is being written
+        :return:
+        """
+        self.publisher.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}))
+        telemetry_bus.SEQUENCE.pack_into(self.reader._TelemetryReader__buffer,
+                                         telemetry_bus.HEADER.size, 3)
+
+        self.assertRaises(RuntimeError, self.reader.read_all)
+
+    def test_close(self):
+        """
+        TelemetryPublisher.close - it should remove the segment
+        :return:
+        """
+        name = self.publisher.get_name()
+        self.reader.close()
+        self.publisher.close()
+
+        self.assertRaises(OSError, TelemetryReader, name, shared_memory=self.SHARED_MEMORY)
+
+        self.publisher = TelemetryPublisher(slots=2, shared_memory=self.SHARED_MEMORY)
+        self.reader = TelemetryReader(self.publisher.get_name(),
+                                      shared_memory=self.SHARED_MEMORY)
+
+
+@skipIf(telemetry_bus.SharedMemory is None, 'multiprocessing.shared_memory is Python 3.8+')
+class SharedMemoryTests(TelemetryBusTests):
+    """
+    Tests for TelemetryPublisher and TelemetryReader on a multiprocessing.shared_memory segment
+    """
+
+    SHARED_MEMORY = True
+
+
+class UnavailableTests(TestCase):
+    """
+    Tests for TelemetryPublisher and TelemetryReader without multiprocessing.shared_memory
+    """
+
+    def test_unavailable(self):
+        """
+        TelemetryPublisher - it should raise NotImplementedError for a shared_memory segment
+        without shared memory support, and still publish to a mapped file
+        :return:
+        """
+        shared_memory = telemetry_bus.SharedMemory
+        telemetry_bus.SharedMemory = None
+        try:
+            self.assertRaises(NotImplementedError, TelemetryPublisher, shared_memory=True)
+            self.assertRaises(NotImplementedError, TelemetryReader, 'pyrow', shared_memory=True)
+
+            publisher = TelemetryPublisher(slots=1)
+            publisher.publish('400124190', Response({'CSAFE_GETCADENCE_CMD': [24, 0]}))
+            reader = TelemetryReader(publisher.get_name())
+            self.assertEqual(reader.read('400124190').spm, 24)
+            self.assertTrue(os.path.exists(os.path.join(telemetry_bus.SEGMENT_DIRECTORY,
+                                                        publisher.get_name())))
+            reader.close()
+            publisher.close()
+        finally:
+            telemetry_bus.SharedMemory = shared_memory
@@ -0,0 +1,75 @@
+"""
+tests.PyRow.Concept2.TraceTests
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from pyrow import capture
+from pyrow.trace import FrameTrace
+
+
+class FrameTraceTests(TestCase):
+    """
+    Tests for FrameTrace
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        shutil.rmtree(self.directory)
+
+    def test_ring(self):
+        """
+        FrameTrace.record - it should keep the last capacity frames, oldest first
+        :return:
+        """
+        trace = FrameTrace(3, max_length=4)
+        for k in range(5):
+            trace.record(capture.REQUEST if k % 2 else capture.RESPONSE, [k] * (k + 1), k)
+
+        self.assertEqual(trace.get_count(), 5)
+        self.assertEqual(trace.get_records(), [
+            (2., capture.RESPONSE, b'\x02\x02\x02'),
+            (3., capture.REQUEST, b'\x03\x03\x03\x03'),
+            (4., capture.RESPONSE, b'\x04\x04\x04\x04'),
+        ])
+
+        trace.clear()
+        self.assertEqual(trace.get_records(), [])
+
+    def test_dump(self):
+        """
+        FrameTrace.dump - it should write the frames in the capture format
+        :return:
+        """
+        trace = FrameTrace(directory=self.directory)
+        trace.record(capture.REQUEST, [0x01, 0xF1, 0x80, 0x80, 0xF2], 1.5)
+        trace.record(capture.RESPONSE, bytes([0x01, 0xF1, 0x09, 0x09, 0xF2]), 1.6)
+
+        path = trace.dump(name='400124190')
+
+        self.assertTrue(os.path.basename(path).startswith('400124190-'))
+        self.assertEqual(list(capture.read_records(path)), trace.get_records())
+        self.assertRaises(ValueError, FrameTrace().dump)
+
+    def test_dump_names(self):
+        """
+        FrameTrace.dump - it should not overwrite a dump from the same second
+        :return:
+        """
+        trace = FrameTrace(directory=self.directory)
+        trace.record(capture.REQUEST, [0x01, 0xF1, 0x80, 0x80, 0xF2], 1.5)
+        paths = set(trace.dump(name='400124190') for _ in range(3))
+        paths.add(FrameTrace(directory=self.directory).dump(name='400124190'))
+
+        self.assertEqual(len(paths), 4)
+        self.assertEqual(len(os.listdir(self.directory)), 4)
@@ -0,0 +1,224 @@
+"""
+tests.PyRow.Concept2.TransportTests
+"""
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from pyrow.bridge import TcpTransport, TransportBridge
+from pyrow.exceptions import TransportException
+from pyrow.transport import LoopbackTransport, SharedLink
+
+
+def echo(data):
+    """
+    :param [int] data:
+    :return [int]:
+    """
+    return [value + 1 for value in data]
+
+
+def reply(data):
+    """
+    Answers an extended frame from the erg it was addressed to
+    :param [int] data:
+    :return [int]:
+    """
+    return [data[0], data[1], data[3], data[2]] + data[4:]
+
+
+class LoopbackTransportTests(TestCase):
+    """
+    Tests for LoopbackTransport
+    """
+
+    def test_handler(self):
+        """
+        LoopbackTransport - it should answer each report with the handler
+        :return:
+        """
+        transport = LoopbackTransport(echo)
+
+        self.assertEqual(transport.write([1, 2, 3]), 3)
+        self.assertEqual(transport.read(3), [2, 3, 4])
+
+    def test_remote_side(self):
+        """
+        LoopbackTransport - it should pass reports to and from the simulated side
+        :return:
+        """
+        transport = LoopbackTransport()
+        transport.write([1, 2, 3])
+
+        self.assertEqual(transport.receive_request(1), [1, 2, 3])
+
+        transport.send_response([4, 5])
+
+        self.assertEqual(transport.read(2), [4, 5])
+
+    def test_read_timeout(self):
+        """
+        LoopbackTransport.read - it should raise a TransportException if nothing is sent
+        :return:
+        """
+        transport = LoopbackTransport()
+        transport.TIMEOUT = 0.01
+
+        self.assertRaises(TransportException, transport.read, 2)
+
+
+class TcpTransportTests(TestCase):
+    """
+    Tests for TcpTransport and TransportBridge
+    """
+
+    def setUp(self):
+        """
+        :return:
+        """
+        self.first = LoopbackTransport(echo, serial_number='400124190', product_id=0x0001)
+        self.second = LoopbackTransport(echo, serial_number='400124191')
+        self.bridge = TransportBridge([self.first, self.second], host='127.0.0.1')
+        self.bridge.start()
+
+    def tearDown(self):
+        """
+        :return:
+        """
+        self.bridge.close()
+
+    def test_find(self):
+        """
+        TcpTransport.find - it should open every erg of the bridge
+        :return:
+        """
+        transports = TcpTransport.find('127.0.0.1', self.bridge.get_port())
+
+        self.assertEqual([transport.get_serial_number() for transport in transports],
+                         ['400124190', '400124191'])
+        self.assertEqual(transports[0].get_product_id(), 0x0001)
+        self.assertEqual(transports[0].get_manufacturer(), 'Concept2')
+
+        for transport in transports:
+            transport.close()
+
+    def test_write_read(self):
+        """
+        TcpTransport - it should relay reports to the erg through the bridge
+        :return:
+        """
+        transport = TcpTransport('127.0.0.1', self.bridge.get_port(), '400124191')
+
+        self.assertEqual(transport.write([1, 2, 3]), 3)
+        self.assertEqual(transport.read(3), [2, 3, 4])
+        transport.close()
+
+    def test_write_error(self):
+        """
+        TcpTransport.read - it should raise the error of the write before it and keep the
+        following replies in step
+        :return:
+        """
+        transport = TcpTransport('127.0.0.1', self.bridge.get_port(), '400124191')
+
+        with patch.object(self.second, 'write', side_effect=OSError('Write failed')):
+            transport.write([1, 2, 3])
+            self.assertRaisesRegex(TransportException, 'Write failed', transport.read, 3)
+
+        transport.write([1, 2, 3])
+        self.assertEqual(transport.read(3), [2, 3, 4])
+        transport.write([5, 6])
+        self.assertEqual(transport.read(2), [6, 7])
+        transport.close()
+
+    def test_unknown_erg(self):
+        """
+        TcpTransport - it should raise a TransportException for an unknown erg
+        :return:
+        """
+        self.assertRaises(TransportException, TcpTransport, '127.0.0.1',
+                          self.bridge.get_port(), '1')
+
+    def test_bridge_paces_frames(self):
+        """
+        TransportBridge.write - it should keep frames MIN_FRAME_GAP apart
+        :return:
+        """
+        self.first.MIN_FRAME_GAP = 0.05
+        start = time.time()
+        self.bridge.write(self.first, b'\x01')
+        self.bridge.write(self.first, b'\x01')
+
+        self.assertGreaterEqual(time.time() - start, 0.05)
+
+
+class SharedLinkTests(TestCase):
+    """
+    Tests for SharedLink and AddressedTransport
+    """
+
+    STATUS = [0x01, 0xF1, 0x80, 0x80, 0xF2] + [0] * 16
+
+    def test_addressed_write(self):
+        """
+        AddressedTransport.write - it should send an extended frame to its address
+        :return:
+        """
+        link = SharedLink(LoopbackTransport(reply, serial_number='400124190'))
+        transport = link.get_transport(0x02)
+
+        self.assertEqual(transport.get_serial_number(), '400124190-02')
+        self.assertEqual(transport.write(self.STATUS), 21)
+        self.assertEqual(transport.read(21)[:5], [0x01, 0xF0, 0x00, 0x02, 0x80])
+
+    def test_demultiplex(self):
+        """
+        SharedLink.read - it should hand each response to the erg it came from
+        :return:
+        """
+        loopback = LoopbackTransport()
+        link = SharedLink(loopback)
+        first = link.get_transport(0x01)
+        second = link.get_transport(0x02)
+        first.write(self.STATUS)
+        second.write(self.STATUS)
+
+        requests = [loopback.receive_request(1), loopback.receive_request(1)]
+        self.assertEqual([request[2] for request in requests], [0x01, 0x02])
+        for request in reversed(requests):
+            loopback.send_response(reply(request))
+
+        self.assertEqual(first.read(21)[3], 0x01)
+        self.assertEqual(second.read(21)[3], 0x02)
+
+    def test_pacing(self):
+        """
+        SharedLink.write - it should only keep frames to the same address MIN_FRAME_GAP apart
+        :return:
+        """
+        loopback = LoopbackTransport(reply)
+        loopback.MIN_FRAME_GAP = 0.1
+        link = SharedLink(loopback)
+        transports = [link.get_transport(address) for address in range(1, 5)]
+
+        start = time.time()
+        for transport in transports:
+            transport.write(self.STATUS)
+        self.assertLess(time.time() - start, 0.1)
+
+        transports[0].write(self.STATUS)
+        self.assertGreaterEqual(time.time() - start, 0.1)
+
+    def test_release(self):
+        """
+        AddressedTransport.close - it should close the link's transport with the last erg
+        :return:
+        """
+        link = SharedLink(LoopbackTransport(reply))
+        link.get_transport(0x01)
+        second = link.get_transport(0x02)
+        link.get_transport(0x01).close()
+
+        self.assertEqual(link.get_addresses(), [0x02])
+        second.close()
+        self.assertEqual(link.get_addresses(), [])
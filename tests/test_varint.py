@@ -0,0 +1,31 @@
+"""
+tests.PyRow.Concept2.VarintTests
+"""
+from unittest import TestCase
+
+from pyrow import varint
+
+
+class VarintTests(TestCase):
+    """
+    Tests for the varint helpers
+    """
+
+    def test_varint(self):
+        """
+        encode_varint - it should round trip through decode_varint
+        :return:
+        """
+        for value in (0, 1, 127, 128, 300, 2 ** 40):
+            out = bytearray()
+            varint.encode_varint(value, out)
+            self.assertEqual(varint.decode_varint(out, 0), (value, len(out)))
+
+    def test_zigzag(self):
+        """
+        zigzag - it should map signed integers onto unsigned ones and back
+        :return:
+        """
+        self.assertEqual([varint.zigzag(value) for value in (0, -1, 1, -2)], [0, 1, 2, 3])
+        for value in (0, -1, 1, -300, 300):
+            self.assertEqual(varint.unzigzag(varint.zigzag(value)), value)
@@ -0,0 +1,103 @@
+"""
+tests.PyRow.Concept2.WorkoutTests
+"""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from pyrow import workout
+from pyrow.workout import WorkoutPlan
+
+
+class WorkoutPlanTests(TestCase):
+    """
+    Tests for WorkoutPlan
+    """
+
+    def test_distance(self):
+        """
+        WorkoutPlan - it should encode a distance workout with a split and pace
+        :return:
+        """
+        plan = WorkoutPlan(distance=2000, split=500, power_pace=200)
+
+        self.assertEqual(plan.get_commands(), (
+            workout.SET_HORIZONTAL, 2000, workout.UNITS_METERS,
+            workout.SET_SPLIT_DURATION, workout.DURATION_DISTANCE, 500,
+            workout.SET_POWER, 200, workout.UNITS_WATTS,
+            workout.SET_PROGRAM, 0, 0, workout.GO_IN_USE
+        ))
+        self.assertEqual(plan.get_distance(), 2000)
+        self.assertIsNone(plan.get_workout_time())
+
+    def test_frame(self):
+        """
+        WorkoutPlan.get_frame - it should encode the commands once
+        :return:
+        """
+        plan = WorkoutPlan(distance=2000)
+
+        self.assertEqual(plan.get_frame(),
+                         tuple(workout.CsafeCmd.write(list(plan.get_commands()))))
+
+    def test_workout_time_is_not_mutated(self):
+        """
+        WorkoutPlan - it should pad the workout time without changing the caller's list
+        :return:
+        """
+        workout_time = [20, 0]
+        plan = WorkoutPlan(workout_time=workout_time, split=120)
+
+        self.assertEqual(workout_time, [20, 0])
+        self.assertEqual(plan.get_workout_time(), (0, 20, 0))
+        self.assertEqual(plan.get_seconds(), 1200)
+        self.assertEqual(plan.get_commands()[:4], (workout.SET_WORKOUT, 0, 20, 0))
+
+    def test_intervals(self):
+        """
+        WorkoutPlan - it should encode fixed time and distance intervals
+        :return:
+        """
+        time_plan = WorkoutPlan(workout_time=[2, 0], rest=60)
+        distance_plan = WorkoutPlan(distance=500, rest=90)
+
+        self.assertEqual(time_plan.get_commands(), (
+            workout.SET_WORKOUT_TYPE, workout.WORKOUT_FIXED_TIME_INTERVAL,
+            workout.SET_WORKOUT_DURATION, workout.DURATION_TIME, 12000,
+            workout.SET_REST_DURATION, 60,
+            workout.SET_CONFIGURE_WORKOUT, 1,
+            workout.SET_SCREEN_STATE, workout.SCREEN_TYPE_WORKOUT, workout.SCREEN_PREPARE_TO_ROW
+        ))
+        self.assertEqual(distance_plan.get_commands()[:5], (
+            workout.SET_WORKOUT_TYPE, workout.WORKOUT_FIXED_DISTANCE_INTERVAL,
+            workout.SET_WORKOUT_DURATION, workout.DURATION_DISTANCE, 500
+        ))
+        self.assertEqual(distance_plan.get_rest(), 90)
+        self.assertEqual(time_plan.get_workout_type(), workout.WORKOUT_FIXED_TIME_INTERVAL)
+        self.assertEqual(distance_plan.get_workout_type(), workout.WORKOUT_FIXED_DISTANCE_INTERVAL)
+        self.assertIsNone(WorkoutPlan(distance=500).get_workout_type())
+
+    def test_validation(self):
+        """
+        WorkoutPlan - it should reject invalid workouts when it is created
+        :return:
+        """
+        self.assertRaises(ValueError, WorkoutPlan, workout_time=[10])
+        self.assertRaises(ValueError, WorkoutPlan, distance=50)
+        self.assertRaises(TypeError, WorkoutPlan, distance=2000.)
+        self.assertRaises(ValueError, WorkoutPlan, distance=2000, split=50)
+        self.assertRaises(ValueError, WorkoutPlan, program=1, split=500)
+        self.assertRaises(ValueError, WorkoutPlan, distance=500, rest=600)
+        self.assertRaises(ValueError, WorkoutPlan, distance=500, rest=60, split=100)
+        self.assertRaises(ValueError, WorkoutPlan, rest=60)
+
+    def test_apply(self):
+        """
+        WorkoutPlan.apply - it should set the workout on every Performance Monitor
+        :return:
+        """
+        plan = WorkoutPlan(distance=2000)
+        performance_monitors = [MagicMock(), MagicMock()]
+        plan.apply(performance_monitors)
+
+        for performance_monitor in performance_monitors:
+            performance_monitor.apply_workout.assert_called_once_with(plan)